@@ -0,0 +1,383 @@
+"""bench_scaling.py - end-to-end scaling benchmark for the pelican_events plugin.
+
+This generates synthetic Pelican sites with N event articles, runs a full Pelican build on each of them and
+records the wall time, the time spent in the plugin's signal handlers, peak RSS and output size for each N.
+The synthetic sites have varied event metadata, recurring event rules and translated articles.
+
+Each build runs in a separate Python process so that peak RSS is measured per site size.
+Results are appended to a JSON or CSV file (selected by file name suffix) so they can be tracked over releases.
+
+    python benchmarks/bench_scaling.py --sizes 100,1000,10000,50000 --output bench_results.json
+"""
+# by Ian Kluft
+
+import argparse
+import csv
+from datetime import UTC, datetime, timedelta
+import json
+import logging
+import os
+from pathlib import Path
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import weakref
+
+log = logging.getLogger(__name__)
+
+#
+# constants
+#
+
+DEFAULT_SIZES = "100,1000"
+PLUGIN_MODULE = "pelican.plugins.pelican_events"
+TEST_TIMESTAMP = "2025-09-04 11:00:00"  # fixed build time so output doesn't depend on when the benchmark runs
+SITE_TZ = "US/Pacific"
+TRANSLATION_EVERY = 10  # every Nth article gets a German translation
+RECURRING_PER_ARTICLES = 200  # one recurring event rule per this many articles
+MAX_RECURRING = 25
+LOCATIONS = (
+    (
+        "Lucky Labrador Beer Hall: 1945 NW Quimby, Portland OR 97209 US",
+        "45.53371;-122.69174",
+    ),
+    ("Central Library: 801 SW 10th Ave, Portland OR 97205 US", "45.51906;-122.68306"),
+    ("Community Center: 2 Main St, Beaverton OR 97005 US", "45.48706;-122.80371"),
+    ("Online", None),
+)
+CATEGORIES = ("MEETING", "LINUX", "KERNEL", "SOCIAL", "WORKSHOP", "TALK")
+RECURRING_RULES = (
+    "Every third Thursday at 6pm starting from September 18 2025",
+    "Every Monday at 7pm",
+    "Every first Saturday at 10am",
+    "Every other Wednesday at 5:30pm",
+)
+PARAGRAPH = (
+    "Come enjoy a beverage and chat with other people who are interested in the Linux kernel. "
+    "All experience levels are welcome. This is a <b>friendly</b> and <i>casual</i> meetup, "
+    "see the [project page](https://ikluft.github.io/pdx-lkmu/) for details."
+)
+RESULT_FIELDS = (
+    "timestamp",
+    "python",
+    "plugin_version",
+    "events",
+    "text_engine",
+    "content_files",
+    "wall_time",
+    "plugin_time",
+    "peak_rss_kib",
+    "ics_bytes",
+    "output_bytes",
+)
+
+#
+# synthetic site generator
+#
+
+
+def article_text(index: int, rng: random.Random, lang: str = "en") -> str:
+    """Generate the Markdown source of one synthetic event article."""
+    base = datetime(2025, 1, 1, 9, 0)
+    start = base + timedelta(days=rng.randrange(0, 730), hours=rng.randrange(0, 11))
+    location, geo = LOCATIONS[index % len(LOCATIONS)]
+    title = (
+        f"Synthetic Event {index}"
+        if lang == "en"
+        else f"Synthetische Veranstaltung {index}"
+    )
+    lines = [
+        f"Title: {title}",
+        f"Slug: synthetic-event-{index}",
+        f"Lang: {lang}",
+        f"Date: {(start - timedelta(days=14)).strftime('%Y-%m-%d %H:%M')}",
+        "Category: Events",
+        f"Summary: Summary of synthetic event {index}",
+        f"Event-start: {start.strftime('%Y-%m-%d %H:%M')}",
+    ]
+    if index % 2:
+        lines.append(f"Event-duration: {rng.randrange(1, 4)}h {rng.choice((0, 30))}m")
+    else:
+        lines.append(
+            f"Event-end: {(start + timedelta(hours=2)).strftime('%Y-%m-%d %H:%M')}"
+        )
+    lines.append(f"Event-location: {location}")
+    if geo:
+        lines.append(f"Event-geo: {geo}")
+    lines.append(
+        "Event-categories: " + ",".join(rng.sample(CATEGORIES, rng.randrange(1, 4)))
+    )
+    if index % 7 == 0:
+        lines.append("Event-status: TENTATIVE")
+    if index % 11 == 0:
+        lines.append("Event-x-room: Back room")
+    body = "\n\n".join([PARAGRAPH] * rng.randrange(1, 8))
+    return "\n".join(lines) + "\n\n" + body + "\n"
+
+
+def recurring_events(count: int) -> list[dict[str, str]]:
+    """Generate recurring event rules for PLUGIN_EVENTS."""
+    return [
+        {
+            "title": f"Recurring event {i}",
+            "summary": f"Something that happens regularly, rule {i}",
+            "page_url": f"recurring_{i}.html",
+            "location": LOCATIONS[i % len(LOCATIONS)][0],
+            "recurring_rule": RECURRING_RULES[i % len(RECURRING_RULES)],
+            "event-duration": "2h",
+        }
+        for i in range(count)
+    ]
+
+
+def generate_site(
+    site_dir: Path, n_events: int, seed: int = 42, text_engine: str = "html2text"
+) -> int:
+    """Write a synthetic Pelican site with n_events event articles. Returns the number of content files."""
+    rng = random.Random(seed)
+    content_dir = site_dir / "content"
+    content_dir.mkdir(parents=True, exist_ok=True)
+    files = 0
+    for index in range(n_events):
+        (content_dir / f"event-{index:06d}.md").write_text(
+            article_text(index, rng), encoding="utf-8"
+        )
+        files += 1
+        if index % TRANSLATION_EVERY == 0:
+            (content_dir / f"event-{index:06d}-de.md").write_text(
+                article_text(index, rng, lang="de"), encoding="utf-8"
+            )
+            files += 1
+
+    n_recurring = min(MAX_RECURRING, max(1, n_events // RECURRING_PER_ARTICLES))
+    settings = {
+        "PLUGINS": [PLUGIN_MODULE],
+        "PLUGIN_EVENTS": {
+            "ics_fname": "calendar.ics",
+            "metadata_field_for_summary": "title",
+            "test_timestamp": TEST_TIMESTAMP,
+            "text_engine": text_engine,
+            "recurring_events": recurring_events(n_recurring),
+        },
+        "SITENAME": "Pelican Events Benchmark",
+        "SITEURL": "https://example.org",
+        "TIMEZONE": SITE_TZ,
+        "PATH": "content",
+        "DEFAULT_LANG": "en",
+        "FEED_ALL_ATOM": None,
+        "CATEGORY_FEED_ATOM": None,
+        "TRANSLATION_FEED_ATOM": None,
+        "AUTHOR_FEED_ATOM": None,
+        "AUTHOR_FEED_RSS": None,
+        "DEFAULT_PAGINATION": 10,
+    }
+    conf = ['"""Settings for a synthetic pelican_events benchmark site."""', ""]
+    conf += [f"{key} = {value!r}" for key, value in settings.items()]
+    (site_dir / "pelicanconf.py").write_text("\n".join(conf) + "\n", encoding="utf-8")
+    return files
+
+
+#
+# build runner, executed in a child process per site
+#
+
+
+def instrument_plugin_handlers(timings: dict[str, float]) -> None:
+    """Replace the plugin's signal handlers with wrappers that accumulate their run time per handler name."""
+    from pelican import signals  # noqa: PLC0415
+
+    def make_wrapper(handler):
+        def wrapper(sender, **kwargs):
+            start = time.perf_counter()
+            try:
+                return handler(sender, **kwargs)
+            finally:
+                timings[handler.__name__] = timings.get(handler.__name__, 0.0) + (
+                    time.perf_counter() - start
+                )
+
+        return wrapper
+
+    for name in dir(signals):
+        sig = getattr(signals, name)
+        if not hasattr(sig, "receivers"):
+            continue
+        for receiver_ref in list(sig.receivers.values()):
+            handler = (
+                receiver_ref()
+                if isinstance(receiver_ref, weakref.ref)
+                else receiver_ref
+            )
+            if not getattr(handler, "__module__", "").startswith(PLUGIN_MODULE):
+                continue
+            sig.disconnect(handler)
+            sig.connect(make_wrapper(handler), weak=False)
+
+
+def peak_rss_kib() -> int:
+    """Get the peak resident set size of this process in KiB.
+
+    ru_maxrss is in KiB on Linux and the BSDs, but in bytes on macOS.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak // 1024
+    return peak
+
+
+def run_build(site_dir: Path, output_dir: Path) -> dict:
+    """Run a full Pelican build of a site in this process and return timing data."""
+    from pelican import Pelican  # noqa: PLC0415
+    from pelican.settings import read_settings  # noqa: PLC0415
+
+    logging.getLogger("pelican").setLevel(logging.ERROR)
+    timings = {}
+    os.chdir(site_dir)
+    settings = read_settings(
+        "pelicanconf.py",
+        override={"OUTPUT_PATH": str(output_dir), "PATH": str(site_dir / "content")},
+    )
+    start = time.perf_counter()
+    pelican_obj = Pelican(settings)
+    instrument_plugin_handlers(timings)
+    pelican_obj.run()
+    wall_time = time.perf_counter() - start
+    return {
+        "wall_time": wall_time,
+        "plugin_time": sum(timings.values()),
+        "handler_times": timings,
+        "peak_rss_kib": peak_rss_kib(),
+    }
+
+
+#
+# benchmark driver
+#
+
+
+def directory_size(path: Path) -> int:
+    """Total size in bytes of all files under a directory."""
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def plugin_version() -> str:
+    """Version of the installed pelican-events package, if known."""
+    try:
+        from importlib.metadata import version  # noqa: PLC0415
+
+        return version("pelican-events")
+    except Exception:  # noqa: BLE001
+        return "unknown"
+
+
+def bench_size(n_events: int, work_dir: Path, seed: int, text_engine: str) -> dict:
+    """Generate and build one synthetic site in a child process, and collect its measurements."""
+    site_dir = work_dir / f"site-{n_events}-{text_engine}"
+    output_dir = site_dir / "output"
+    files = generate_site(site_dir, n_events, seed=seed, text_engine=text_engine)
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", str(site_dir), str(output_dir)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    child = json.loads(proc.stdout.strip().splitlines()[-1])
+    ics_path = output_dir / "calendar.ics"
+    return {
+        "timestamp": datetime.now(tz=UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plugin_version": plugin_version(),
+        "events": n_events,
+        "text_engine": text_engine,
+        "content_files": files,
+        "wall_time": round(child["wall_time"], 4),
+        "plugin_time": round(child["plugin_time"], 4),
+        "peak_rss_kib": child["peak_rss_kib"],
+        "ics_bytes": ics_path.stat().st_size if ics_path.exists() else 0,
+        "output_bytes": directory_size(output_dir),
+        "handler_times": {k: round(v, 4) for k, v in child["handler_times"].items()},
+    }
+
+
+def save_results(results: list[dict], output: Path) -> None:
+    """Append benchmark results to a JSON or CSV file, chosen by the file name suffix."""
+    if output.suffix == ".csv":
+        new_file = not output.exists()
+        with open(output, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            writer.writerows(results)
+        return
+
+    previous = []
+    if output.exists():
+        previous = json.loads(output.read_text(encoding="utf-8"))
+    output.write_text(json.dumps(previous + results, indent=2) + "\n", encoding="utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the scaling benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"comma-separated numbers of event articles (default: {DEFAULT_SIZES})",
+    )
+    parser.add_argument(
+        "--output",
+        default="bench_results.json",
+        help="results file, .json or .csv (default: bench_results.json)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="random seed for site data"
+    )
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="keep the generated sites in the work directory",
+    )
+    parser.add_argument(
+        "--text-engine",
+        default="html2text",
+        help="PLUGIN_EVENTS text_engine of the synthetic sites (default: html2text)",
+    )
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        result = run_build(Path(args.child[0]), Path(args.child[1]))
+        sys.stdout.write(json.dumps(result) + "\n")
+        return 0
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sizes = [int(size) for size in args.sizes.split(",")]
+    work_dir = Path(tempfile.mkdtemp(prefix="pelican-events-bench-"))
+    results = []
+    for n_events in sizes:
+        result = bench_size(n_events, work_dir, args.seed, args.text_engine)
+        log.info(
+            "%6d events (%s): wall %.2fs, plugin %.2fs, peak RSS %d KiB, calendar %d bytes",
+            n_events,
+            args.text_engine,
+            result["wall_time"],
+            result["plugin_time"],
+            result["peak_rss_kib"],
+            result["ics_bytes"],
+        )
+        results.append(result)
+    save_results(results, Path(args.output))
+    if args.keep:
+        log.info("generated sites kept in %s", work_dir)
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""Command-line interface for the pelican_events plugin.
+
+The pelican-events command regenerates the iCalendar file of a Pelican site without a full Pelican build,
+or checks the event metadata of all content files.
+It reads only the metadata header of each content file and renders the body only for event articles,
+whose text is needed for the iCalendar DESCRIPTION. This makes it cheap enough to run from a nightly cron job
+so that past events drop off the calendar.
+
+    pelican-events build content/ -s pelicanconf.py
+    pelican-events validate content/ -s pelicanconf.py
+
+Other Pelican plugins are not run, so metadata added or modified by them is not seen by this command.
+Translations are linked among the event articles only, since other articles aren't read.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+from pelican.contents import Article
+from pelican.readers import Readers
+from pelican.settings import read_settings
+from pelican.utils import process_translations
+
+from .pelican_events import (
+    UnsupportedHeaderFormat,
+    check_event_conflicts,
+    find_article_files,
+    format_validation_error,
+    generate_ical_file,
+    generate_localized_events,
+    generate_search_index,
+    generate_sqlite_file,
+    iter_metadata_header,
+    parse_article,
+    snapshot_events,
+    start_event_collection,
+    validate_content,
+)
+
+log = logging.getLogger(__name__)
+
+
+def is_event_source(path: str) -> bool:
+    """Check from the metadata header alone whether a content file is a non-draft event article."""
+    try:
+        header = {name: value for name, value, _ in iter_metadata_header(path)}
+    except UnsupportedHeaderFormat:
+        return True  # no header scanner for this format, let Pelican's reader decide
+    return "event-start" in header and header.get("status", "").lower() != "draft"
+
+
+def build_calendar(settings) -> int:
+    """Collect events from the content tree and write the calendar outputs. Returns the number of events found."""
+    context = settings.copy()
+    context["generated_content"] = {}
+    context["static_links"] = set()
+    context["static_content"] = {}
+    context["localsiteurl"] = settings["SITEURL"]
+    generator = SimpleNamespace(settings=settings, context=context)
+
+    start_event_collection(settings)
+
+    readers = Readers(settings=settings)
+    content_path = settings["PATH"]
+    scanned = 0
+    articles = []
+    for relpath in find_article_files(settings, tuple(readers.extensions)):
+        scanned += 1
+        if not is_event_source(os.path.join(content_path, relpath)):
+            continue
+        log.debug("build_calendar: reading event article %s", relpath)
+        article = readers.read_file(
+            base_path=content_path,
+            path=relpath,
+            content_class=Article,
+            context=context,
+        )
+        articles.append(article)
+
+    # link translations as Pelican's ArticlesGenerator does, for the UID and "merge" duplicate_uids policy
+    process_translations(articles, translation_id=settings["ARTICLE_TRANSLATION_ID"])
+    for article in articles:
+        parse_article(article)
+
+    generate_localized_events(generator)
+    check_event_conflicts(generator)
+    generate_ical_file(generator)
+    generate_sqlite_file(generator)
+    generate_search_index(generator)
+    log.info("scanned %d content files", scanned)
+    return len(snapshot_events())
+
+
+def validate(settings, jobs: int | None) -> int:
+    """Report event metadata errors in the content tree. Returns the exit status, 1 if there were errors."""
+    settings.setdefault("PLUGIN_EVENTS", {})
+    start_time = time.perf_counter()
+    errors = validate_content(settings, jobs)
+    for error in errors:
+        sys.stdout.write(format_validation_error(error) + "\n")
+    log.info(
+        "found %d event metadata errors in %.2f seconds",
+        len(errors),
+        time.perf_counter() - start_time,
+    )
+    return 1 if errors else 0
+
+
+def parse_arguments(argv: list[str] | None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "-v", "--verbose", action="store_true", help="show informational messages"
+    )
+    common.add_argument(
+        "-D", "--debug", action="store_true", help="show debug messages"
+    )
+    common.add_argument(
+        "-s",
+        "--settings",
+        default="pelicanconf.py",
+        help="Pelican settings file (default: pelicanconf.py)",
+    )
+    common.add_argument(
+        "path",
+        nargs="?",
+        default=None,
+        help="content directory (default: PATH setting)",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="pelican-events",
+        description="Generate Pelican Events plugin output from content metadata without a full Pelican build.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser(
+        "build", parents=[common], help="build the iCalendar file from content metadata"
+    )
+    build_parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="output directory (default: OUTPUT_PATH setting)",
+    )
+
+    validate_parser = subparsers.add_parser(
+        "validate",
+        parents=[common],
+        help="check the event metadata of all content files without building",
+    )
+    validate_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of parallel worker processes (default: CPU count)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the pelican-events command."""
+    args = parse_arguments(argv)
+    log_level = logging.WARNING
+    if args.verbose:
+        log_level = logging.INFO
+    if args.debug:
+        log_level = logging.DEBUG
+    logging.basicConfig(level=log_level, format="%(levelname)s: %(message)s")
+
+    override = {}
+    if args.path is not None:
+        override["PATH"] = os.path.abspath(args.path)
+    if getattr(args, "output", None) is not None:
+        override["OUTPUT_PATH"] = os.path.abspath(args.output)
+    settings = read_settings(args.settings, override=override)
+    if args.command == "validate":
+        return validate(settings, args.jobs)
+    if "PLUGIN_EVENTS" not in settings or not settings["PLUGIN_EVENTS"].get(
+        "ics_fname"
+    ):
+        log.error("PLUGIN_EVENTS['ics_fname'] is not set in %s", args.settings)
+        return 1
+
+    start_time = time.perf_counter()
+    count = build_calendar(settings)
+    log.info(
+        "wrote %s with %d events in %.2f seconds",
+        os.path.join(settings["OUTPUT_PATH"], settings["PLUGIN_EVENTS"]["ics_fname"]),
+        count,
+        time.perf_counter() - start_time,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
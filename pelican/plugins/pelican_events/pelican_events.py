@@ -12,24 +12,46 @@ converted in 2025 to Namespace plugin by Ian Kluft for Portland Linux Kernel Mee
 Released under AGPLv3+ license, see LICENSE
 """
 
-from collections import defaultdict
+import calendar
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 import copy
-from datetime import datetime, timedelta, tzinfo
+import csv
+from datetime import UTC, date, datetime, timedelta, tzinfo
+import fnmatch
+import hashlib
+import heapq
+from html.parser import HTMLParser
+import io
+import itertools
+import json
 import logging
+import math
 import os.path
 from pprint import pformat
+import re
+import sqlite3
+import threading
+import time
+import tomllib
 from typing import Any
 from zoneinfo import ZoneInfo
 
+from blinker import signal
 from dateutil import rrule
 import dateutil.parser
 import html2text
 import icalendar
 from icalendar.prop import vGeo
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound, meta
 from recurrent.event_parser import RecurringEvent
 
 from pelican import contents, signals
+from pelican.cache import FileDataCacher
+from pelican.generators import Generator
 from pelican.settings import Settings
+from pelican.utils import slugify
 
 log = logging.getLogger(__name__)
 
@@ -127,11 +149,239 @@ ICAL_PROPS = {
     "REFID": [ICAL_ALLOWED, "[RFC9253, Section 8.3]"],
 }
 
+# engines for converting HTML to plain text in strip_html_tags()
+TEXT_ENGINES = ("html2text", "fast")
+
+# HTML elements which start a new line in the fast text engine, and elements whose content is dropped
+TEXT_BLOCK_TAGS = frozenset(
+    (
+        "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "figcaption",
+        "figure", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main",
+        "nav", "ol", "p", "pre", "section", "table", "tr", "ul",
+    )
+)  # fmt: skip
+TEXT_SKIP_TAGS = frozenset(("head", "script", "style", "template"))
+
+# content file extensions whose metadata header can be scanned without rendering the article body
+MARKDOWN_EXTENSIONS = ("md", "markdown", "mkd", "mdown")
+RST_EXTENSIONS = ("rst",)
+HTML_EXTENSIONS = ("htm", "html")
+
+# regular expressions for metadata header lines in Markdown and reStructuredText sources
+MD_META_RE = re.compile(r"^[ ]{0,3}(?P<key>[A-Za-z0-9_-]+):\s*(?P<value>.*)$")
+MD_META_MORE_RE = re.compile(r"^[ ]{4,}(?P<value>.*)$")
+RST_FIELD_RE = re.compile(r"^:(?P<key>[^:\s][^:]*):\s*(?P<value>.*)$")
+RST_ADORNMENT_RE = re.compile(r"^([!-/:-@\[-`{-~])\1+\s*$")
+
+# iCalendar properties of imported events which are kept because they are generated internally for site events
+ICAL_MERGE_STRUCTURAL = (
+    "DTSTART",
+    "DTEND",
+    "DTSTAMP",
+    "DURATION",
+    "UID",
+    "RRULE",
+    "RDATE",
+    "EXDATE",
+    "RECURRENCE-ID",
+)
+# time properties of imported events written in UTC, since the calendar has no VTIMEZONE for their TZIDs
+ICAL_MERGE_TIMES = (
+    "DTSTART",
+    "DTEND",
+    "DTSTAMP",
+    "RECURRENCE-ID",
+    "LAST-MODIFIED",
+    "CREATED",
+)
+# recurrence properties of imported events, which are expanded into one VEVENT per occurrence
+ICAL_MERGE_RECURRENCE = ("RRULE", "RDATE", "EXDATE", "RECURRENCE-ID")
+
+# policies for events with the same iCalendar UID, see resolve_duplicate_uids()
+DUPLICATE_UID_POLICIES = ("warn", "error", "newest", "merge")
+
+# policies for overlapping events at the same location, see check_event_conflicts()
+CONFLICT_POLICIES = ("warn", "error")
+CONFLICT_GEO_DIGITS = (
+    4  # coordinates rounded to about 10 m identify a location without event-location
+)
+
+# modes for the iCalendar DESCRIPTION of site events, see event_description()
+DESCRIPTION_MODES = ("full", "summary", "link")
+
+# VEVENT properties managed by the delta state, left out of the event fingerprints
+DELTA_VOLATILE_PROPS = (b"DTSTAMP", b"SEQUENCE", b"LAST-MODIFIED")
+
+# defaults for compaction of repeated events into series, see compact_series()
+COMPACT_SIGNATURE = ("SUMMARY", "LOCATION", "DURATION")
+COMPACT_OVERRIDE_PROPS = (
+    "SUMMARY",
+)  # not DESCRIPTION, which differs for each article of a series
+COMPACT_MIN_EVENTS = 3
+
+# hash of the iCalendar property allow-list, which keys the cache of parsed articles with their filtered
+# properties, so caches in CACHE_PATH from a plugin version with another allow-list aren't used, see article_event_data()
+ICAL_PROPS_DIGEST = hashlib.sha256(
+    json.dumps(ICAL_PROPS, sort_keys=True).encode()
+).hexdigest()
+
+# template context variables which change every generated page, hashed to decide whether a page is written again
+PAGE_CONTEXT_SETTINGS = (
+    "SITEURL",
+    "SITENAME",
+    "SITESUBTITLE",
+    "RELATIVE_URLS",
+    "DEFAULT_LANG",
+    "MENUITEMS",
+    "LINKS",
+    "SOCIAL",
+    "DISPLAY_PAGES_ON_MENU",
+    "DISPLAY_CATEGORIES_ON_MENU",
+    "FEED_DOMAIN",
+    "FEED_ALL_ATOM",
+    "FEED_ALL_RSS",
+)
+
+# last line of an iCalendar file, written after the streamed VEVENTs by CalendarBuilder
+ICAL_CALENDAR_END = b"END:VCALENDAR\r\n"
+
+# block size for hashing imported files
+HASH_BLOCK_SIZE = 1 << 16
+
+# number of plain texts of event descriptions kept within a build, see strip_html_tags()
+HTML_TEXT_CACHE_SIZE = 4096
+
+# defaults for recurrence expansion with PLUGIN_EVENTS["recurrence_horizon"], see recurring_occurrences()
+RECURRENCE_MAX_OCCURRENCES = 100
+RECURRENCE_TIME_BUDGET = 5.0  # seconds for all recurring event rules in a build
+
+# default number of background threads writing output files, see BackgroundWriter
+OUTPUT_WORKERS = 2
+
+# required fields of recurring event definitions
+RECURRING_EVENT_KEYS = (
+    "title", "summary", "page_url", "location", "recurring_rule", "event-duration",
+)  # fmt: skip
+
+# separators of dates in exdates and skip lists, and of skip list names, see parse_date_list()
+DATE_LIST_SEPARATOR_RE = re.compile(r"[,;\s]+")
+
+# formats of the data files in PLUGIN_EVENTS["recurring_events_file"] and ["event_data_file"]
+DATA_FILE_EXTENSIONS = (".csv", ".json", ".jsonl", ".toml")
+
+# defaults for pages of events from PLUGIN_EVENTS["event_data_file"], see EventPageGenerator
+EVENT_PAGE_TEMPLATE = "event_page"
+EVENT_PAGE_URL = "events/{slug}.html"
+EVENT_PAGE_SAVE_AS = "events/{slug}.html"
+
+# bounds of the calendar REFRESH-INTERVAL computed with PLUGIN_EVENTS["refresh_interval"] = "auto"
+REFRESH_INTERVAL_MIN = timedelta(hours=1)
+REFRESH_INTERVAL_MAX = timedelta(days=7)
+
+# files per task when validating content metadata in parallel, see validate_content()
+VALIDATE_CHUNK_SIZE = 32
+
+# geographic index of events, see GeoIndex
+GEO_CELL_DEGREES = 0.1  # grid cell size, about 11 km north-south
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# schema of the SQLite event database, see write_sqlite_events()
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    uid TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    url TEXT,
+    lang TEXT,
+    title TEXT,
+    summary TEXT,
+    description TEXT,
+    location TEXT,
+    dtstart TEXT NOT NULL,
+    dtend TEXT NOT NULL,
+    latitude REAL,
+    longitude REAL
+);
+CREATE INDEX IF NOT EXISTS events_dtstart ON events (dtstart);
+CREATE INDEX IF NOT EXISTS events_dtend ON events (dtend);
+CREATE TABLE IF NOT EXISTS categories (
+    uid TEXT NOT NULL REFERENCES events (uid) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    PRIMARY KEY (uid, category)
+);
+CREATE INDEX IF NOT EXISTS categories_category ON categories (category);
+CREATE TABLE IF NOT EXISTS properties (
+    uid TEXT NOT NULL REFERENCES events (uid) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (uid, name)
+);
+"""
+# rows of events_fts have the rowid of their events row, so they're updated and deleted by rowid lookups
+SQLITE_FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(uid UNINDEXED, summary, description)"
+SQLITE_FTS_VERSION = (
+    1  # PRAGMA user_version of databases whose events_fts rows are keyed by rowid
+)
+SQLITE_EVENT_COLUMNS = (
+    "uid", "hash", "url", "lang", "title", "summary", "description", "location", "dtstart", "dtend",
+    "latitude", "longitude",
+)  # fmt: skip
+
+# client-side search index of events, see build_search_index()
+SEARCH_PREFIX_LENGTH = 2  # characters of a term which select its shard
+SEARCH_SHARDS_DIR = (
+    "shards"  # subdirectory of the shards, apart from the manifest index.json
+)
+SEARCH_MIN_TERM_LENGTH = 2
+SEARCH_TERM_RE = re.compile(r"\w+")
+SEARCH_INDEX_VERSION = 1
+
+# fallback templates shipped with the plugin, used when the theme doesn't provide them
+TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# defaults for month-grid calendar pages, see MonthPageGenerator
+MONTH_PAGE_TEMPLATE = "events_month"
+MONTH_PAGE_URL = "events/{year:04d}/{month:02d}/"
+MONTH_PAGE_SAVE_AS = "events/{year:04d}/{month:02d}/index.html"
+
 #
 # global-scoped variables
 #
 events = []
 localized_events = defaultdict(list)
+merged_ics_cache = {}  # parsed VEVENTs of merge_ics files by path, see load_merged_ics()
+recurrence_cache = {}  # expanded occurrences by rule and anchor day, see recurring_occurrences()
+rrule_cache = {}  # compiled dateutil rules by rule text, with their anchor day, see parse_recurring_rule()
+recurring_file_cache = {}  # validated rows of recurring_events_file by path, see load_recurring_events_file()
+event_data_cache = {}  # events of event_data_file by path, see load_event_data_file()
+skip_list_cache = {}  # excluded days of skip list files by path, see load_skip_list()
+article_event_cache = {}  # parsed event data of articles by source path, see article_event_data()
+article_event_paths = (
+    set()
+)  # source paths seen in a build pass, see article_event_data()
+build_caches = {}  # plugin caches in CACHE_PATH opened for a build pass, see start_event_collection()
+recurring_events_memo = {}  # generated recurring events of the last build pass, see insert_recurring_events()
+timezone_cache = {}  # VTIMEZONE components by time zone name, see new_calendar()
+html_text_cache = (
+    OrderedDict()
+)  # plain text by engine and HTML content hash for a build, see strip_html_tags()
+stage_start_times = {}  # time.perf_counter() at the start of instrumented stages, see start_event_collection()
+
+#
+# signals for instrumentation, sent with the Pelican settings as sender when receivers are connected
+# durations are in seconds from time.perf_counter() and sizes in bytes
+#
+events_collection_started = signal("pelican_events_collection_started")
+events_collection_finished = signal(
+    "pelican_events_collection_finished"
+)  # events, duration
+events_recurrence_expanded = signal(
+    "pelican_events_recurrence_expanded"
+)  # definitions, events, duration
+events_event_rendered = signal("pelican_events_event_rendered")  # event, uid, duration
+events_feed_written = signal(
+    "pelican_events_feed_written"
+)  # path, events, size, duration
 
 #
 # Exception classes
@@ -167,6 +417,93 @@ class DurationParseError(ValueError):
         )
 
 
+class DateListError(ValueError):
+    """Exception class for an invalid date in a skip list file."""
+
+    def __init__(self, path: str, line: int, error: str) -> None:  # noqa: D107
+        super().__init__(f"{path}:{line}: invalid date in skip list: {error}")
+
+
+class UnsupportedHeaderFormat(ValueError):
+    """Exception class for content files whose metadata header can't be scanned without a full read."""
+
+    def __init__(self, ext: str, path: str) -> None:  # noqa: D107
+        super().__init__(f"No metadata header scanner for '{ext}' files: {path}")
+
+
+class UnsupportedDataFile(ValueError):
+    """Exception class for an event data file of an unknown format."""
+
+    def __init__(self, path: str) -> None:  # noqa: D107
+        super().__init__(
+            f"Unsupported data file format: {path}, expected one of: "
+            + ", ".join(DATA_FILE_EXTENSIONS)
+        )
+
+
+class UnknownTextEngine(ValueError):
+    """Exception class for an unrecognized PLUGIN_EVENTS["text_engine"] setting."""
+
+    def __init__(self, engine: str) -> None:  # noqa: D107
+        super().__init__(
+            f"Unknown text engine '{engine}' in PLUGIN_EVENTS['text_engine'], expected one of: "
+            + ", ".join(TEXT_ENGINES)
+        )
+
+
+class EventValidationError(ValueError):
+    """Exception class for event metadata errors found by PLUGIN_EVENTS["validate"]."""
+
+    def __init__(self, errors: list[tuple[str, int, str]]) -> None:  # noqa: D107
+        super().__init__(
+            f"{len(errors)} event metadata errors:\n"
+            + "\n".join(format_validation_error(error) for error in errors)
+        )
+
+
+class GeoFilterError(ValueError):
+    """Exception class for an invalid filter definition in PLUGIN_EVENTS["geo_feeds"]."""
+
+    def __init__(self, fname: str, definition: Any) -> None:  # noqa: D107
+        super().__init__(
+            f"Invalid PLUGIN_EVENTS['geo_feeds'] filter for '{fname}': {definition!r}, expected "
+            "{'radius': [latitude, longitude, km]} or {'bbox': [south, west, north, east]}"
+        )
+
+
+class EventConflictError(ValueError):
+    """Exception class for overlapping events at the same location when the conflicts policy is 'error'."""
+
+    def __init__(self, conflicts: list[dict[str, Any]]) -> None:  # noqa: D107
+        super().__init__(
+            f"{len(conflicts)} conflicting events:\n"
+            + "\n".join(format_conflict(conflict) for conflict in conflicts)
+        )
+
+
+class DuplicateUIDError(ValueError):
+    """Exception class for events which share an iCalendar UID when the duplicate_uids policy is 'error'."""
+
+    def __init__(self, duplicates: dict[str, list[str]]) -> None:  # noqa: D107
+        super().__init__(
+            "Duplicate iCalendar UIDs in events: "
+            + "; ".join(
+                f"'{uid}' from {', '.join(sources)}"
+                for uid, sources in duplicates.items()
+            )
+        )
+
+
+class UnknownPolicy(ValueError):
+    """Exception class for an unrecognized policy name in a PLUGIN_EVENTS setting."""
+
+    def __init__(self, setting: str, policy: str, choices: tuple[str]) -> None:  # noqa: D107
+        super().__init__(
+            f"Unknown policy '{policy}' in PLUGIN_EVENTS['{setting}'], expected one of: "
+            + ", ".join(choices)
+        )
+
+
 #
 # functions to support testing only
 #
@@ -175,6 +512,7 @@ class DurationParseError(ValueError):
 def clear_events() -> None:
     """For testing only: clear the events list to start a unit test with a clean slate."""
     events.clear()
+    recurring_events_memo.clear()
 
 
 def snapshot_events() -> list:
@@ -187,8 +525,86 @@ def snapshot_events() -> list:
 #
 
 
-def strip_html_tags(html) -> str:
-    """Remove HTML tags for use in iCalendar summary & description."""
+class _HTMLTextStripper(HTMLParser):
+    """Convert HTML to plain text in one pass: drop tags, keep link and image alt text, break lines at blocks."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.lines = []
+        self.parts = []
+        self.skip_depth = 0
+        self.pre_depth = 0
+
+    def break_line(self) -> None:
+        text = "".join(self.parts)
+        self.parts = []
+        if self.pre_depth:
+            self.lines.extend(line.rstrip() for line in text.split("\n"))
+        else:
+            self.lines.append(" ".join(text.split()))
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag in TEXT_SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == "br" or tag in TEXT_BLOCK_TAGS:
+            self.break_line()
+            if tag == "pre":
+                self.pre_depth += 1
+        elif tag == "img":
+            self.parts.append(dict(attrs).get("alt") or "")
+
+    def handle_startendtag(self, tag, attrs) -> None:
+        if tag not in TEXT_SKIP_TAGS:
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag) -> None:
+        if tag in TEXT_SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in TEXT_BLOCK_TAGS:
+            self.break_line()
+            if tag == "pre":
+                self.pre_depth = max(0, self.pre_depth - 1)
+
+    def handle_data(self, data) -> None:
+        if not self.skip_depth:
+            self.parts.append(data)
+
+    def text(self) -> str:
+        self.close()
+        self.break_line()
+        return "\n".join(line for line in self.lines if line.strip())
+
+
+def strip_html_tags(html, engine: str = "html2text") -> str:
+    """Remove HTML tags for use in iCalendar summary & description.
+
+    The html2text engine converts to Markdown-style text. The fast engine uses the standard library's
+    HTML parser in a single pass, keeping only the text with a line break for each block element.
+    Results are kept by a hash of the HTML until the build is finalized, so the calendar, search index and
+    database exports and the passes of i18n_subsites convert each text once. At most HTML_TEXT_CACHE_SIZE
+    texts are kept, dropping the least recently used, so memory use of large sites and long autoreload
+    sessions stays bounded.
+    """
+    key = (engine, hashlib.sha256(html.encode()).digest())
+    text = html_text_cache.get(key)
+    if text is None:
+        text = _html_to_text(html, engine)
+        html_text_cache[key] = text
+        if len(html_text_cache) > HTML_TEXT_CACHE_SIZE:
+            html_text_cache.popitem(last=False)
+    else:
+        html_text_cache.move_to_end(key)
+    return text
+
+
+def _html_to_text(html: str, engine: str) -> str:
+    """Convert HTML to plain text with a text engine, see strip_html_tags()."""
+    if engine == "fast":
+        stripper = _HTMLTextStripper()
+        stripper.feed(html)
+        return stripper.text()
+    if engine != "html2text":
+        raise UnknownTextEngine(engine)
     text_maker = html2text.HTML2Text()
     text_maker.escape_snob = True
     text_maker.ignore_links = True
@@ -199,6 +615,130 @@ def strip_html_tags(html) -> str:
     return text_maker.handle(html).rstrip()
 
 
+def search_terms(text: str) -> set[str]:
+    """Split text into the case-folded word terms of the search index, which clients must split queries into too."""
+    return {
+        term
+        for term in SEARCH_TERM_RE.findall(text.casefold())
+        if len(term) >= SEARCH_MIN_TERM_LENGTH
+    }
+
+
+class _AttributeDict(dict):
+    """Dictionary with its keys as attributes, for generated events which are used like articles."""
+
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+    __delattr__ = dict.__delitem__
+
+    def event_copy(self) -> "_AttributeDict":
+        """Copy a generated event with its own metadata and event_plugin_data, which later stages modify."""
+        return _AttributeDict(
+            self,
+            metadata=dict(self["metadata"]),
+            event_plugin_data=dict(self["event_plugin_data"]),
+        )
+
+
+def parse_geo(value: str) -> tuple[float, float] | None:
+    """Parse event-geo "latitude;longitude" text into floats, or None if it isn't valid coordinates."""
+    try:
+        latitude, longitude = (float(part) for part in str(value).split(";"))
+    except ValueError:
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):  # noqa: PLR2004
+        return None
+    return latitude, longitude
+
+
+def geo_distance_km(a: tuple[float, float], b: tuple[float, float]) -> float:
+    """Great-circle distance in kilometers between two (latitude, longitude) points, by the haversine formula."""
+    lat1, lon1, lat2, lon2 = (math.radians(x) for x in (*a, *b))
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+class GeoIndex:
+    """Grid index of items by (latitude, longitude) for radius and bounding box queries.
+
+    Items are bucketed in cells of cell_degrees on each side, so a query only checks the items in the cells
+    which overlap its area instead of every item. Results keep the order in which items were added, except
+    radius queries which are sorted by distance.
+    """
+
+    def __init__(self, cell_degrees: float = GEO_CELL_DEGREES) -> None:  # noqa: D107
+        self.cell_degrees = cell_degrees
+        self.cells = defaultdict(list)
+        self.count = 0
+
+    def __len__(self) -> int:  # noqa: D105
+        return self.count
+
+    def cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        """Get the grid cell of a point."""
+        return (
+            math.floor(latitude / self.cell_degrees),
+            math.floor(longitude / self.cell_degrees),
+        )
+
+    def add(self, point: tuple[float, float], item) -> None:
+        """Add an item at a (latitude, longitude) point."""
+        self.cells[self.cell(*point)].append((self.count, point, item))
+        self.count += 1
+
+    def _candidates(self, south: float, west: float, north: float, east: float):
+        """Generate the (order, point, item) entries in cells overlapping a bounding box."""
+        min_row, min_col = self.cell(south, west)
+        max_row, max_col = self.cell(north, east)
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                yield from self.cells.get((row, col), ())
+
+    def within_bbox(self, south: float, west: float, north: float, east: float) -> list:
+        """Get the items inside a bounding box. It can't cross the 180th meridian."""
+        found = [
+            (order, item)
+            for order, (lat, lon), item in self._candidates(south, west, north, east)
+            if south <= lat <= north and west <= lon <= east
+        ]
+        return [item for _, item in sorted(found, key=lambda pair: pair[0])]
+
+    def within_radius(self, latitude: float, longitude: float, km: float) -> list:
+        """Get the items within a distance in kilometers of a point, nearest first.
+
+        The area may cross the 180th meridian, in which case the cells on both sides of it are checked.
+        """
+        lat_span = km / KM_PER_DEGREE
+        lon_span = min(
+            180.0, km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6))
+        )
+        south = max(-90.0, latitude - lat_span)
+        north = min(90.0, latitude + lat_span)
+        west = longitude - lon_span
+        east = longitude + lon_span
+        if east - west >= 360.0:  # noqa: PLR2004
+            lon_ranges = [(-180.0, 180.0)]
+        elif west < -180.0:  # noqa: PLR2004
+            lon_ranges = [(west + 360.0, 180.0), (-180.0, east)]
+        elif east > 180.0:  # noqa: PLR2004
+            lon_ranges = [(west, 180.0), (-180.0, east - 360.0)]
+        else:
+            lon_ranges = [(west, east)]
+
+        found = {}
+        for range_west, range_east in lon_ranges:
+            for order, point, item in self._candidates(
+                south, range_west, north, range_east
+            ):
+                distance = geo_distance_km((latitude, longitude), point)
+                if distance <= km:
+                    found[order] = (distance, order, item)
+        return [item for _, _, item in sorted(found.values(), key=lambda x: x[:2])]
+
+
 def get_tz(settings: Settings) -> ZoneInfo:
     """Get site time zone from TIMEZONE or PLUGIN_EVENTS.timezone. If found, override the default UTC."""
     timezone = "UTC"  # start with default
@@ -214,9 +754,9 @@ def parse_tstamp(
 ) -> datetime:
     """Parse a timestamp string in format YYYY-MM-DD HH:MM."""
     if isinstance(metadata[field_name], datetime):
-        return datetime.fromisoformat(metadata[field_name].isoformat()).replace(
-            tzinfo=tz
-        )
+        # a plain datetime, not Pelican's SafeDatetime subclass
+        value = metadata[field_name]
+        return datetime.combine(value.date(), value.time(), tzinfo=tz)
     try:
         # return datetime.strptime(metadata[field_name], '%Y-%m-%d %H:%M').replace(tzinfo=tz)
         return dateutil.parser.parse(metadata[field_name]).replace(tzinfo=tz)
@@ -270,320 +810,3397 @@ def timestamp_now(settings: Settings) -> datetime:
     return run_timestamp
 
 
-#
-# mid-level processing functions using Pelican or iCalendar data structures
-#
+class _HTMLMetaScanner(HTMLParser):
+    """Collect <meta name=... content=...> tags from an HTML document head, stopping at the body."""
 
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.fields = []
+        self.done = False
 
-def parse_article(content) -> None:
-    """Collect articles metadata to be used for building the event calendar."""
-    if not isinstance(content, contents.Article):
-        return
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag == "body":
+            self.done = True
+        elif tag == "meta" and not self.done:
+            attr_dict = dict(attrs)
+            if "name" in attr_dict and "content" in attr_dict:
+                self.fields.append(
+                    (attr_dict["name"].lower(), attr_dict["content"], self.getpos()[0])
+                )
 
-    if "event-start" not in content.metadata:
-        return
+    def handle_endtag(self, tag) -> None:
+        if tag == "head":
+            self.done = True
 
-    site_tz = get_tz(content.settings)
-    dtstart = parse_tstamp(content.metadata, "event-start", site_tz)
-    dtend = dtstart  # placeholder defaults to zero duration until overridden
 
-    if "event-end" in content.metadata:
-        dtend = parse_tstamp(content.metadata, "event-end", site_tz)
+def _iter_markdown_header(lines) -> Iterator[tuple[str, str, int]]:
+    """Scan Markdown metadata lines (Python-Markdown meta extension syntax) until the first blank line."""
+    key = None
+    values = []
+    key_lineno = 0
+    for lineno, raw_line in enumerate(lines, start=1):
+        line = raw_line.rstrip("\r\n")
+        if lineno == 1 and line.strip() == "---":
+            continue
+        if line.strip() in ["", "---", "..."]:
+            break
+        more = MD_META_MORE_RE.match(line)
+        if more and key is not None:
+            values.append(more.group("value").strip())
+            continue
+        meta = MD_META_RE.match(line)
+        if not meta:
+            break
+        if key is not None:
+            yield key, "\n".join(values), key_lineno
+        key = meta.group("key").lower()
+        values = [meta.group("value").strip()]
+        key_lineno = lineno
+    if key is not None:
+        yield key, "\n".join(values), key_lineno
 
-    elif "event-duration" in content.metadata:
-        dtdelta = parse_timedelta(content.metadata)
-        dtend = dtstart + dtdelta
 
-    else:
-        log.error(
-            "Either 'event-end' or 'event-duration' must be specified in the event named '%s'",
-            content.metadata["title"],
-        )
+def _iter_rst_header(lines) -> Iterator[tuple[str, str, int]]:
+    """Scan reStructuredText docinfo fields following the optional document title."""
+    in_fields = False
+    pending_text = False  # a possible title line is waiting for its underline
+    key = None
+    values = []
+    key_lineno = 0
+    for lineno, raw_line in enumerate(lines, start=1):
+        line = raw_line.rstrip("\r\n")
+        field = RST_FIELD_RE.match(line)
+        if field:
+            if key is not None:
+                yield key, "\n".join(values), key_lineno
+            key = field.group("key").lower()
+            values = [field.group("value").strip()]
+            key_lineno = lineno
+            in_fields = True
+            continue
+        if in_fields:
+            if line.startswith((" ", "\t")) and line.strip():
+                values.append(line.strip())
+                continue
+            break
+        if not line.strip():
+            if pending_text:
+                break  # a paragraph, not a title: there is no docinfo header
+            continue
+        if RST_ADORNMENT_RE.match(line):
+            pending_text = False
+            continue
+        if pending_text:
+            break
+        pending_text = True
+    if key is not None:
+        yield key, "\n".join(values), key_lineno
 
-    content.event_plugin_data = {"dtstart": dtstart, "dtend": dtend}
 
-    if "status" not in content.metadata or content.metadata["status"] != "draft":
-        events.append(content)
-        log.debug("parse_article: added event with start time %s", dtstart)
-    else:
-        log.debug("parse_article: skipped event with start time %s", dtstart)
+def iter_metadata_header(path: str) -> Iterator[tuple[str, str, int]]:
+    """Read only the metadata header block of a content source file, yielding (field, value, line number).
 
+    Field names are lower-cased as Pelican's readers do. The file is read line by line and reading stops at the end
+    of the header, so the article body is neither read nor rendered. Raises ValueError for unsupported formats.
+    """
+    ext = os.path.splitext(path)[1][1:].lower()
+    with open(path, encoding="utf-8") as f:
+        if ext in MARKDOWN_EXTENSIONS:
+            yield from _iter_markdown_header(f)
+        elif ext in RST_EXTENSIONS:
+            yield from _iter_rst_header(f)
+        elif ext in HTML_EXTENSIONS:
+            scanner = _HTMLMetaScanner()
+            for line in f:
+                scanner.feed(line)
+                if scanner.done:
+                    break
+            scanner.close()
+            yield from scanner.fields
+        else:
+            raise UnsupportedHeaderFormat(ext=ext, path=path)
 
-def insert_recurring_events(settings: Settings) -> None:
-    """Process recurring_events data from PLUGIN_EVENTS configuration."""
 
-    class _AttributeDict(dict):
-        __getattr__ = dict.__getitem__
-        __setattr__ = dict.__setitem__
-        __delattr__ = dict.__delitem__
+def iter_ics_components(lines, name: str = "VEVENT") -> Iterator[str]:
+    """Split iCalendar text into top-level components of one type, one at a time.
 
-    if "recurring_events" not in settings["PLUGIN_EVENTS"]:
-        return
+    The input is any iterable of lines, such as an open file, and only the component being collected is held in
+    memory. Each component is yielded as its iCalendar text with folded lines left intact, ready for from_ical().
+    """
+    begin = f"BEGIN:{name}"
+    end = f"END:{name}"
+    block = None
+    depth = 0
+    for raw_line in lines:
+        line = raw_line.rstrip("\r\n")
+        if block is None:
+            if line.upper() == begin:
+                block = [line]
+                depth = 1
+            continue
+        block.append(line)
+        if line.upper() == begin:
+            depth += 1
+        elif line.upper() == end:
+            depth -= 1
+            if depth == 0:
+                yield "\r\n".join(block) + "\r\n"
+                block = None
 
-    site_tz = get_tz(settings)
-    for event in settings["PLUGIN_EVENTS"]["recurring_events"]:
-        recurring_rule = event["recurring_rule"]
-        r = RecurringEvent(now_date=timestamp_now(settings))
-        r.parse(recurring_rule)
-        rr = rrule.rrulestr(r.get_RFC_rrule())
 
-        # ugly hack: dateutil.rrule only uses timezone-naive datetimes.
-        # So give it one and correct the result to site_tz.
-        next_occurrence = rr.after(
-            timestamp_now(settings).replace(tzinfo=None)
-        ).replace(tzinfo=site_tz)
+def file_digest(path: str) -> str:
+    """Compute the SHA-256 digest of a file, reading it in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_BLOCK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-        event_duration = parse_timedelta(event)
 
-        # create next event from recurrence
-        gen_event = _AttributeDict(
+def _iter_csv_rows(f) -> Iterator[tuple[int, dict[str, str]]]:
+    """Read CSV rows with a header line as (line, row) pairs, leaving out empty cells."""
+    reader = csv.DictReader(f)
+    if reader.fieldnames is None:
+        return
+    while True:
+        line = reader.line_num + 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        yield (
+            line,
             {
-                "url": f"pages/{event['page_url']}",
-                "location": event["location"],
-                "metadata": {
-                    "title": event["title"],
-                    "summary": event["summary"],
-                    "date": next_occurrence,
-                    "event-location": event["location"],
-                },
-                "event_plugin_data": {
-                    "dtstart": next_occurrence.astimezone(site_tz),
-                    "dtend": next_occurrence.astimezone(site_tz) + event_duration,
-                },
-            }
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and value and value.strip()
+            },
         )
 
-        # copy all supported iCalendar properties (with "event-" prefix) to generated event
-        for field in event:
-            if not field.startswith("event-"):
-                continue
-            field_noprefix = field.removeprefix("event-")
-            if (
-                field_name_check(field_noprefix) is None
-            ):  # None indicates allowed, string indicates violation
-                gen_event["metadata"][field] = event[field]
 
-        # add generated event to events list
-        events.append(gen_event)
+def iter_data_rows(path: str, table: str) -> Iterator[tuple[int, Any]]:
+    """Read event definitions from a CSV, JSON, JSON Lines or TOML file as (line, row) pairs.
 
+    CSV and JSON Lines files are read one row at a time, with the line number where each row starts. Empty
+    CSV cells are left out, so optional event- columns can be blank. JSON files hold a list of objects, or
+    an object with the list under the table name, and TOML files an array of tables with that name. Their
+    rows are numbered from 1 instead.
+    A JSON Lines row which isn't valid JSON is passed on as text, for the validation to report.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, encoding="utf-8", newline="") as f:
+            yield from _iter_csv_rows(f)
+    elif ext == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line, text in enumerate(f, 1):
+                if not text.strip():
+                    continue
+                try:
+                    yield line, json.loads(text)
+                except json.JSONDecodeError:
+                    yield line, text.strip()
+    elif ext in (".json", ".toml"):
+        if ext == ".json":
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        else:
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        if isinstance(data, dict):
+            data = data.get(table, [])
+        yield from enumerate(data, 1)
+    else:
+        raise UnsupportedDataFile(path)
 
-def xfer_metadata_to_event(
-    metadata: dict[str, Any] | None, event: icalendar.cal.Event
-) -> None:
-    """Copy event-related metadata into the iCalendar event. Filter for relevant headers."""
-    if not metadata:
-        return
 
-    # process all metadata prefixed with event- and add them to the iCalendar event
-    # this allows some flexibility in fields from RFC5545 and related standards
-    errors = []
-    comment = []
-    for field in iter(metadata):
-        if not field.lower().startswith("event-"):
-            continue
+def format_validation_error(error: tuple[str, int, str]) -> str:
+    """Format a (path, line, message) validation error like a compiler message."""
+    path, lineno, message = error
+    return f"{path}:{lineno}: {message}"
 
-        fname = field[6:].lower()
-        log.debug("processing field %s", fname)
 
-        # save comment property for later, append errors at end if any
-        if fname == "comment":
-            comment.append(metadata[field])
-            log.debug("field saved as comment")
-            continue
+def truncate_html(html: str, max_length: int) -> tuple[str, bool]:
+    """Cut HTML to at most max_length characters without leaving a partial tag or character entity at the end.
 
-        # skip start, end and duration because they are generated internally
-        if fname in ["start", "end", "duration"]:
-            log.debug("field %s skipped because it is processed separately", fname)
-            continue
+    Returns the HTML and whether it was cut.
+    """
+    if len(html) <= max_length:
+        return html, False
+    cut = html[:max_length]
+    if cut.rfind("<") > cut.rfind(">"):
+        cut = cut[: cut.rfind("<")]
+    amp = cut.rfind("&")
+    if amp > cut.rfind(";") and not any(c.isspace() for c in cut[amp:]):
+        cut = cut[:amp]
+    return cut, True
 
-        # skip disallowed properties, add note to errors list for report in comment property
-        status = field_name_check(fname)
-        if status is not None:
-            errors.append(status)
-            log.debug("field %s skipped because of error %s", fname, status)
-            continue
 
-        # special handling for "GEO" geographic coordinates
-        if fname == "geo":
-            geo_text = metadata[field]
-            event.add("geo", vGeo.from_ical(geo_text))
-            log.debug("field %s processed as coordinates %s", fname, geo_text)
-            continue
+def sweep_overlaps(intervals: list[tuple[Any, Any, Any]]) -> list[tuple[Any, Any]]:
+    """Find the pairs of overlapping (start, end, item) intervals with a sweep line, in O(n log n + pairs).
 
-        # special handling for lists (CATEGORIES, RESOURCES)
-        if fname in ["categories", "resources"]:
-            event.categories = metadata[field].split(",")
+    Intervals are visited in order of start time with a heap of the ends of those still open, so each
+    interval is only compared with the ones it overlaps. Intervals which only touch don't overlap, and empty
+    intervals are ignored. Returns (earlier, later) item pairs, grouped by the later item in order of start time.
+    """
+    pairs = []
+    active = []  # heap of (end, sequence number, item) for the intervals open at the sweep line
+    ordered = sorted(
+        (interval for interval in intervals if interval[1] > interval[0]),
+        key=lambda interval: (interval[0], interval[1]),
+    )
+    for number, (start, end, item) in enumerate(ordered):
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        pairs.extend((other, item) for _, _, other in active)
+        heapq.heappush(active, (end, number, item))
+    return pairs
+
+
+def parse_date_list(value) -> set[int]:
+    """Parse dates into ordinal day numbers.
+
+    The value is a date, an ISO date string or a list of them. Strings may hold several dates separated by
+    commas, semicolons or spaces, and inclusive ranges written as first..last. Raises ValueError for invalid dates.
+    """
+    if isinstance(value, (str, date)):
+        value = [value]
+    ordinals = set()
+    for item in value:
+        if isinstance(item, date):
+            ordinals.add(
+                (item.date() if isinstance(item, datetime) else item).toordinal()
+            )
             continue
+        for text in DATE_LIST_SEPARATOR_RE.split(str(item)):
+            if ".." in text:
+                first, last = text.split("..", 1)
+                ordinals.update(
+                    range(
+                        date.fromisoformat(first).toordinal(),
+                        date.fromisoformat(last).toordinal() + 1,
+                    )
+                )
+            elif text:
+                ordinals.add(date.fromisoformat(text).toordinal())
+    return ordinals
 
-        event.add(fname, metadata[field])
 
-    # process comment property combining user text with any errors that may have occurred
-    if len(errors) > 0:
-        comment.append("*** errors occurred in processing event ***")
-        comment += errors
-    if len(comment) > 0:
-        event.add("comment", "\n".join(comment))
+def read_date_list_file(path: str) -> set[int]:
+    """Read a skip list file of dates as ordinal day numbers, ignoring blank lines and # comments."""
+    ordinals = set()
+    with open(path, encoding="utf-8") as f:
+        for line, text in enumerate(f, start=1):
+            try:
+                ordinals |= parse_date_list(text.split("#", 1)[0].strip())
+            except ValueError as e:
+                raise DateListError(path, line, str(e)) from e
+    return ordinals
 
 
-#
-# Pelican plugin API signal handlers
-# see API reference: https://docs.getpelican.com/en/latest/plugins.html#list-of-signals
-#
+def replace_output_file(path: str, chunks: Iterable[bytes]) -> int:
+    """Write chunks of data to a temporary file next to a path, then rename it to the path.
 
+    Creates the directory if needed. Readers see either the previous file or the complete new one, and the
+    previous file is kept if writing fails. Returns the number of bytes written.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = os.path.join(
+        os.path.dirname(path),
+        f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp",
+    )
+    # created like open() would, with permissions from the umask
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            size = sum(f.write(chunk) for chunk in chunks)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    return size
 
-def generate_ical_file(generator) -> None:
-    """Generate an iCalendar file."""
-    ics_fname = generator.settings["PLUGIN_EVENTS"]["ics_fname"]
-    if not ics_fname:
-        log.debug("generate_ical_file(): bail out, no ics_fname setting")
-        return
 
-    if "metadata_field_for_summary" in generator.settings["PLUGIN_EVENTS"]:
-        metadata_field_for_event_summary = generator.settings["PLUGIN_EVENTS"][
-            "metadata_field_for_summary"
-        ]
+def write_output_file(path: str, data: bytes) -> None:
+    """Write a buffer to a file, creating its directory if needed and replacing the file atomically."""
+    replace_output_file(path, [data])
 
-    if not metadata_field_for_event_summary:
-        metadata_field_for_event_summary = "summary"
 
-    ics_fname = os.path.join(generator.settings["OUTPUT_PATH"], ics_fname)
+class BackgroundWriter:
+    """Write finished output buffers to files in a small pool of background threads.
 
-    ical = icalendar.Calendar()
-    ical.add("prodid", "-//My calendar product//mxm.dk//")
-    ical.add("version", "2.0")
+    Used as a context manager so that disk I/O overlaps with rendering the next output, and all writes are
+    finished when the with block ends. The first write error is raised from close(), so it fails the build.
+    With zero workers, files are written immediately in the calling thread. A calendar streamed by
+    CalendarBuilder.build_streaming() and the conflict report don't go through it, see the output_workers setting.
+    """
 
-    # add site timezone info for VTIMEZONE section to beginning of icalendar object's list
-    site_tz = get_tz(generator.settings)
-    ical.add_component(icalendar.cal.Timezone.from_tzinfo(site_tz))
+    def __init__(self, workers: int = OUTPUT_WORKERS) -> None:  # noqa: D107
+        self.executor = (
+            ThreadPoolExecutor(workers, "pelican_events") if workers > 0 else None
+        )
+        self.futures: list[Future] = []
 
-    default_lang = generator.settings["DEFAULT_LANG"]
-    curr_events = events if not localized_events else localized_events[default_lang]
-    log.debug(
-        "generate_ical_file(): Generating calendar at %s with %d events",
-        ics_fname,
-        len(curr_events),
-    )
+    def __enter__(self) -> "BackgroundWriter":  # noqa: D105
+        return self
 
-    # get list of blog entries with metadata indicating they are events
-    timestamp = timestamp_now(generator.settings)
-    log.debug("generate_ical_file(): filtering with timestamp: %s", str(timestamp))
-    filtered_list = []
-    for c_event in curr_events:
-        dtstart = c_event.event_plugin_data["dtstart"]
-        if timestamp <= dtstart:
-            log.debug(
-                "generate_ical_file(): processing event with timestamp: %s", dtstart
-            )
-            filtered_list.append(c_event)
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: D105
+        if exc_type is None:
+            self.close()
         else:
-            log.debug(
-                "generate_ical_file(): skipping event with timestamp: %s", dtstart
-            )
+            # an exception is already propagating, wait for pending writes without masking it
+            self.close(raise_errors=False)
 
-    for f_event in filtered_list:
-        if "date" in f_event.metadata:
-            dtstamp = parse_tstamp(f_event.metadata, "date", site_tz)
-        else:
-            dtstamp = timestamp
-        icalendar_event = icalendar.Event(
-            summary=strip_html_tags(f_event.metadata[metadata_field_for_event_summary]),
-            dtstart=icalendar.vDatetime(f_event.event_plugin_data["dtstart"]),
-            dtend=icalendar.vDatetime(f_event.event_plugin_data["dtend"]),
-            dtstamp=icalendar.vDatetime(dtstamp),
-            priority=5,
-            uid=generator.settings["SITEURL"] + f_event.url,
-        )
-
-        # copy article text to description field without HTML tags
-        content_text = f_event.content
-        icalendar_event.add("description", strip_html_tags(content_text))
-
-        # copy event- prefixed fields to icalendar object
-        xfer_metadata_to_event(f_event.metadata, icalendar_event)
-        log.debug(
-            "generate_ical_file(): added icalendar event: %s", pformat(icalendar_event)
-        )
+    def write(self, path: str, data: bytes) -> None:
+        """Queue a buffer to be written to a file."""
+        if self.executor is None:
+            write_output_file(path, data)
+            return
+        self.futures.append(self.executor.submit(write_output_file, path, data))
 
-        # save the newly-created event structure in the calendar for export
-        ical.add_component(icalendar_event)
+    def close(self, raise_errors: bool = True) -> None:
+        """Wait for all queued writes to finish and raise the first error, if any."""
+        if self.executor is None:
+            return
+        self.executor.shutdown(wait=True)
+        errors = [f.exception() for f in self.futures if f.exception() is not None]
+        self.futures.clear()
+        for error in errors:
+            log.error("failed to write output file: %s", error)
+        if errors and raise_errors:
+            raise errors[0]
 
-    # create directory if it doesn't exist
-    os.makedirs(os.path.dirname(ics_fname), exist_ok=True)
 
-    # write iCalendar content to file
-    with open(ics_fname, "wb") as f:
-        f.write(ical.to_ical())
-    log.debug("generate_ical_file(): end")
+def expand_rrule(
+    rr: rrule.rrule, after: datetime, before: datetime, max_count: int, deadline: float
+) -> tuple[list[datetime], bool]:
+    """Expand the occurrences of a dateutil rule after one time and up to another in a single iteration.
 
+    Stops at max_count occurrences or when time.monotonic() passes the deadline, which is checked between
+    occurrences. Returns the occurrences and whether the expansion was cut short by the deadline.
+    """
+    occurrences = []
+    for occurrence in rr.xafter(after, count=max_count):
+        if occurrence > before:
+            break
+        occurrences.append(occurrence)
+        if time.monotonic() > deadline:
+            return occurrences, True
+    return occurrences, False
 
-def generate_localized_events(generator) -> None:
-    """Generate localized events dict if i18n_subsites plugin is active."""
-    if "i18n_subsites" in generator.settings["PLUGINS"]:
-        if not os.path.exists(generator.settings["OUTPUT_PATH"]):
-            os.makedirs(generator.settings["OUTPUT_PATH"])
 
-        for e in events:
-            if "lang" in e.metadata:
+def _series_candidates(naive: list[datetime]) -> Iterator[dict[str, Any]]:
+    """Generate the dateutil rule parameters which could produce a list of wall-clock start times."""
+    months = [start.year * 12 + start.month for start in naive]
+    month_step = math.gcd(*(b - a for a, b in itertools.pairwise(months)))
+    if month_step and len({start.day for start in naive}) == 1:
+        yield {
+            "freq": rrule.MONTHLY,
+            "interval": month_step,
+            "bymonthday": naive[0].day,
+        }
+    if month_step and len({start.weekday() for start in naive}) == 1:
+        weekday = rrule.weekdays[naive[0].weekday()]
+        nths = {(start.day - 1) // 7 + 1 for start in naive}
+        if len(nths) == 1 and max(nths) < 5:  # noqa: PLR2004
+            yield {
+                "freq": rrule.MONTHLY,
+                "interval": month_step,
+                "byweekday": weekday(max(nths)),
+            }
+        if all(
+            start.day + 7 > calendar.monthrange(start.year, start.month)[1]
+            for start in naive
+        ):
+            yield {
+                "freq": rrule.MONTHLY,
+                "interval": month_step,
+                "byweekday": weekday(-1),
+            }
+    day_step = math.gcd(*((b - a).days for a, b in itertools.pairwise(naive)))
+    if day_step and day_step % 7 == 0:
+        yield {"freq": rrule.WEEKLY, "interval": day_step // 7}
+    elif day_step:
+        yield {"freq": rrule.DAILY, "interval": day_step}
+
+
+def series_rule(starts: list[datetime]) -> tuple[dict[str, Any] | None, list[datetime]]:
+    """Find a regular rule for a sorted list of start times with the same time of day.
+
+    Monthly rules by day of the month or nth weekday are tried before weekly and daily ones, and the rule
+    which needs the fewest exceptions wins. Returns the parts of an RRULE value with a COUNT, and the start
+    times it produces which aren't in the list, or None if there is no rule with fewer exceptions than half
+    the number of start times.
+    """
+    tz = starts[0].tzinfo
+    naive = [start.replace(tzinfo=None) for start in starts]
+    wanted = set(naive)
+    if len(wanted) != len(naive) or len({start.time() for start in naive}) != 1:
+        return None, []
+    best = None
+    for params in _series_candidates(naive):
+        rr = rrule.rrule(dtstart=naive[0], until=naive[-1], **params)
+        produced = set(rr)
+        if not wanted <= produced:
+            continue
+        if best is None or len(produced) - len(wanted) < len(best[1]):
+            best = (params, sorted(produced - wanted))
+    if best is None or len(best[1]) > len(starts) // 2:
+        return None, []
+    params, missing = best
+    recur = {"FREQ": rrule.FREQNAMES[params["freq"]]}
+    if params["interval"] > 1:
+        recur["INTERVAL"] = params["interval"]
+    if "bymonthday" in params:
+        recur["BYMONTHDAY"] = params["bymonthday"]
+    if "byweekday" in params:
+        weekday = params["byweekday"]
+        recur["BYDAY"] = f"{weekday.n}{rrule.weekdays[weekday.weekday]}"
+    recur["COUNT"] = len(wanted) + len(missing)
+    return recur, [start.replace(tzinfo=tz) for start in missing]
+
+
+def event_days(dtstart: datetime, dtend: datetime) -> list[date]:
+    """List the days an event occupies, from its start day through its end day.
+
+    An event ending exactly at midnight doesn't occupy the day it ends on, unless it also starts then.
+    """
+    first = dtstart.date()
+    last = dtend.date()
+    if last > first and dtend.time() == datetime.min.time():
+        last -= timedelta(days=1)
+    return [first + timedelta(days=n) for n in range((last - first).days + 1)]
+
+
+def iter_months(first: date, last: date) -> Iterator[tuple[int, int]]:
+    """Generate (year, month) tuples from the month of the first date through the month of the last date."""
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)  # noqa: PLR2004
+
+
+#
+# mid-level processing functions using Pelican or iCalendar data structures
+#
+
+
+def plugin_cache(settings: Settings, name: str) -> FileDataCacher | None:
+    """Open a Pelican data cache for plugin data in CACHE_PATH, following the site's content caching settings.
+
+    Returns None when the settings have no cache configuration, as in unit tests with minimal settings.
+    """
+    if "CACHE_PATH" not in settings:
+        return None
+    return FileDataCacher(
+        settings,
+        f"pelican_events_{name}",
+        settings.get("CACHE_CONTENT", False),
+        settings.get("LOAD_CONTENT_CACHE", False),
+    )
+
+
+def event_start_time(component: icalendar.cal.Component, tz: tzinfo) -> datetime | None:
+    """Get the DTSTART of an iCalendar component as a timezone-aware datetime, treating dates as midnight."""
+    if "DTSTART" not in component:
+        return None
+    dtstart = component[
+        "DTSTART"
+    ].dt  # also set for DTSTART added as vDatetime, unlike decoded()
+    if not isinstance(dtstart, datetime) and isinstance(dtstart, date):
+        return datetime(dtstart.year, dtstart.month, dtstart.day, tzinfo=tz)
+    if dtstart.tzinfo is None:
+        return dtstart.replace(tzinfo=tz)
+    return dtstart
+
+
+def filter_ics_event(
+    component: icalendar.cal.Component, source: str
+) -> icalendar.cal.Event:
+    """Copy an imported VEVENT keeping only structural properties and those allowed for site content."""
+    filtered = icalendar.Event()
+    for prop, value in component.items():
+        if prop not in ICAL_MERGE_STRUCTURAL and field_name_check(prop) is not None:
+            log.debug("filter_ics_event: dropped property %s from %s", prop, source)
+            continue
+        filtered[prop] = value
+    if "UID" not in filtered:
+        filtered.add(
+            "uid",
+            hashlib.sha256(component.to_ical()).hexdigest()
+            + "@"
+            + os.path.basename(source),
+        )
+    return filtered
+
+
+def parse_ics_file(path: str, tz: tzinfo) -> list[tuple[datetime, icalendar.cal.Event]]:
+    """Parse the VEVENTs of an iCalendar file incrementally, component by component, into (start, event) pairs."""
+    parsed = []
+    with open(path, encoding="utf-8") as f:
+        for text in iter_ics_components(f):
+            try:
+                component = icalendar.Event.from_ical(text)
+            except ValueError as e:
+                log.warning("skipped unparseable VEVENT in %s: %s", path, e)
+                continue
+            dtstart = event_start_time(component, tz)
+            if dtstart is None:
+                log.warning("skipped VEVENT without DTSTART in %s", path)
+                continue
+            parsed.append((dtstart, filter_ics_event(component, path)))
+    return parsed
+
+
+def load_merged_ics(settings: Settings) -> list[tuple[datetime, icalendar.cal.Event]]:
+    """Load VEVENTs from the .ics files listed in PLUGIN_EVENTS["merge_ics"].
+
+    Parse results are cached per file. A file whose modification time and size are unchanged isn't read at all,
+    and one whose content hash is unchanged isn't parsed again. With Pelican's content caching enabled
+    (CACHE_CONTENT and LOAD_CONTENT_CACHE) the cache is kept in CACHE_PATH between builds.
+    """
+    paths = settings["PLUGIN_EVENTS"].get("merge_ics", [])
+    if not paths:
+        return []
+
+    cache = plugin_cache(settings, "merge_ics")
+    site_tz = get_tz(settings)
+    merged = []
+    for ics_path in paths:
+        path = os.path.join(settings.get("PATH", ""), ics_path)
+        stat = os.stat(path)
+        cached = merged_ics_cache.get(path)
+        if cached is None and cache is not None:
+            cached = cache.get_cached_data(path)
+        if cached is not None and cached["stamp"] == (stat.st_mtime_ns, stat.st_size):
+            log.debug("load_merged_ics: %s unchanged since last parse", path)
+        else:
+            digest = file_digest(path)
+            if cached is not None and cached["digest"] == digest:
+                log.debug("load_merged_ics: %s touched but content unchanged", path)
+            else:
+                log.debug("load_merged_ics: parsing %s", path)
+                cached = {"digest": digest, "events": parse_ics_file(path, site_tz)}
+            cached["stamp"] = (stat.st_mtime_ns, stat.st_size)
+        merged_ics_cache[path] = cached
+        if cache is not None:
+            cache.cache_data(path, cached)
+        merged.extend(cached["events"])
+
+    if cache is not None:
+        cache.save_cache()
+    return merged
+
+
+def utc_ics_time(value: date, tz: tzinfo) -> date:
+    """Convert an iCalendar time to UTC, treating floating times as times in the site time zone. Dates are unchanged."""
+    if not isinstance(value, datetime):
+        return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=tz)
+    return value.astimezone(UTC)
+
+
+def utc_ics_event(
+    component: icalendar.cal.Component, tz: tzinfo
+) -> icalendar.cal.Event:
+    """Copy an imported VEVENT with its times in UTC and without its recurrence properties."""
+    converted = icalendar.Event()
+    for prop, value in component.items():
+        if prop in ICAL_MERGE_RECURRENCE:
+            continue
+        if prop in ICAL_MERGE_TIMES:
+            if (
+                isinstance(value.dt, datetime)
+                and value.dt.tzinfo is None
+                and "TZID" in value.params
+            ):
+                log.warning(
+                    "merge_ics event %s: unknown TZID %s treated as the site time zone",
+                    component.get("UID"),
+                    value.params["TZID"],
+                )
+            converted.add(prop, utc_ics_time(value.dt, tz))
+        else:
+            converted[prop] = value
+    return converted
+
+
+def ics_recurrence_id(start: date) -> str:
+    """Format the start of an occurrence of an imported recurring event for its UID."""
+    if isinstance(start, datetime):
+        return start.strftime("%Y%m%dT%H%M%SZ")
+    return start.strftime("%Y%m%d")
+
+
+def ics_rruleset(
+    component: icalendar.cal.Component, dtstart: datetime, tz: tzinfo
+) -> rrule.rruleset:
+    """Build a dateutil rule set from the RRULE, RDATE and EXDATE properties of an imported VEVENT.
+
+    Raises ValueError if the rule can't be parsed.
+    """
+    rset = rrule.rruleset()
+    rrules = component["RRULE"]
+    for recur in rrules if isinstance(rrules, list) else [rrules]:
+        rset.rrule(rrule.rrulestr(recur.to_ical().decode(), dtstart=dtstart))
+    for prop, add in (("RDATE", rset.rdate), ("EXDATE", rset.exdate)):
+        values = component.get(prop, [])
+        for value_list in values if isinstance(values, list) else [values]:
+            for value in value_list.dts:
+                day = value.dt
+                if not isinstance(day, datetime):
+                    day = datetime.combine(day, dtstart.timetz())
+                add(day if day.tzinfo is not None else day.replace(tzinfo=tz))
+    return rset
+
+
+def merged_ics_occurrences(
+    dtstart: datetime,
+    component: icalendar.cal.Component,
+    settings: Settings,
+    timestamp: datetime,
+    deadline: float,
+) -> list[tuple[datetime, icalendar.cal.Event]]:
+    """Get the upcoming occurrences of an imported VEVENT as (start, event) pairs, with event times in UTC.
+
+    An event with an RRULE is expanded like recurring_events: the next occurrence, or with recurrence_horizon
+    all occurrences through the horizon. Each occurrence is a VEVENT whose UID is the event's UID with the
+    occurrence's start appended, as is an imported RECURRENCE-ID instance which replaces one. A rule which
+    can't be parsed is logged, and only the first occurrence is kept.
+    """
+    tz = get_tz(settings)
+    event = utc_ics_event(component, tz)
+    uid = str(component["UID"])
+    if "RECURRENCE-ID" in component:
+        recurrence_id = utc_ics_time(component["RECURRENCE-ID"].dt, tz)
+        event["UID"] = f"{uid}-{ics_recurrence_id(recurrence_id)}"
+    if "RRULE" not in component:
+        return [(dtstart, event)] if dtstart >= timestamp else []
+
+    try:
+        rset = ics_rruleset(component, dtstart, tz)
+    except ValueError as e:
+        log.warning(
+            "merge_ics event %s: RRULE not expanded, keeping the first occurrence: %s",
+            uid,
+            e,
+        )
+        return [(dtstart, event)] if dtstart >= timestamp else []
+
+    horizon = settings["PLUGIN_EVENTS"].get("recurrence_horizon")
+    if horizon:
+        horizon_delta = parse_timedelta(
+            {"event-duration": horizon, "title": "recurrence_horizon"}
+        )
+        starts, truncated = expand_rrule(
+            rset,
+            timestamp - timedelta(microseconds=1),
+            timestamp + horizon_delta,
+            settings["PLUGIN_EVENTS"].get(
+                "recurrence_max_occurrences", RECURRENCE_MAX_OCCURRENCES
+            ),
+            deadline,
+        )
+        if truncated:
+            log.warning(
+                "merge_ics event %s: expansion stopped after %d occurrences, time budget exceeded",
+                uid,
+                len(starts),
+            )
+    else:
+        start = rset.after(timestamp, inc=True)
+        starts = [] if start is None else [start]
+
+    first = event["DTSTART"].dt
+    duration = event["DTEND"].dt - first if "DTEND" in event else None
+    occurrences = []
+    for start in starts:
+        occurrence = copy.deepcopy(event)
+        occurrence_start = (
+            start.astimezone(UTC) if isinstance(first, datetime) else start.date()
+        )
+        occurrence["UID"] = f"{uid}-{ics_recurrence_id(occurrence_start)}"
+        occurrence["DTSTART"] = icalendar.vDDDTypes(occurrence_start)
+        if duration is not None:
+            occurrence["DTEND"] = icalendar.vDDDTypes(occurrence_start + duration)
+        occurrences.append((start, occurrence))
+    return occurrences
+
+
+def iter_merged_ics_entries(
+    settings: Settings, timestamp: datetime
+) -> Iterator[dict[str, Any]]:
+    """Build UID index entries for the upcoming occurrences of the events of PLUGIN_EVENTS["merge_ics"] files."""
+    deadline = time.monotonic() + settings["PLUGIN_EVENTS"].get(
+        "recurrence_time_budget", RECURRENCE_TIME_BUDGET
+    )
+    merged = load_merged_ics(settings)
+    tz = get_tz(settings)
+
+    # occurrences replaced by RECURRENCE-ID instances are left out of their rule's expansion
+    replaced = {
+        f"{component['UID']}-{ics_recurrence_id(utc_ics_time(component['RECURRENCE-ID'].dt, tz))}"
+        for _, component in merged
+        if "RECURRENCE-ID" in component
+    }
+    for dtstart, component in merged:
+        for _, occurrence in merged_ics_occurrences(
+            dtstart, component, settings, timestamp, deadline
+        ):
+            if "RRULE" in component and str(occurrence["UID"]) in replaced:
+                continue
+            yield {
+                "uid": str(occurrence["UID"]),
+                "lang": None,
+                "source": "merge_ics",
+                "component": occurrence,
+                "geo": (
+                    (occurrence["GEO"].latitude, occurrence["GEO"].longitude)
+                    if "GEO" in occurrence
+                    else None
+                ),
+            }
+
+
+def ics_days(path: str, tz: tzinfo) -> set[int]:
+    """Get the days covered by the VEVENTs of an iCalendar file as ordinal day numbers.
+
+    All-day events cover each day from DTSTART up to their exclusive DTEND, other events the day they start.
+    """
+    ordinals = set()
+    for dtstart, component in parse_ics_file(path, tz):
+        first = dtstart.toordinal()
+        dtend = component["DTEND"].dt if "DTEND" in component else None
+        if isinstance(dtend, date) and not isinstance(dtend, datetime):
+            ordinals.update(range(first, max(dtend.toordinal(), first + 1)))
+        else:
+            ordinals.add(first)
+    return ordinals
+
+
+def load_skip_list(settings: Settings, name: str) -> frozenset[int]:
+    """Get the excluded days of a skip list in PLUGIN_EVENTS["skip_lists"] as ordinal day numbers.
+
+    A skip list is a list of dates, or the path of a file relative to the content PATH: an .ics file whose
+    events are the excluded days, or a text file of dates. Files are parsed again only when their content
+    hash changes. Raises KeyError for an unknown name.
+    """
+    source = settings["PLUGIN_EVENTS"].get("skip_lists", {})[name]
+    if not isinstance(source, str):
+        return frozenset(parse_date_list(source))
+
+    path = os.path.join(settings.get("PATH", ""), source)
+    digest = file_digest(path)
+    cached = skip_list_cache.get(path)
+    if cached is None or cached[0] != digest:
+        log.debug("load_skip_list: parsing %s", path)
+        if path.endswith(".ics"):
+            days = ics_days(path, get_tz(settings))
+        else:
+            days = read_date_list_file(path)
+        cached = (digest, frozenset(days))
+        skip_list_cache[path] = cached
+    return cached[1]
+
+
+def skip_list_names(event: dict[str, Any]) -> list[str]:
+    """Get the skip list names of a recurring event, from a list or a string separated by commas or spaces."""
+    names = event.get("skip_lists", [])
+    if isinstance(names, str):
+        return [name for name in DATE_LIST_SEPARATOR_RE.split(names) if name]
+    return list(names)
+
+
+def event_exclusions(event: dict[str, Any], settings: Settings) -> frozenset[int]:
+    """Get the excluded days of a recurring event from its exdates and skip_lists, as ordinal day numbers."""
+    excluded = parse_date_list(event.get("exdates", []))
+    for name in skip_list_names(event):
+        try:
+            excluded |= load_skip_list(settings, name)
+        except KeyError:
+            log.warning(
+                "recurring event '%s': unknown skip list '%s'", event["title"], name
+            )
+    return frozenset(excluded)
+
+
+def parse_event_metadata(
+    metadata: dict[str, Any], settings: Settings
+) -> dict[str, Any]:
+    """Get the plugin's event data from event- metadata: start and end times, and coordinates if present."""
+    site_tz = get_tz(settings)
+    dtstart = parse_tstamp(metadata, "event-start", site_tz)
+    dtend = dtstart  # placeholder defaults to zero duration until overridden
+
+    if "event-end" in metadata:
+        dtend = parse_tstamp(metadata, "event-end", site_tz)
+
+    elif "event-duration" in metadata:
+        dtdelta = parse_timedelta(metadata)
+        dtend = dtstart + dtdelta
+
+    else:
+        log.error(
+            "Either 'event-end' or 'event-duration' must be specified in the event named '%s'",
+            metadata["title"],
+        )
+
+    event_plugin_data = {"dtstart": dtstart, "dtend": dtend}
+    if "event-geo" in metadata:
+        event_plugin_data["geo"] = parse_geo(metadata["event-geo"])
+    return event_plugin_data
+
+
+def parse_article_event_metadata(
+    metadata: dict[str, Any], settings: Settings
+) -> dict[str, Any]:
+    """Parse the event times of an article with parse_event_metadata(), and its date for the VEVENT's DTSTAMP."""
+    event_plugin_data = parse_event_metadata(metadata, settings)
+    if "date" in metadata:
+        event_plugin_data["dtstamp"] = parse_tstamp(metadata, "date", get_tz(settings))
+    return event_plugin_data
+
+
+def prune_article_event_cache() -> None:
+    """Drop the cached event data of articles which the build pass didn't see, such as deleted articles."""
+    for path in article_event_cache.keys() - article_event_paths:
+        del article_event_cache[path]
+    log.debug("prune_article_event_cache(): %d articles kept", len(article_event_cache))
+
+
+def article_event_data(
+    content,
+) -> tuple[dict[str, Any], tuple[tuple[str, Any], ...]]:
+    """Get the plugin's event data and filtered event- properties of an article, reusing an earlier parse if possible.
+
+    The event data includes the article's date as the VEVENT's DTSTAMP. Both are cached by the article's source
+    path, together with its date and event- metadata fields, the effective site time zone from get_tz() and a
+    hash of the iCalendar property allow-list, which must be unchanged for the cached data to be used. The cache
+    is kept for the i18n_subsites passes and autoreload builds of a process, and with Pelican's content caching
+    enabled (CACHE_CONTENT and LOAD_CONTENT_CACHE) in CACHE_PATH between builds, so warm builds skip parsing
+    event times and filtering properties of unchanged articles. Entries of articles which a build pass didn't
+    see are dropped at its end by prune_article_event_cache(). Returns a copy of the event data, which the
+    caller may modify, and the event_property_map().
+    """
+    metadata = content.metadata
+    path = getattr(content, "source_path", None)
+    if path is None or not any(
+        field in metadata for field in ("event-end", "event-duration")
+    ):
+        # no cache key, or an error to report on each build
+        return (
+            parse_article_event_metadata(metadata, content.settings),
+            event_property_map(metadata),
+        )
+
+    article_event_paths.add(path)
+    key = "\x1f".join(
+        [
+            str(get_tz(content.settings)),
+            ICAL_PROPS_DIGEST,
+            f"date={metadata.get('date')}",
+            *(
+                f"{field}={value}"
+                for field, value in metadata.items()
+                if field.lower().startswith("event-")
+            ),
+        ]
+    )
+    cache = build_caches.get("article_events")
+    cached = article_event_cache.get(path)
+    if cached is None and cache is not None:
+        cached = cache.get_cached_data(path)
+    if cached is None or cached[0] != key:
+        cached = (
+            key,
+            parse_article_event_metadata(metadata, content.settings),
+            event_property_map(metadata),
+        )
+        if cache is not None:
+            cache.cache_data(path, cached)
+    article_event_cache[path] = cached
+    return dict(cached[1]), cached[2]
+
+
+def parse_article(content) -> None:
+    """Collect articles metadata to be used for building the event calendar."""
+    if not isinstance(content, contents.Article):
+        return
+
+    if "event-start" not in content.metadata:
+        return
+
+    content.event_plugin_data, content.event_properties = article_event_data(content)
+    dtstart = content.event_plugin_data["dtstart"]
+    if "status" not in content.metadata or content.metadata["status"] != "draft":
+        events.append(content)
+        log.debug("parse_article: added event with start time %s", dtstart)
+    else:
+        log.debug("parse_article: skipped event with start time %s", dtstart)
+
+
+def recurring_event_errors(event: Any) -> list[str]:
+    """Check a recurring event definition: required fields, event-duration, allowed event- fields and the rule."""
+    if not isinstance(event, dict):
+        return [f"expected a table of fields, found {event!r}"]
+    missing = [key for key in RECURRING_EVENT_KEYS if key not in event]
+    if missing:
+        return ["missing " + ", ".join(missing)]
+    errors = []
+    try:
+        parse_timedelta(
+            {"event-duration": str(event["event-duration"]), "title": event["title"]}
+        )
+    except (UnknownTimeMultiplier, DurationParseError) as e:
+        errors.append(str(e).strip("'\""))
+    for field in event:
+        if (
+            field.startswith("event-")
+            and field not in RECURRING_EVENT_KEYS
+            and field_name_check(field.removeprefix("event-")) is not None
+        ):
+            errors.append(f"field '{field}' isn't an allowed iCalendar property")
+    try:
+        parse_date_list(event.get("exdates", []))
+    except ValueError as e:
+        errors.append(f"invalid exdates: {e}")
+    rule = RecurringEvent()
+    rule.parse(str(event["recurring_rule"]))
+    if not rule.is_recurring:
+        errors.append(f"unable to parse recurring_rule '{event['recurring_rule']}'")
+    return errors
+
+
+def load_recurring_events_file(settings: Settings) -> list[dict[str, Any]]:
+    """Load the valid recurring event definitions from PLUGIN_EVENTS["recurring_events_file"].
+
+    The path is relative to the content PATH. Each row is validated on its own and skipped with a warning if
+    it has errors. Results are cached by the file's content hash, so an unchanged file isn't read again, and
+    by each row's hash, so after editing a row only that row's rule is parsed again. With Pelican's content
+    caching enabled (CACHE_CONTENT and LOAD_CONTENT_CACHE) the cache is kept in CACHE_PATH between builds.
+    """
+    fname = settings["PLUGIN_EVENTS"].get("recurring_events_file")
+    if not fname:
+        return []
+
+    path = os.path.join(settings.get("PATH", ""), fname)
+    cache = plugin_cache(settings, "recurring_events_file")
+    cached = recurring_file_cache.get(path)
+    if cached is None and cache is not None:
+        cached = cache.get_cached_data(path)
+    digest = file_digest(path)
+    if cached is None or cached["digest"] != digest:
+        previous = cached["rows"] if cached is not None else {}
+        cached = {"digest": digest, "rows": {}, "events": [], "errors": []}
+        for line, row in iter_data_rows(path, "recurring_events"):
+            row_hash = hashlib.sha256(
+                json.dumps(row, sort_keys=True, default=str).encode()
+            ).hexdigest()
+            if row_hash in previous:
+                errors = previous[row_hash]
+            else:
+                log.debug("load_recurring_events_file: validating %s:%d", path, line)
+                errors = recurring_event_errors(row)
+            cached["rows"][row_hash] = errors
+            if errors:
+                cached["errors"].append((line, "; ".join(errors)))
+            else:
+                cached["events"].append(row)
+        recurring_file_cache[path] = cached
+        if cache is not None:
+            cache.cache_data(path, cached)
+            cache.save_cache()
+
+    for line, message in cached["errors"]:
+        log.warning("%s:%d: skipped recurring event: %s", path, line, message)
+    return cached["events"]
+
+
+class DataEvent:
+    """An event read from PLUGIN_EVENTS["event_data_file"], with a page written by EventPageGenerator.
+
+    It has the attributes of an event article which the plugin uses, without going through Pelican's
+    readers. The event- metadata is handled like an article's, by parse_event_metadata().
+    """
+
+    def __init__(  # noqa: D107
+        self, record: dict[str, Any], settings: Settings, record_hash: str = ""
+    ) -> None:
+        metadata = {key: value for key, value in record.items() if key != "content"}
+        title = str(metadata.get("title", ""))
+        for key in ("title", "event-start"):
+            if key not in metadata:
+                raise FieldParseError(field_name=key, title=title, error="missing")
+        if "event-end" not in metadata and "event-duration" not in metadata:
+            raise FieldParseError(
+                field_name="event-end",
+                title=title,
+                error="either event-end or event-duration is required",
+            )
+        self.event_plugin_data = parse_event_metadata(metadata, settings)
+        metadata.setdefault("summary", "")
+        metadata.setdefault("date", self.event_plugin_data["dtstart"])
+        metadata["slug"] = str(
+            metadata.get("slug")
+            or slugify(title, regex_subs=settings.get("SLUG_REGEX_SUBSTITUTIONS", []))
+        )
+        fields = {
+            "slug": metadata["slug"],
+            "lang": metadata.get("lang", settings["DEFAULT_LANG"]),
+        }
+        plugin_events = settings["PLUGIN_EVENTS"]
+        self.url = (plugin_events.get("event_page_url") or EVENT_PAGE_URL).format(
+            **fields
+        )
+        self.save_as = (
+            plugin_events.get("event_page_save_as") or EVENT_PAGE_SAVE_AS
+        ).format(**fields)
+        self.metadata = metadata
+        self.content = str(record.get("content", ""))
+        self.record_hash = record_hash
+
+    @property
+    def title(self) -> str:
+        """Get the event title."""
+        return self.metadata["title"]
+
+    @property
+    def summary(self) -> str:
+        """Get the event summary HTML."""
+        return self.metadata["summary"]
+
+
+def event_data_fingerprint(settings: Settings) -> str:
+    """Serialize the settings which DataEvent objects depend on, so cached events are rebuilt when they change."""
+    return json.dumps(
+        [
+            str(get_tz(settings)),
+            settings["DEFAULT_LANG"],
+            settings["PLUGIN_EVENTS"].get("event_page_url"),
+            settings["PLUGIN_EVENTS"].get("event_page_save_as"),
+            settings.get("SLUG_REGEX_SUBSTITUTIONS", []),
+        ],
+        default=str,
+    )
+
+
+def load_event_data_file(settings: Settings) -> list[DataEvent]:
+    """Load the events in PLUGIN_EVENTS["event_data_file"], a CSV, JSON, JSON Lines or TOML file of records.
+
+    The path is relative to the content PATH. Each record becomes a DataEvent, and records with errors are
+    skipped with a warning. Results are cached by the file's content hash, so an unchanged file isn't read
+    again, and by each record's hash, so after an edit only the changed records are processed again. With
+    Pelican's content caching enabled (CACHE_CONTENT and LOAD_CONTENT_CACHE) the cache is kept in CACHE_PATH
+    between builds.
+    """
+    fname = settings["PLUGIN_EVENTS"].get("event_data_file")
+    if not fname:
+        return []
+
+    path = os.path.join(settings.get("PATH", ""), fname)
+    cache = plugin_cache(settings, "event_data")
+    cached = event_data_cache.get(path)
+    if cached is None and cache is not None:
+        cached = cache.get_cached_data(path)
+    fingerprint = event_data_fingerprint(settings)
+    digest = file_digest(path) + "|" + fingerprint
+    if cached is None or cached["digest"] != digest:
+        previous = cached["records"] if cached is not None else {}
+        cached = {"digest": digest, "records": {}, "events": [], "errors": []}
+        for line, record in iter_data_rows(path, "events"):
+            record_hash = hashlib.sha256(
+                json.dumps([fingerprint, record], sort_keys=True, default=str).encode()
+            ).hexdigest()
+            data_event = previous.get(record_hash)
+            if data_event is None:
+                if not isinstance(record, dict):
+                    cached["errors"].append(
+                        (line, f"expected a table of fields, found {record!r}")
+                    )
+                    continue
+                try:
+                    data_event = DataEvent(record, settings, record_hash)
+                except (
+                    FieldParseError,
+                    UnknownTimeMultiplier,
+                    DurationParseError,
+                ) as e:
+                    cached["errors"].append((line, str(e).strip("'\"")))
+                    continue
+            cached["records"][record_hash] = data_event
+            cached["events"].append(data_event)
+        log.debug(
+            "load_event_data_file: %d events from %s, %d processed again",
+            len(cached["events"]),
+            path,
+            len(set(cached["records"]) - set(previous)),
+        )
+        event_data_cache[path] = cached
+        if cache is not None:
+            cache.cache_data(path, cached)
+            cache.save_cache()
+
+    for line, message in cached["errors"]:
+        log.warning("%s:%d: skipped event record: %s", path, line, message)
+    return cached["events"]
+
+
+def insert_data_events(settings: Settings) -> None:
+    """Add the non-draft events from PLUGIN_EVENTS["event_data_file"] to the events list."""
+    for data_event in load_event_data_file(settings):
+        if data_event.metadata.get("status") != "draft":
+            events.append(data_event)
+
+
+def recurring_event_definitions(settings: Settings) -> list[dict[str, Any]]:
+    """Get the recurring event definitions from PLUGIN_EVENTS["recurring_events"] and recurring_events_file."""
+    return [
+        *settings["PLUGIN_EVENTS"].get("recurring_events", []),
+        *load_recurring_events_file(settings),
+    ]
+
+
+def parse_recurring_rule(recurring_rule: str, timestamp: datetime) -> rrule.rrule:
+    """Parse a recurring event rule in recurrent module format into a timezone-naive dateutil rule.
+
+    Rules without a start date start on the day of the timestamp, instead of at the current time of day.
+    The result only depends on the rule text and that day, so compiled rules are kept for the day, and a
+    row of recurring_events_file which is unchanged between builds or passes isn't parsed again.
+    """
+    anchor_day = timestamp.date()
+    cached = rrule_cache.get(recurring_rule)
+    if cached is not None and cached[0] == anchor_day:
+        return cached[1]
+
+    r = RecurringEvent(now_date=timestamp)
+    r.parse(recurring_rule)
+    anchor = datetime.combine(anchor_day, datetime.min.time())
+    rr = rrule.rrulestr(r.get_RFC_rrule(), dtstart=anchor)
+    rrule_cache[recurring_rule] = (anchor_day, rr)
+    return rr
+
+
+def recurring_occurrences(
+    event: dict[str, Any],
+    settings: Settings,
+    timestamp: datetime,
+    deadline: float,
+    cache: FileDataCacher | None,
+) -> list[datetime]:
+    """Get the upcoming occurrences of a recurring event rule in the site time zone.
+
+    Without PLUGIN_EVENTS["recurrence_horizon"] this is only the next occurrence. With it, all occurrences
+    from the anchor day (the day of the timestamp) through the horizon are expanded in bulk, up to
+    recurrence_max_occurrences. Complete expansions are cached per time zone, rule and anchor day, in memory and in the
+    plugin's cache in CACHE_PATH, so later builds on the same day skip parsing and expanding the rule.
+    Occurrences on days excluded by the event's exdates and skip_lists are left out.
+    """
+    site_tz = get_tz(settings)
+    recurring_rule = event["recurring_rule"]
+    excluded = event_exclusions(event, settings)
+    horizon = settings["PLUGIN_EVENTS"].get("recurrence_horizon")
+    if not horizon:
+        rr = parse_recurring_rule(recurring_rule, timestamp)
+
+        # ugly hack: dateutil.rrule only uses timezone-naive datetimes.
+        # So give it one and correct the result to site_tz.
+        occurrence = rr.after(timestamp.replace(tzinfo=None))
+        while occurrence is not None and occurrence.toordinal() in excluded:
+            occurrence = rr.after(occurrence)
+        return [] if occurrence is None else [occurrence.replace(tzinfo=site_tz)]
+
+    max_count = settings["PLUGIN_EVENTS"].get(
+        "recurrence_max_occurrences", RECURRENCE_MAX_OCCURRENCES
+    )
+    anchor_day = timestamp.date()
+    cache_key = (
+        f"{site_tz}|{recurring_rule}|{anchor_day.isoformat()}|{horizon}|{max_count}"
+    )
+    occurrences = recurrence_cache.get(cache_key)
+    if occurrences is None and cache is not None:
+        occurrences = cache.get_cached_data(cache_key)
+    if occurrences is None:
+        rr = parse_recurring_rule(recurring_rule, timestamp)
+        anchor = datetime.combine(anchor_day, datetime.min.time())
+        horizon_delta = parse_timedelta(
+            {"event-duration": horizon, "title": "recurrence_horizon"}
+        )
+        expanded, truncated = expand_rrule(
+            rr, anchor, anchor + horizon_delta, max_count, deadline
+        )
+        occurrences = [occurrence.replace(tzinfo=site_tz) for occurrence in expanded]
+        if truncated:
+            log.warning(
+                "recurring event '%s': expansion stopped after %d occurrences, time budget exceeded",
+                event["title"],
+                len(occurrences),
+            )
+        else:
+            recurrence_cache[cache_key] = occurrences
+            if cache is not None:
+                cache.cache_data(cache_key, occurrences)
+    return [
+        occurrence
+        for occurrence in occurrences
+        if occurrence > timestamp and occurrence.toordinal() not in excluded
+    ]
+
+
+def recurring_events_key(
+    definitions: list[dict[str, Any]], settings: Settings, timestamp: datetime
+) -> str:
+    """Hash the inputs of insert_recurring_events() which stay the same for the passes of a build.
+
+    These are the definitions, the effective site time zone from get_tz(), the recurrence settings, the skip lists with the content
+    hash of skip list files, and the day of the timestamp, which anchors the rules.
+    """
+    plugin_events = settings["PLUGIN_EVENTS"]
+    skip_lists = {}
+    for name, source in plugin_events.get("skip_lists", {}).items():
+        path = (
+            os.path.join(settings.get("PATH", ""), source)
+            if isinstance(source, str)
+            else None
+        )
+        skip_lists[name] = (
+            file_digest(path) if path and os.path.exists(path) else source
+        )
+    return hashlib.sha256(
+        json.dumps(
+            [
+                str(get_tz(settings)),
+                timestamp.date().isoformat(),
+                plugin_events.get("recurrence_horizon"),
+                plugin_events.get("recurrence_max_occurrences"),
+                definitions,
+                skip_lists,
+            ],
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+def insert_recurring_events(settings: Settings) -> None:
+    """Process recurring_events data from PLUGIN_EVENTS configuration.
+
+    The generated events are kept until the first of them starts. A later pass of the same build with the
+    same recurring_events_key(), as with i18n_subsites, gets copies of them without parsing and expanding the
+    rules again.
+    """
+    start_time = time.perf_counter()
+    definitions = recurring_event_definitions(settings)
+    if not definitions:
+        return
+
+    count = len(events)
+    timestamp = timestamp_now(settings)
+    memo_key = recurring_events_key(definitions, settings, timestamp)
+    memo = recurring_events_memo.get(memo_key)
+    if memo is not None and (
+        memo["valid_until"] is None or timestamp < memo["valid_until"]
+    ):
+        log.debug("insert_recurring_events: reusing events of the previous pass")
+        events.extend(gen_event.event_copy() for gen_event in memo["events"])
+    else:
+        generated = generate_recurring_events(definitions, settings, timestamp)
+        recurring_events_memo.clear()
+        recurring_events_memo[memo_key] = {
+            "events": [gen_event.event_copy() for gen_event in generated],
+            "valid_until": min(
+                (gen_event.event_plugin_data["dtstart"] for gen_event in generated),
+                default=None,
+            ),
+        }
+        events.extend(generated)
+
+    if events_recurrence_expanded.receivers:
+        events_recurrence_expanded.send(
+            settings,
+            definitions=len(definitions),
+            events=len(events) - count,
+            duration=time.perf_counter() - start_time,
+        )
+
+
+def generate_recurring_events(
+    definitions: list[dict[str, Any]], settings: Settings, timestamp: datetime
+) -> list:
+    """Generate events from the upcoming occurrences of recurring event definitions."""
+    generated = []
+    site_tz = get_tz(settings)
+    expand = bool(settings["PLUGIN_EVENTS"].get("recurrence_horizon"))
+    deadline = time.monotonic() + settings["PLUGIN_EVENTS"].get(
+        "recurrence_time_budget", RECURRENCE_TIME_BUDGET
+    )
+    cache = plugin_cache(settings, "recurrence") if expand else None
+    for event in definitions:
+        event_duration = parse_timedelta(event)
+
+        # create events from the upcoming occurrences of the recurrence
+        for next_occurrence in recurring_occurrences(
+            event, settings, timestamp, deadline, cache
+        ):
+            gen_event = _AttributeDict(
+                {
+                    "url": f"pages/{event['page_url']}",
+                    "location": event["location"],
+                    "metadata": {
+                        "title": event["title"],
+                        "summary": event["summary"],
+                        "date": next_occurrence,
+                        "event-location": event["location"],
+                    },
+                    "event_plugin_data": {
+                        "dtstart": next_occurrence.astimezone(site_tz),
+                        "dtend": next_occurrence.astimezone(site_tz) + event_duration,
+                    },
+                }
+            )
+            if "event-geo" in event:
+                gen_event["event_plugin_data"]["geo"] = parse_geo(event["event-geo"])
+            if expand:
+                # occurrences share the page URL, so each needs its own UID
+                gen_event["event_plugin_data"]["occurrence"] = next_occurrence
+
+            # copy all supported iCalendar properties (with "event-" prefix) to generated event
+            for field in event:
+                if not field.startswith("event-"):
+                    continue
+                field_noprefix = field.removeprefix("event-")
+                if (
+                    field_name_check(field_noprefix) is None
+                ):  # None indicates allowed, string indicates violation
+                    gen_event["metadata"][field] = event[field]
+
+            generated.append(gen_event)
+
+    if cache is not None:
+        cache.save_cache()
+    return generated
+
+
+def start_event_collection(settings: Settings) -> None:
+    """Start collecting the events of a build pass with the recurring events and the events of the data file."""
+    stage_start_times["collection"] = time.perf_counter()
+    if events_collection_started.receivers:
+        events_collection_started.send(settings)
+    build_caches["article_events"] = plugin_cache(settings, "article_events")
+    article_event_paths.clear()
+    del events[:]
+    localized_events.clear()
+    insert_recurring_events(settings)
+    insert_data_events(settings)
+
+
+def event_property_map(metadata: dict[str, Any]) -> tuple[tuple[str, Any], ...]:
+    """Filter event-related metadata into the (property, value) pairs added to the iCalendar event.
+
+    Disallowed and unrecognized properties are left out and reported in a COMMENT property at the end.
+    """
+    properties = []
+    # process all metadata prefixed with event- and add them to the iCalendar event
+    # this allows some flexibility in fields from RFC5545 and related standards
+    errors = []
+    comment = []
+    for field in iter(metadata):
+        if not field.lower().startswith("event-"):
+            continue
+
+        fname = field[6:].lower()
+        log.debug("processing field %s", fname)
+
+        # save comment property for later, append errors at end if any
+        if fname == "comment":
+            comment.append(metadata[field])
+            log.debug("field saved as comment")
+            continue
+
+        # skip start, end and duration because they are generated internally
+        if fname in ["start", "end", "duration"]:
+            log.debug("field %s skipped because it is processed separately", fname)
+            continue
+
+        # skip disallowed properties, add note to errors list for report in comment property
+        status = field_name_check(fname)
+        if status is not None:
+            errors.append(status)
+            log.debug("field %s skipped because of error %s", fname, status)
+            continue
+
+        properties.append((fname, metadata[field]))
+
+    # process comment property combining user text with any errors that may have occurred
+    if len(errors) > 0:
+        comment.append("*** errors occurred in processing event ***")
+        comment += errors
+    if len(comment) > 0:
+        properties.append(("comment", "\n".join(comment)))
+    return tuple(properties)
+
+
+def xfer_metadata_to_event(
+    metadata: dict[str, Any] | None,
+    event: icalendar.cal.Event,
+    properties: tuple[tuple[str, Any], ...] | None = None,
+) -> None:
+    """Copy event-related metadata into the iCalendar event. Filter for relevant headers.
+
+    The event_property_map() of the metadata may be passed in if it's already known, as for cached articles.
+    """
+    if not metadata:
+        return
+    if properties is None:
+        properties = event_property_map(metadata)
+
+    for fname, value in properties:
+        # special handling for "GEO" geographic coordinates
+        if fname == "geo":
+            event.add("geo", vGeo.from_ical(value))
+            log.debug("field %s processed as coordinates %s", fname, value)
+            continue
+
+        # special handling for lists (CATEGORIES, RESOURCES)
+        if fname in ["categories", "resources"]:
+            event.categories = value.split(",")
+            continue
+
+        event.add(fname, value)
+
+
+def build_ical_event(
+    f_event, settings: Settings, timestamp: datetime
+) -> icalendar.Event:
+    """Build the iCalendar VEVENT for an event article or generated event."""
+    metadata_field_for_event_summary = (
+        settings["PLUGIN_EVENTS"].get("metadata_field_for_summary") or "summary"
+    )
+    # articles have their date parsed with their event times, see parse_article_event_metadata()
+    dtstamp = f_event.event_plugin_data.get("dtstamp")
+    if dtstamp is None and "date" in f_event.metadata:
+        dtstamp = parse_tstamp(f_event.metadata, "date", get_tz(settings))
+    elif dtstamp is None:
+        dtstamp = timestamp
+    text_engine = settings["PLUGIN_EVENTS"].get("text_engine", "html2text")
+    icalendar_event = icalendar.Event(
+        summary=strip_html_tags(
+            f_event.metadata[metadata_field_for_event_summary], text_engine
+        ),
+        dtstart=icalendar.vDatetime(f_event.event_plugin_data["dtstart"]),
+        dtend=icalendar.vDatetime(f_event.event_plugin_data["dtend"]),
+        dtstamp=icalendar.vDatetime(dtstamp),
+        priority=5,
+        uid=event_uid(f_event, settings),
+    )
+
+    # copy article text to description field without HTML tags
+    icalendar_event.add(
+        "description", event_description(f_event, settings, text_engine)
+    )
+
+    # copy event- prefixed fields to icalendar object
+    # an event-uid field has already been used as the UID, so don't let it add a second one
+    xfer_metadata_to_event(
+        f_event.metadata, icalendar_event, getattr(f_event, "event_properties", None)
+    )
+    icalendar_event["UID"] = icalendar.vText(event_uid(f_event, settings))
+    return icalendar_event
+
+
+def event_link(f_event, settings: Settings) -> str:
+    """Get the absolute URL of an event's page on the site."""
+    return settings.get("SITEURL", "").rstrip("/") + "/" + f_event.url
+
+
+def event_description(f_event, settings: Settings, text_engine: str) -> str:
+    """Get the plain text for the iCalendar DESCRIPTION of an event according to PLUGIN_EVENTS["description_mode"].
+
+    In "full" mode this is the article text, in "summary" mode the article summary followed by the article URL,
+    and in "link" mode only the URL. Generated recurring events and events without text use their summary.
+    With PLUGIN_EVENTS["description_max_length"], the HTML is truncated before it is converted to text, and a
+    truncated description ends with an ellipsis and the URL of the full article.
+    """
+    mode = settings["PLUGIN_EVENTS"].get("description_mode", "full")
+    if mode not in DESCRIPTION_MODES:
+        raise UnknownPolicy("description_mode", mode, DESCRIPTION_MODES)
+    link = event_link(f_event, settings)
+    if mode == "link":
+        return link
+
+    if not isinstance(f_event, (contents.Content, DataEvent)):
+        html = f_event.metadata["summary"]
+    elif mode == "summary" or not f_event.content:
+        html = f_event.summary
+    else:
+        html = f_event.content
+
+    max_length = settings["PLUGIN_EVENTS"].get("description_max_length")
+    truncated = False
+    if max_length:
+        html, truncated = truncate_html(html, max_length)
+    text = strip_html_tags(html, text_engine)
+    if max_length and len(text) > max_length:
+        text = text[:max_length].rstrip()
+        truncated = True
+    if truncated:
+        # the cut may be in the middle of a word, so end at the last whole word
+        text = text.rsplit(maxsplit=1)[0] if " " in text else text
+        text += "\u2026"
+    if mode == "summary" or truncated:
+        text += "\n\n" + link
+    return text
+
+
+def event_uid(f_event, settings: Settings) -> str:
+    """Get the iCalendar UID of an event: its event-uid metadata if present, otherwise its URL on the site.
+
+    Occurrences expanded from a recurring event rule get their start time as a prefix to keep them distinct.
+    """
+    if "event-uid" in f_event.metadata:
+        uid = str(f_event.metadata["event-uid"])
+    else:
+        uid = settings["SITEURL"] + f_event.url
+    if "occurrence" in f_event.event_plugin_data:
+        uid = f_event.event_plugin_data["occurrence"].strftime("%Y%m%dT%H%M%S-") + uid
+    return uid
+
+
+def event_lang(f_event, settings: Settings) -> str:
+    """Get the language of an event article, or the site default language for generated events."""
+    if isinstance(f_event, contents.Content):
+        return f_event.lang
+    return f_event.metadata.get("lang", settings["DEFAULT_LANG"])
+
+
+def event_source(f_event) -> str:
+    """Describe where an event came from, for reports: its source file, or its URL for generated events."""
+    if isinstance(f_event, contents.Content) and f_event.source_path:
+        return f_event.source_path
+    return f_event.url
+
+
+def translation_uid(f_event, settings: Settings) -> str:
+    """Get the UID of the default-language version of an event article, so its translations share one UID."""
+    if isinstance(f_event, contents.Content) and not f_event.in_default_lang:
+        for translation in f_event.translations:
+            if translation.in_default_lang:
+                return event_uid(translation, settings)
+    return event_uid(f_event, settings)
+
+
+def uid_index_entry(
+    f_event, component: icalendar.Event, settings: Settings
+) -> dict[str, Any]:
+    """Make an entry for the UID index from an event and its VEVENT."""
+    policy = settings["PLUGIN_EVENTS"].get("duplicate_uids", "warn")
+    uid = (
+        translation_uid(f_event, settings)
+        if policy == "merge"
+        else event_uid(f_event, settings)
+    )
+    return {
+        "uid": uid,
+        "lang": event_lang(f_event, settings),
+        "source": event_source(f_event),
+        "component": component,
+        "geo": f_event.event_plugin_data.get("geo"),
+    }
+
+
+def index_event_uids(entries: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    """Build a hash index of UID index entries by UID, in one pass over the entries."""
+    index = defaultdict(list)
+    for entry in entries:
+        index[entry["uid"]].append(entry)
+    return index
+
+
+def _entry_stamp(entry: dict[str, Any]) -> datetime:
+    """Get the DTSTAMP of a UID index entry's VEVENT, or its LAST-MODIFIED, in UTC; the earliest time if neither."""
+    component = entry["component"]
+    stamp = component.get("DTSTAMP") or component.get("LAST-MODIFIED")
+    if stamp is None:
+        return datetime.min.replace(tzinfo=UTC)
+    value = stamp.dt
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    return utc_ics_time(value, UTC)
+
+
+def _newest_entry(entries: list[dict[str, Any]]) -> dict[str, Any]:
+    """Select the UID index entry whose VEVENT has the latest DTSTAMP or LAST-MODIFIED; the first one wins ties.
+
+    Imported events may have neither, then the first entry is kept.
+    """
+    return max(entries, key=_entry_stamp)
+
+
+def _merge_translations(
+    entries: list[dict[str, Any]], default_lang: str
+) -> dict[str, Any]:
+    """Merge entries of the same event in different languages into one VEVENT with language-tagged text.
+
+    The VEVENT keeps the single SUMMARY and DESCRIPTION of the default language, which RFC 5545 allows only
+    once. Each translation adds an X-ALT-DESC with its LANGUAGE, holding the translated title and text.
+    """
+    by_lang = {}
+    for entry in entries:
+        if entry["lang"] in by_lang:
+            by_lang[entry["lang"]] = _newest_entry([by_lang[entry["lang"]], entry])
+        else:
+            by_lang[entry["lang"]] = entry
+    base = by_lang.get(default_lang, entries[0])
+    component = base["component"]
+    component["UID"] = icalendar.vText(base["uid"])
+    if base["lang"]:
+        for prop in ["SUMMARY", "DESCRIPTION"]:
+            if prop in component:
+                component.add(
+                    prop,
+                    str(component.pop(prop)),
+                    parameters={"LANGUAGE": base["lang"]},
+                )
+    for lang, entry in sorted(by_lang.items(), key=lambda item: str(item[0])):
+        if entry is base:
+            continue
+        text = [
+            str(entry["component"].get(prop, "")) for prop in ["SUMMARY", "DESCRIPTION"]
+        ]
+        parameters = {"FMTTYPE": "text/plain"}
+        if lang:
+            parameters["LANGUAGE"] = lang
+        component.add(
+            "x-alt-desc", "\n\n".join(t for t in text if t), parameters=parameters
+        )
+    return base
+
+
+def _report_duplicate_uids(
+    index: dict[str, list[dict[str, Any]]],
+    duplicates: dict[str, list[str]],
+    policy: str,
+) -> None:
+    """Log duplicate UIDs, except translations which are merged as intended by the "merge" policy."""
+    for uid, sources in duplicates.items():
+        langs = {entry["lang"] for entry in index[uid]}
+        if policy == "merge" and len(langs) == len(sources):
+            log.debug(
+                "merging translations of UID '%s' from %s", uid, ", ".join(sources)
+            )
+        else:
+            log.warning(
+                "duplicate iCalendar UID '%s' in events from %s",
+                uid,
+                ", ".join(sources),
+            )
+
+
+def resolve_duplicate_uids(
+    entries: list[dict[str, Any]], settings: Settings
+) -> list[dict[str, Any]]:
+    """Detect events sharing a UID and apply the duplicate_uids policy from PLUGIN_EVENTS.
+
+    Policies: "warn" (default) reports duplicates and keeps them all, "error" raises DuplicateUIDError,
+    "newest" keeps the event with the latest DTSTAMP, and "merge" combines translations of an event into one
+    VEVENT with language-tagged text (other duplicates keep the newest). Entry order is otherwise preserved.
+    """
+    policy = settings["PLUGIN_EVENTS"].get("duplicate_uids", "warn")
+    if policy not in DUPLICATE_UID_POLICIES:
+        raise UnknownPolicy("duplicate_uids", policy, DUPLICATE_UID_POLICIES)
+
+    index = index_event_uids(entries)
+    duplicates = {
+        uid: [entry["source"] for entry in group]
+        for uid, group in index.items()
+        if len(group) > 1
+    }
+    if not duplicates:
+        return entries
+    if policy == "error":
+        raise DuplicateUIDError(duplicates)
+
+    _report_duplicate_uids(index, duplicates, policy)
+    if policy == "warn":
+        return entries
+
+    # keep one entry per UID at the position of its first occurrence
+    kept = {}
+    for uid, group in index.items():
+        if len(group) == 1:
+            kept[uid] = group[0]
+        elif policy == "merge":
+            kept[uid] = _merge_translations(group, settings["DEFAULT_LANG"])
+        else:
+            kept[uid] = _newest_entry(group)
+    resolved = []
+    for entry in entries:
+        if entry["uid"] in kept:
+            resolved.append(kept.pop(entry["uid"]))
+    return resolved
+
+
+def new_calendar(
+    settings: Settings, refresh: timedelta | None = None
+) -> icalendar.Calendar:
+    """Start an iCalendar object with the calendar properties and the site time zone."""
+    ical = icalendar.Calendar()
+    ical.add("prodid", "-//My calendar product//mxm.dk//")
+    ical.add("version", "2.0")
+    if refresh is not None:
+        ical.add(
+            "refresh-interval",
+            icalendar.vDuration(refresh),
+            parameters={"VALUE": "DURATION"},
+        )
+
+    # add site timezone info for VTIMEZONE section to beginning of icalendar object's list
+    # its transitions don't depend on the build, so it's computed once per time zone and shared
+    site_tz = get_tz(settings)
+    vtimezone = timezone_cache.get(str(site_tz))
+    if vtimezone is None:
+        vtimezone = icalendar.cal.Timezone.from_tzinfo(site_tz)
+        timezone_cache[str(site_tz)] = vtimezone
+    ical.add_component(vtimezone)
+    return ical
+
+
+def as_event(record, settings: Settings):
+    """Convert a dictionary of metadata fields to a DataEvent. Event objects are returned unchanged."""
+    if isinstance(record, dict) and "event_plugin_data" not in record:
+        return DataEvent(record, settings)
+    return record
+
+
+def iter_calendar_entries(
+    events_iter: Iterable, settings: Settings, timestamp: datetime
+) -> Iterator[dict[str, Any]]:
+    """Build UID index entries with VEVENTs for the upcoming events of an iterable, then merged external events.
+
+    Events are consumed one at a time. Besides event objects, dictionaries of metadata fields like the records
+    of PLUGIN_EVENTS["event_data_file"] are accepted, and converted to DataEvent objects.
+    """
+    for f_event in (as_event(record, settings) for record in events_iter):
+        if f_event.event_plugin_data["dtstart"] < timestamp:
+            continue
+        timed = bool(events_event_rendered.receivers)
+        start_time = time.perf_counter() if timed else 0.0
+        icalendar_event = build_ical_event(f_event, settings, timestamp)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                "iter_calendar_entries(): added icalendar event: %s",
+                pformat(icalendar_event),
+            )
+        entry = uid_index_entry(f_event, icalendar_event, settings)
+        if timed:
+            events_event_rendered.send(
+                settings,
+                event=f_event,
+                uid=entry["uid"],
+                duration=time.perf_counter() - start_time,
+            )
+        yield entry
+
+    # add upcoming events from external iCalendar files
+    yield from iter_merged_ics_entries(settings, timestamp)
+
+
+def collect_calendar_entries(
+    curr_events: list, settings: Settings, timestamp: datetime
+) -> list[dict[str, Any]]:
+    """Build UID index entries with VEVENTs for the upcoming site events and merged external events."""
+    entries = list(iter_calendar_entries(curr_events, settings, timestamp))
+
+    # one event per UID if so configured
+    entries = resolve_duplicate_uids(entries, settings)
+
+    # keep the soonest events if the feed has a cap on its number of events
+    max_events = settings["PLUGIN_EVENTS"].get("max_events")
+    if max_events and len(entries) > max_events:
+        log.info(
+            "calendar limited to the first %d of %d upcoming events by max_events",
+            max_events,
+            len(entries),
+        )
+        site_tz = get_tz(settings)
+        entries = sorted(
+            entries, key=lambda entry: event_start_time(entry["component"], site_tz)
+        )[:max_events]
+
+    # repeated events as a series of one VEVENT if so configured
+    if settings["PLUGIN_EVENTS"].get("compact_series"):
+        entries = compact_series(entries, settings)
+    return entries
+
+
+def series_signature(component: icalendar.cal.Component, props) -> str:
+    """Get the values which events must share to be compacted into a series, as a string.
+
+    DURATION is the time from DTSTART to DTEND, and digits in SUMMARY are ignored so that numbered
+    titles like "Meetup #42" match.
+    """
+    values = []
+    for prop in props:
+        if prop == "DURATION":
+            value = (
+                component["DTEND"].dt - component["DTSTART"].dt
+                if "DTEND" in component
+                else component.get("DURATION", "")
+            )
+        elif prop == "SUMMARY":
+            value = re.sub(r"\d+", "#", str(component.get("SUMMARY", "")))
+        else:
+            value = component.get(prop, "")
+        values.append(str(value))
+    return "\x1f".join(values)
+
+
+def compact_series(
+    entries: list[dict[str, Any]], settings: Settings
+) -> list[dict[str, Any]]:
+    """Replace groups of repeated site events by a series of one VEVENT with RRULE or RDATE.
+
+    Site events are grouped by their series_signature() of the properties in PLUGIN_EVENTS["compact_signature"].
+    Groups of at least compact_min_events are compacted: the first event becomes the master VEVENT, with an
+    RRULE and EXDATE for missing occurrences if the start times are regular, or else RDATE. Occurrences whose
+    compact_override_props differ from the master's are kept as overrides with the series UID and a
+    RECURRENCE-ID. By default that's only SUMMARY, since each article of a series has its own text. A group where more than half of the events would be overrides, as with numbered titles,
+    is left as separate events. Events from merge_ics and events with their own recurrence properties are
+    left alone.
+    """
+    plugin_events = settings["PLUGIN_EVENTS"]
+    props = plugin_events.get("compact_signature", COMPACT_SIGNATURE)
+    override_props = plugin_events.get("compact_override_props", COMPACT_OVERRIDE_PROPS)
+    min_events = max(plugin_events.get("compact_min_events", COMPACT_MIN_EVENTS), 2)
+    site_tz = get_tz(settings)
+
+    groups = defaultdict(list)
+    for entry in entries:
+        component = entry["component"]
+        if entry["source"] == "merge_ics" or any(
+            prop in component for prop in ("RRULE", "RDATE", "RECURRENCE-ID")
+        ):
+            continue
+        groups[series_signature(component, props)].append(entry)
+
+    compacted = {}
+    for signature, group in groups.items():
+        if len(group) < min_events:
+            continue
+        group.sort(key=lambda entry: event_start_time(entry["component"], site_tz))
+        starts = [entry["component"]["DTSTART"].dt for entry in group]
+        master = group[0]["component"]
+        overrides = [
+            (entry, start)
+            for entry, start in zip(group[1:], starts[1:], strict=True)
+            if any(
+                str(entry["component"].get(p)) != str(master.get(p))
+                for p in override_props
+            )
+        ]
+        if len(overrides) > len(group) // 2:
+            # such as numbered titles: the overrides would make the series larger than the events
+            log.debug(
+                "compact_series(): %d of %d events differ from the first, not compacted",
+                len(overrides),
+                len(group),
+            )
+            continue
+
+        # the series is built from copies, leaving the callers' components as they were
+        uid = "series-" + hashlib.sha256(signature.encode()).hexdigest()[:32]
+        master = copy.deepcopy(master)
+        master["UID"] = icalendar.vText(uid)
+        recur, exdates = series_rule(starts)
+        if recur is not None:
+            master.add("rrule", recur)
+            if exdates:
+                master.add("exdate", exdates)
+        else:
+            master.add("rdate", starts[1:])
+        series = [{**group[0], "component": master, "uid": uid}]
+        for entry, start in overrides:
+            component = copy.deepcopy(entry["component"])
+            component["UID"] = icalendar.vText(uid)
+            component.add("recurrence-id", start)
+            series.append({**entry, "component": component, "uid": uid})
+        log.debug(
+            "compact_series(): %d events in series %s with %d overrides",
+            len(group),
+            uid,
+            len(series) - 1,
+        )
+        compacted[id(group[0])] = series
+        compacted.update((id(entry), []) for entry in group[1:])
+
+    result = []
+    for entry in entries:
+        result.extend(compacted.get(id(entry), [entry]))
+    return result
+
+
+def write_calendar_file(
+    path: str, ical: icalendar.Calendar, writer: BackgroundWriter | None = None
+) -> int:
+    """Write an iCalendar object to a file, creating its directory if needed.
+
+    The calendar is rendered in the calling thread. With a BackgroundWriter, the file is written in the background.
+    Returns the size of the calendar in bytes.
+    """
+    data = ical.to_ical()
+    if writer is None:
+        write_output_file(path, data)
+    else:
+        writer.write(path, data)
+    return len(data)
+
+
+def send_feed_written(
+    settings: Settings, path: str, count: int, size: int, start_time: float
+) -> None:
+    """Send the events_feed_written signal for a calendar file, if any receivers are connected."""
+    if events_feed_written.receivers:
+        events_feed_written.send(
+            settings,
+            path=path,
+            events=count,
+            size=size,
+            duration=time.perf_counter() - start_time,
+        )
+
+
+def check_size_budget(path: str, size: int, settings: Settings) -> None:
+    """Warn when a calendar file exceeds PLUGIN_EVENTS["size_budget"] bytes."""
+    budget = settings["PLUGIN_EVENTS"].get("size_budget")
+    if budget and size > budget:
+        log.warning(
+            "calendar %s is %d bytes, over the size_budget of %d bytes. "
+            "See the description_mode, description_max_length and max_events settings.",
+            path,
+            size,
+            budget,
+        )
+
+
+def geo_index_events(sorted_events: list) -> GeoIndex:
+    """Index events by the coordinates parsed from their event-geo metadata."""
+    index = GeoIndex()
+    for ev in sorted_events:
+        if ev.event_plugin_data.get("geo"):
+            index.add(ev.event_plugin_data["geo"], ev)
+    return index
+
+
+def geo_query(index: GeoIndex, definition: dict[str, list], fname: str) -> list:
+    """Run a geo_feeds filter definition, a radius or a bounding box, on a GeoIndex."""
+    if len(definition.get("radius", ())) == 3:  # noqa: PLR2004
+        return index.within_radius(*definition["radius"])
+    if len(definition.get("bbox", ())) == 4:  # noqa: PLR2004
+        return index.within_bbox(*definition["bbox"])
+    raise GeoFilterError(fname, definition)
+
+
+def write_geo_feeds(
+    entries: list[dict[str, Any]],
+    settings: Settings,
+    writer: BackgroundWriter,
+    refresh: timedelta | None = None,
+) -> None:
+    """Write a calendar file for each regional filter in PLUGIN_EVENTS["geo_feeds"]."""
+    geo_feeds = settings["PLUGIN_EVENTS"].get("geo_feeds")
+    if not geo_feeds:
+        return
+    index = GeoIndex()
+    for entry in entries:
+        if entry.get("geo"):
+            index.add(entry["geo"], entry)
+    for fname, definition in geo_feeds.items():
+        start_time = time.perf_counter()
+        selected = {id(entry) for entry in geo_query(index, definition, fname)}
+        geo_ical = new_calendar(settings, refresh)
+        for entry in entries:
+            if id(entry) in selected:
+                geo_ical.add_component(entry["component"])
+        path = os.path.join(settings["OUTPUT_PATH"], fname)
+        log.debug("write_geo_feeds(): %d events in %s", len(selected), path)
+        size = write_calendar_file(path, geo_ical, writer)
+        send_feed_written(settings, path, len(selected), size, start_time)
+        check_size_budget(path, size, settings)
+
+
+def next_output_change(
+    curr_events: list,
+    entries: list[dict[str, Any]],
+    settings: Settings,
+    timestamp: datetime,
+) -> datetime | None:
+    """Find the earliest time after the timestamp when a rebuild would change the plugin's output.
+
+    That's when the next calendar event starts and drops out of the calendar, which also brings in the next
+    occurrence of a recurring event, or when an event's last day has passed and it leaves
+    upcoming_events_list. With recurrence_horizon, occurrences are expanded from the build day, so the
+    horizon moves forward at each midnight. Returns None if nothing would change.
+    """
+    site_tz = get_tz(settings)
+    today = timestamp.date()
+    candidates = []
+    for entry in entries:
+        dtstart = event_start_time(entry["component"], site_tz)
+        if dtstart is not None and dtstart > timestamp:
+            candidates.append(dtstart)
+    for f_event in curr_events:
+        end_day = f_event.event_plugin_data["dtend"].date()
+        if end_day >= today:
+            candidates.append(
+                datetime.combine(
+                    end_day + timedelta(days=1), datetime.min.time(), tzinfo=site_tz
+                )
+            )
+    plugin_events = settings["PLUGIN_EVENTS"]
+    if plugin_events.get("recurrence_horizon") and (
+        plugin_events.get("recurring_events")
+        or plugin_events.get("recurring_events_file")
+    ):
+        candidates.append(
+            datetime.combine(
+                today + timedelta(days=1), datetime.min.time(), tzinfo=site_tz
+            )
+        )
+    return min(candidates, default=None)
+
+
+def calendar_refresh_interval(
+    settings: Settings, timestamp: datetime, next_change: datetime | None
+) -> timedelta | None:
+    """Get the calendar REFRESH-INTERVAL from PLUGIN_EVENTS["refresh_interval"], or None if not set.
+
+    The setting is either a duration, or "auto" for the time until the next output change, rounded up to
+    whole minutes and kept between refresh_interval_min and refresh_interval_max.
+    """
+    setting = settings["PLUGIN_EVENTS"].get("refresh_interval")
+    if not setting:
+        return None
+    if setting != "auto":
+        return parse_timedelta({"event-duration": setting, "title": "refresh_interval"})
+
+    bounds = []
+    for name, default in [
+        ("refresh_interval_min", REFRESH_INTERVAL_MIN),
+        ("refresh_interval_max", REFRESH_INTERVAL_MAX),
+    ]:
+        value = settings["PLUGIN_EVENTS"].get(name)
+        bounds.append(
+            parse_timedelta({"event-duration": value, "title": name})
+            if value
+            else default
+        )
+    lower, upper = bounds
+    if next_change is None:
+        return upper
+    minutes = math.ceil((next_change - timestamp).total_seconds() / 60)
+    return min(max(timedelta(minutes=minutes), lower), upper)
+
+
+def next_change_hint(
+    timestamp: datetime, next_change: datetime | None, refresh: timedelta | None
+) -> bytes:
+    """Encode the JSON hint file for build schedulers with the time the output will next change."""
+    return (
+        json.dumps(
+            {
+                "generated": timestamp.isoformat(),
+                "next_change": next_change.isoformat() if next_change else None,
+                "next_change_utc": utc_isoformat(next_change) if next_change else None,
+                "refresh_interval": int(refresh.total_seconds()) if refresh else None,
+            },
+            indent=2,
+        )
+        + "\n"
+    ).encode()
+
+
+def conflict_location(f_event) -> str | None:
+    """Get the key which identifies an event's location for conflict checks, or None if it has none.
+
+    That's its event-location with case and spacing normalized, otherwise its rounded event-geo coordinates.
+    """
+    location = " ".join(str(f_event.metadata.get("event-location", "")).split())
+    if location:
+        return location.casefold()
+    geo = f_event.event_plugin_data.get("geo")
+    if geo:
+        return f"geo:{round(geo[0], CONFLICT_GEO_DIGITS)};{round(geo[1], CONFLICT_GEO_DIGITS)}"
+    return None
+
+
+def find_event_conflicts(
+    curr_events: list, timestamp: datetime
+) -> list[dict[str, Any]]:
+    """Find pairs of events which overlap at the same location, among the events which haven't ended.
+
+    Events are grouped by conflict_location() and each group is checked with sweep_overlaps(). The number of
+    events each event overlaps is set in its event_plugin_data["overlaps"], for templates.
+    """
+    groups = defaultdict(list)
+    for f_event in curr_events:
+        f_event.event_plugin_data["overlaps"] = 0
+        start = f_event.event_plugin_data["dtstart"]
+        end = f_event.event_plugin_data["dtend"]
+        location = conflict_location(f_event)
+        if location is not None and end > timestamp:
+            groups[location].append((start, end, f_event))
+
+    conflicts = []
+    for location, intervals in groups.items():
+        for first, second in sweep_overlaps(intervals):
+            first.event_plugin_data["overlaps"] += 1
+            second.event_plugin_data["overlaps"] += 1
+            conflicts.append(
+                {
+                    "location": first.metadata.get("event-location") or location,
+                    "first": first,
+                    "second": second,
+                }
+            )
+    conflicts.sort(
+        key=lambda c: (
+            c["second"].event_plugin_data["dtstart"],
+            c["first"].event_plugin_data["dtstart"],
+        )
+    )
+    return conflicts
+
+
+def format_conflict(conflict: dict[str, Any]) -> str:
+    """Describe a conflict for logs and errors."""
+
+    def describe(f_event) -> str:
+        dtstart = f_event.event_plugin_data["dtstart"]
+        dtend = f_event.event_plugin_data["dtend"]
+        return (
+            f"'{f_event.metadata.get('title', '')}' ({event_source(f_event)}, "
+            f"{dtstart:%Y-%m-%d %H:%M} to {dtend:%Y-%m-%d %H:%M})"
+        )
+
+    return f"{conflict['location']}: {describe(conflict['first'])} overlaps {describe(conflict['second'])}"
+
+
+def conflict_report(conflicts: list[dict[str, Any]], timestamp: datetime) -> bytes:
+    """Encode the JSON conflict report."""
+
+    def describe(f_event) -> dict[str, str]:
+        return {
+            "title": str(f_event.metadata.get("title", "")),
+            "url": f_event.url,
+            "source": event_source(f_event),
+            "start": f_event.event_plugin_data["dtstart"].isoformat(),
+            "end": f_event.event_plugin_data["dtend"].isoformat(),
+        }
+
+    report = {
+        "generated": timestamp.isoformat(),
+        "conflicts": [
+            {
+                "location": str(conflict["location"]),
+                "events": [describe(conflict["first"]), describe(conflict["second"])],
+            }
+            for conflict in conflicts
+        ],
+    }
+    return (json.dumps(report, indent=2) + "\n").encode()
+
+
+def event_fingerprint(component: icalendar.cal.Component) -> str:
+    """Hash the content of a VEVENT, leaving out the properties which the delta state manages."""
+    digest = hashlib.sha256()
+    skipping = False
+    for line in component.to_ical().splitlines():
+        if line[:1] in [b" ", b"\t"]:  # continuation of a folded line
+            if not skipping:
+                digest.update(line)
+            continue
+        skipping = line.upper().startswith(DELTA_VOLATILE_PROPS)
+        if not skipping:
+            digest.update(line)
+    return digest.hexdigest()
+
+
+def delta_state_path(settings: Settings) -> str:
+    """Get the path of the file in CACHE_PATH which keeps per-UID fingerprints between builds."""
+    return os.path.join(settings["CACHE_PATH"], "pelican_events_delta_state.json")
+
+
+def apply_delta_state(
+    entries: list[dict[str, Any]], settings: Settings, timestamp: datetime
+) -> tuple[list[dict[str, Any]], list[str], dict[str, Any]]:
+    """Compare the calendar entries to the state saved by the previous build.
+
+    Each UID keeps a fingerprint of its VEVENT content. SEQUENCE is incremented and LAST-MODIFIED set to the build
+    time when the fingerprint changes, and both are added to every VEVENT. Returns the entries which were added or
+    changed since the previous build, the UIDs which were in the previous build but are no longer present, and the
+    new state, which the caller saves with save_delta_state() once the calendar and delta feed are written.
+    """
+    state_path = delta_state_path(settings)
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            previous = json.load(f)["events"]
+    except (OSError, ValueError, KeyError):
+        log.debug("apply_delta_state: no previous state in %s", state_path)
+        previous = {}
+
+    # fingerprint each UID, combining events which share a UID under the "warn" policy
+    fingerprints = {}
+    for entry in entries:
+        fingerprints[entry["uid"]] = hashlib.sha256(
+            (
+                fingerprints.get(entry["uid"], "")
+                + event_fingerprint(entry["component"])
+            ).encode()
+        ).hexdigest()
+
+    modified = timestamp.astimezone(ZoneInfo("UTC"))
+    state = {}
+    changed_uids = set()
+    for uid, fingerprint in fingerprints.items():
+        prev = previous.get(uid)
+        if prev is not None and prev["fingerprint"] == fingerprint:
+            state[uid] = prev
+            continue
+        state[uid] = {
+            "fingerprint": fingerprint,
+            "sequence": 0 if prev is None else prev["sequence"] + 1,
+            "last_modified": modified.isoformat(),
+        }
+        changed_uids.add(uid)
+
+    delta_entries = []
+    for entry in entries:
+        uid_state = state[entry["uid"]]
+        component = entry["component"]
+        component["SEQUENCE"] = icalendar.vInt(uid_state["sequence"])
+        component["LAST-MODIFIED"] = icalendar.vDatetime(
+            datetime.fromisoformat(uid_state["last_modified"])
+        )
+        if entry["uid"] in changed_uids:
+            delta_entries.append(entry)
+    removed_uids = sorted(uid for uid in previous if uid not in state)
+
+    log.debug(
+        "apply_delta_state: %d added or changed, %d removed of %d UIDs",
+        len(delta_entries),
+        len(removed_uids),
+        len(state),
+    )
+    return delta_entries, removed_uids, {"built": modified.isoformat(), "events": state}
+
+
+def save_delta_state(state: dict[str, Any], settings: Settings) -> None:
+    """Save the state from apply_delta_state() for the next build, replacing the previous state atomically.
+
+    Called only after the outputs using the state were written, so a failed build leaves the previous state and
+    the next delta feed still has the events which subscribers didn't receive.
+    """
+    write_output_file(delta_state_path(settings), json.dumps(state).encode())
+
+
+def day_bucket_index(curr_events: list) -> dict[date, list]:
+    """Index events by each day they occupy, so multi-day events appear on every day of their span.
+
+    Recurring events are in the events list as separate occurrences, so they are indexed like articles.
+    Each day's events are sorted by start and end time.
+    """
+    buckets = defaultdict(list)
+    for ev in curr_events:
+        for day in event_days(
+            ev.event_plugin_data["dtstart"], ev.event_plugin_data["dtend"]
+        ):
+            buckets[day].append(ev)
+    for day_events in buckets.values():
+        day_events.sort(
+            key=lambda ev: (
+                ev.event_plugin_data["dtstart"],
+                ev.event_plugin_data["dtend"],
+            )
+        )
+    return dict(buckets)
+
+
+def month_grid(
+    year: int, month: int, buckets: dict[date, list], firstweekday: int = 0
+) -> list[list[tuple[date, list]]]:
+    """Build the weeks of a month calendar as lists of (day, events) pairs from a day bucket index.
+
+    Weeks are complete, so the first and last weeks include days of the neighboring months.
+    """
+    cal = calendar.Calendar(firstweekday)
+    return [
+        [(day, buckets.get(day, [])) for day in week]
+        for week in cal.monthdatescalendar(year, month)
+    ]
+
+
+def month_page_digest(grid: list[list[tuple[date, list]]], *extra: str) -> str:
+    """Compute a hash of the events shown in a month grid, used to skip writing unchanged month pages."""
+    digest = hashlib.sha256()
+    for part in extra:
+        digest.update(part.encode() + b"\0")
+    for week in grid:
+        for day, day_events in week:
+            digest.update(day.isoformat().encode())
+            for ev in day_events:
+                fields = (
+                    ev.url,
+                    ev.metadata.get("title", ""),
+                    ev.metadata.get("summary", ""),
+                    ev.metadata.get("event-location", ""),
+                    ev.event_plugin_data["dtstart"].isoformat(),
+                    ev.event_plugin_data["dtend"].isoformat(),
+                )
+                digest.update("\0".join(str(f) for f in fields).encode() + b"\1")
+    return digest.hexdigest()
+
+
+def template_chain_digest(env: Environment, name: str) -> str:
+    """Compute a hash of a template and the templates it extends, includes or imports, recursively.
+
+    If a template refers to another by a variable, all templates of the environment are hashed, since any
+    of them may be used.
+    """
+    digests = {}
+    pending = [name]
+    while pending:
+        current = pending.pop()
+        if current in digests:
+            continue
+        try:
+            source = env.loader.get_source(env, current)[0]
+        except TemplateNotFound:
+            digests[current] = ""
+            continue
+        digests[current] = hashlib.sha256(source.encode()).hexdigest()
+        references = list(meta.find_referenced_templates(env.parse(source)))
+        if None in references:
+            pending.extend(env.list_templates())
+        pending.extend(ref for ref in references if ref is not None)
+    return hashlib.sha256(json.dumps(sorted(digests.items())).encode()).hexdigest()
+
+
+def page_context_digest(generator: Generator, template_name: str) -> str:
+    """Compute a hash of what every page of a generator shows besides its own content.
+
+    This is the template with its inheritance chain, the site settings of PAGE_CONTEXT_SETTINGS as the
+    template context has them, and the pages and categories which themes list in their menus.
+    """
+    context = generator.context
+    parts = {
+        "template": template_chain_digest(generator.env, template_name),
+        "settings": {
+            key: context.get(key, generator.settings.get(key))
+            for key in PAGE_CONTEXT_SETTINGS
+        },
+        "pages": [
+            (page.url, page.title)
+            for page in context.get("pages", [])
+            if hasattr(page, "url")
+        ],
+        "categories": [str(category) for category, _ in context.get("categories", [])],
+    }
+    return hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def find_article_files(settings: Settings, extensions) -> Iterator[str]:
+    """Find article source files relative to PATH following the same rules as Pelican's ArticlesGenerator."""
+    content_path = settings["PATH"]
+    ignores = settings["IGNORE_FILES"]
+    excluded = {
+        os.path.normpath(os.path.join(content_path, e))
+        for e in settings["ARTICLE_EXCLUDES"]
+    }
+    for path in settings["ARTICLE_PATHS"]:
+        root = os.path.join(content_path, path) if path else content_path
+        for dirpath, dirs, files in os.walk(root, topdown=True, followlinks=True):
+            dirs[:] = sorted(
+                d
+                for d in dirs
+                if os.path.normpath(os.path.join(dirpath, d)) not in excluded
+                and not any(fnmatch.fnmatch(d, ignore) for ignore in ignores)
+            )
+            for fname in sorted(files):
+                if any(fnmatch.fnmatch(fname, ignore) for ignore in ignores):
+                    continue
+                if os.path.splitext(fname)[1][1:] not in extensions:
+                    continue
+                yield os.path.relpath(os.path.join(dirpath, fname), content_path)
+
+
+def _validate_event_times(
+    metadata: dict[str, str], lines: dict[str, int], settings: Settings
+) -> list[tuple[int, str]]:
+    """Check the event-start, event-end and event-duration fields of an event."""
+    errors = []
+    site_tz = get_tz(settings)
+    times = {}
+    for name in ["event-start", "event-end"]:
+        if name not in metadata:
+            continue
+        try:
+            times[name] = parse_tstamp(metadata, name, site_tz)
+        except FieldParseError as e:
+            errors.append((lines[name], str(e)))
+    if "event-duration" in metadata:
+        for chunk in metadata["event-duration"].split():
+            try:
+                parse_timedelta({"event-duration": chunk, "title": metadata["title"]})
+            except (UnknownTimeMultiplier, DurationParseError) as e:
+                errors.append((lines["event-duration"], str(e).strip("'\"")))
+    elif "event-end" not in metadata:
+        errors.append(
+            (
+                lines["event-start"],
+                "either 'event-end' or 'event-duration' must be specified",
+            )
+        )
+    if len(times) == 2 and times["event-end"] < times["event-start"]:  # noqa: PLR2004
+        errors.append((lines["event-end"], "'event-end' is before 'event-start'"))
+    return errors
+
+
+def validate_event_metadata(
+    fields: list[tuple[str, str, int]], settings: Settings
+) -> list[tuple[int, str]]:
+    """Check the event metadata fields of one content file and return every error as a (line, message) pair.
+
+    The checks are the ones which fail or put an error in a COMMENT property during a build: unparseable
+    timestamps, unknown time multipliers, missing end or duration, unrecognized or disallowed iCalendar
+    properties and invalid coordinates.
+    """
+    metadata = {name: value for name, value, _ in fields}
+    if "event-start" not in metadata:
+        return [
+            (lineno, f"'{name}' without 'event-start'")
+            for name, _, lineno in fields
+            if name.startswith("event-")
+        ]
+
+    metadata.setdefault("title", "")
+    lines = {name: lineno for name, _, lineno in fields}
+    errors = _validate_event_times(metadata, lines, settings)
+    for name, value, lineno in fields:
+        fname = name.removeprefix("event-")
+        if name == fname or fname in ["start", "end", "duration", "comment"]:
+            continue
+        status = field_name_check(fname)
+        if status is not None:
+            errors.append((lineno, status))
+        elif fname == "geo":
+            try:
+                vGeo.from_ical(value)
+            except ValueError as e:
+                errors.append((lineno, str(e)))
+    return sorted(errors)
+
+
+def validate_file(path: str, settings: Settings) -> list[tuple[str, int, str]]:
+    """Validate the event metadata in the header of one content file, without rendering it."""
+    try:
+        fields = list(iter_metadata_header(path))
+    except UnsupportedHeaderFormat:
+        return []
+    except (OSError, UnicodeDecodeError) as e:
+        return [(path, 0, f"unable to read metadata header: {e}")]
+    return [
+        (path, lineno, message)
+        for lineno, message in validate_event_metadata(fields, settings)
+    ]
+
+
+def validate_recurring_events(settings: Settings) -> list[tuple[str, int, str]]:
+    """Validate PLUGIN_EVENTS["recurring_events"], recurring_events_file and the skip lists they use."""
+    errors = []
+    skip_lists = settings["PLUGIN_EVENTS"].get("skip_lists", {})
+    for name in skip_lists:
+        try:
+            load_skip_list(settings, name)
+        except (OSError, ValueError) as e:
+            errors.append((f"PLUGIN_EVENTS['skip_lists']['{name}']", 0, str(e)))
+
+    def event_errors(event: Any) -> list[str]:
+        found = recurring_event_errors(event)
+        if isinstance(event, dict):
+            found.extend(
+                f"unknown skip list '{name}'"
+                for name in skip_list_names(event)
+                if name not in skip_lists
+            )
+        return found
+
+    for index, event in enumerate(
+        settings["PLUGIN_EVENTS"].get("recurring_events", [])
+    ):
+        source = f"PLUGIN_EVENTS['recurring_events'][{index}]"
+        errors.extend((source, 0, error) for error in event_errors(event))
+
+    fname = settings["PLUGIN_EVENTS"].get("recurring_events_file")
+    if fname:
+        path = os.path.join(settings.get("PATH", ""), fname)
+        try:
+            for line, row in iter_data_rows(path, "recurring_events"):
+                errors.extend((path, line, error) for error in event_errors(row))
+        except (OSError, ValueError) as e:
+            errors.append((path, 0, str(e)))
+    return errors
+
+
+def validate_content(
+    settings: Settings, workers: int | None = None
+) -> list[tuple[str, int, str]]:
+    """Validate the event metadata of all article files and recurring events. Returns every error found.
+
+    Only metadata headers are scanned, in parallel in a process pool of the given number of workers, or the
+    CPU count by default. With one worker, files are scanned in this process.
+    """
+    content_path = settings["PATH"]
+    paths = [
+        os.path.join(content_path, relpath)
+        for relpath in find_article_files(
+            settings, MARKDOWN_EXTENSIONS + RST_EXTENSIONS + HTML_EXTENSIONS
+        )
+    ]
+
+    # worker processes get only the settings used by validation, since settings may hold unpicklable objects
+    validate_settings = {
+        "PLUGIN_EVENTS": {
+            k: v for k, v in settings["PLUGIN_EVENTS"].items() if k == "timezone"
+        },
+        "TIMEZONE": settings.get("TIMEZONE", "UTC"),
+    }
+    errors = validate_recurring_events(settings)
+    if workers == 1 or len(paths) <= VALIDATE_CHUNK_SIZE:
+        results = (validate_file(path, validate_settings) for path in paths)
+        for file_errors in results:
+            errors.extend(file_errors)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            for file_errors in executor.map(
+                validate_file,
+                paths,
+                [validate_settings] * len(paths),
+                chunksize=VALIDATE_CHUNK_SIZE,
+            ):
+                errors.extend(file_errors)
+    log.debug("validate_content: %d files, %d errors", len(paths), len(errors))
+    return errors
+
+
+def utc_isoformat(dt: datetime) -> str:
+    """Format a timezone-aware datetime as ISO 8601 in UTC, which sorts and compares correctly as text."""
+    return dt.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def event_record_hash(f_event, settings: Settings) -> str:
+    """Hash the inputs of an event's database record, so unchanged events are skipped without converting text."""
+    content = (
+        f_event.content if isinstance(f_event, (contents.Content, DataEvent)) else ""
+    )
+    inputs = [
+        event_uid(f_event, settings),
+        f_event.url,
+        event_lang(f_event, settings),
+        f_event.event_plugin_data["dtstart"].isoformat(),
+        f_event.event_plugin_data["dtend"].isoformat(),
+        sorted((k, str(v)) for k, v in f_event.metadata.items()),
+        content,
+        settings["PLUGIN_EVENTS"].get("text_engine", "html2text"),
+        settings["PLUGIN_EVENTS"].get("metadata_field_for_summary") or "summary",
+    ]
+    return hashlib.sha256(json.dumps(inputs).encode()).hexdigest()
+
+
+def event_record(f_event, settings: Settings, record_hash: str) -> dict[str, Any]:
+    """Build the database record of an event with its categories and event- properties."""
+    text_engine = settings["PLUGIN_EVENTS"].get("text_engine", "html2text")
+    summary_field = (
+        settings["PLUGIN_EVENTS"].get("metadata_field_for_summary") or "summary"
+    )
+    if isinstance(f_event, (contents.Content, DataEvent)) and f_event.content:
+        description = strip_html_tags(f_event.content, text_engine)
+    else:
+        description = strip_html_tags(f_event.metadata["summary"], text_engine)
+    geo = f_event.event_plugin_data.get("geo") or (None, None)
+    return {
+        "uid": event_uid(f_event, settings),
+        "hash": record_hash,
+        "url": f_event.url,
+        "lang": event_lang(f_event, settings),
+        "title": str(f_event.metadata.get("title", "")),
+        "summary": strip_html_tags(
+            str(f_event.metadata.get(summary_field, "")), text_engine
+        ),
+        "description": description,
+        "location": f_event.metadata.get("event-location"),
+        "dtstart": utc_isoformat(f_event.event_plugin_data["dtstart"]),
+        "dtend": utc_isoformat(f_event.event_plugin_data["dtend"]),
+        "latitude": geo[0],
+        "longitude": geo[1],
+        "categories": event_categories(f_event),
+        "properties": [
+            (name, str(value))
+            for name, value in f_event.metadata.items()
+            if name.startswith("event-")
+        ],
+    }
+
+
+def _sqlite_upsert(
+    connection: sqlite3.Connection, record: dict[str, Any], fts: bool
+) -> None:
+    """Insert or replace the rows of one event record."""
+    columns = ", ".join(SQLITE_EVENT_COLUMNS)
+    placeholders = ", ".join(f":{c}" for c in SQLITE_EVENT_COLUMNS)
+    updates = ", ".join(f"{c} = excluded.{c}" for c in SQLITE_EVENT_COLUMNS[1:])
+    connection.execute(
+        f"INSERT INTO events ({columns}) VALUES ({placeholders}) "
+        f"ON CONFLICT (uid) DO UPDATE SET {updates}",
+        record,
+    )
+    uid = record["uid"]
+    connection.execute("DELETE FROM categories WHERE uid = ?", (uid,))
+    connection.executemany(
+        "INSERT OR IGNORE INTO categories (uid, category) VALUES (?, ?)",
+        [(uid, category) for category in record["categories"]],
+    )
+    connection.execute("DELETE FROM properties WHERE uid = ?", (uid,))
+    connection.executemany(
+        "INSERT OR REPLACE INTO properties (uid, name, value) VALUES (?, ?, ?)",
+        [(uid, name, value) for name, value in record["properties"]],
+    )
+    if fts:
+        (rowid,) = connection.execute(
+            "SELECT rowid FROM events WHERE uid = ?", (uid,)
+        ).fetchone()
+        connection.execute("DELETE FROM events_fts WHERE rowid = ?", (rowid,))
+        connection.execute(
+            "INSERT INTO events_fts (rowid, uid, summary, description) VALUES (?, ?, ?, ?)",
+            (rowid, uid, record["summary"], record["description"]),
+        )
+
+
+def _sqlite_fts_rebuild(connection: sqlite3.Connection) -> None:
+    """Fill events_fts from the events table, keyed by rowid, if the database was made by an older version."""
+    (version,) = connection.execute("PRAGMA user_version").fetchone()
+    if version >= SQLITE_FTS_VERSION:
+        return
+    log.info("SQLite full-text search table rebuilt with rows keyed by rowid")
+    with connection:
+        connection.execute("DELETE FROM events_fts")
+        connection.execute(
+            "INSERT INTO events_fts (rowid, uid, summary, description) "
+            "SELECT rowid, uid, summary, description FROM events"
+        )
+        connection.execute(f"PRAGMA user_version = {SQLITE_FTS_VERSION}")
+
+
+def write_sqlite_events(
+    path: str, curr_events: list, settings: Settings
+) -> dict[str, int]:
+    """Update an SQLite database of all events, past and upcoming, in a single transaction.
+
+    Each event row keeps a hash of its inputs, so only new or changed events are written and events which
+    no longer exist are deleted. The events_fts full-text table over summary and description is left out
+    when the SQLite library has no FTS5 support. Returns the numbers of upserted, deleted and unchanged events.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.executescript(SQLITE_SCHEMA)
+        try:
+            connection.execute(SQLITE_FTS_SCHEMA)
+            _sqlite_fts_rebuild(connection)
+            fts = True
+        except sqlite3.OperationalError as e:
+            log.info("SQLite full-text search table not created: %s", e)
+            fts = False
+
+        stored = dict(connection.execute("SELECT uid, hash FROM events"))
+        hashes = {}
+        changed = []
+        for f_event in curr_events:
+            uid = event_uid(f_event, settings)
+            record_hash = event_record_hash(f_event, settings)
+            if uid in hashes:
+                log.warning(
+                    "write_sqlite_events: duplicate UID %s, keeping the first", uid
+                )
+                continue
+            hashes[uid] = record_hash
+            if stored.get(uid) != record_hash:
+                changed.append(event_record(f_event, settings, record_hash))
+        removed = [uid for uid in stored if uid not in hashes]
+
+        with connection:
+            for record in changed:
+                _sqlite_upsert(connection, record, fts)
+            if fts:
+                connection.executemany(
+                    "DELETE FROM events_fts WHERE rowid = "
+                    "(SELECT rowid FROM events WHERE uid = ?)",
+                    [(uid,) for uid in removed],
+                )
+            connection.executemany(
+                "DELETE FROM events WHERE uid = ?", [(uid,) for uid in removed]
+            )
+    finally:
+        connection.close()
+    return {
+        "upserted": len(changed),
+        "deleted": len(removed),
+        "unchanged": len(hashes) - len(changed),
+    }
+
+
+def search_document_text(f_event, settings: Settings, text_engine: str) -> str:
+    """Collect the searchable text of an event: title, summary, location and categories."""
+    summary_field = (
+        settings["PLUGIN_EVENTS"].get("metadata_field_for_summary") or "summary"
+    )
+    return "\n".join(
+        [
+            str(f_event.metadata.get("title", "")),
+            strip_html_tags(str(f_event.metadata.get(summary_field, "")), text_engine),
+            str(f_event.metadata.get("event-location", "")),
+            *event_categories(f_event),
+        ]
+    )
+
+
+def build_search_index(
+    curr_events: list, settings: Settings
+) -> tuple[dict[str, Any], dict[str, dict[str, list[int]]]]:
+    """Build an inverted index of event terms, sharded by term prefix.
+
+    Returns the manifest, with the event list which the postings refer to by position, and a dictionary of
+    shards by prefix, each mapping its terms to sorted event numbers.
+    """
+    text_engine = settings["PLUGIN_EVENTS"].get("text_engine", "html2text")
+    prefix_length = settings["PLUGIN_EVENTS"].get(
+        "search_prefix_length", SEARCH_PREFIX_LENGTH
+    )
+    sorted_events = sorted(curr_events, key=lambda ev: ev.event_plugin_data["dtstart"])
+    postings: dict[str, list[int]] = defaultdict(list)
+    event_list = []
+    for number, f_event in enumerate(sorted_events):
+        event_list.append(
+            [
+                f_event.url,
+                str(f_event.metadata.get("title", "")),
+                f_event.event_plugin_data["dtstart"].isoformat(),
+            ]
+        )
+        for term in search_terms(search_document_text(f_event, settings, text_engine)):
+            postings[term].append(number)
+
+    shards: dict[str, dict[str, list[int]]] = defaultdict(dict)
+    for term in sorted(postings):
+        shards[term[:prefix_length]][term] = postings[term]
+    manifest = {
+        "version": SEARCH_INDEX_VERSION,
+        "prefix_length": prefix_length,
+        "min_term_length": SEARCH_MIN_TERM_LENGTH,
+        "fields": ["url", "title", "start"],
+        "events": event_list,
+        "shards": sorted(shards),
+    }
+    return manifest, shards
+
+
+def write_search_index(
+    path: str, curr_events: list, settings: Settings, writer: BackgroundWriter
+) -> int:
+    """Write the search index manifest and its shards to a directory. Returns the number of shards.
+
+    The shards are in a subdirectory, so a term prefix like "index" can't overwrite the manifest.
+    """
+    manifest, shards = build_search_index(curr_events, settings)
+    for prefix, shard in shards.items():
+        writer.write(
+            os.path.join(path, SEARCH_SHARDS_DIR, f"{prefix}.json"),
+            json.dumps(shard, ensure_ascii=False, separators=(",", ":")).encode(),
+        )
+    writer.write(
+        os.path.join(path, "index.json"),
+        json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode(),
+    )
+    return len(shards)
+
+
+class CalendarBuilder:
+    """Build the plugin's calendar files from any iterable of events, without Pelican's signals.
+
+    This is the engine of the generate_ical_file() signal handler, and can be used from scripts and tests:
+
+        stats = CalendarBuilder(settings).build(events_iter, "output/calendar.ics")
+
+    Events are event articles, generated events, DataEvent objects or dictionaries of metadata fields like
+    the records of PLUGIN_EVENTS["event_data_file"]. They are consumed lazily, and each VEVENT is written as
+    soon as it's built, unless the settings use a feature which needs all events before the calendar is
+    written: max_events, a duplicate_uids policy other than "warn", delta_fname, geo_feeds, next_change_fname,
+    an "auto" refresh_interval or compact_series. The output is a path or a binary file object. Additional outputs of those
+    features are written in OUTPUT_PATH.
+    """
+
+    def __init__(self, settings: Settings, timestamp: datetime | None = None) -> None:  # noqa: D107
+        self.settings = settings
+        self.timestamp = timestamp or timestamp_now(settings)
+
+    def needs_all_events(self) -> bool:
+        """Check whether the settings use features which need all events before the calendar is written."""
+        plugin_events = self.settings["PLUGIN_EVENTS"]
+        return bool(
+            plugin_events.get("max_events")
+            or plugin_events.get("duplicate_uids", "warn") != "warn"
+            or plugin_events.get("delta_fname")
+            or plugin_events.get("geo_feeds")
+            or plugin_events.get("next_change_fname")
+            or plugin_events.get("refresh_interval") == "auto"
+            or plugin_events.get("compact_series")
+        )
+
+    def build(self, events_iter: Iterable, out) -> dict[str, int]:
+        """Write the calendar for the upcoming events of an iterable to a path or binary file object.
+
+        Returns the numbers of events read and written to the calendar, and the calendar's size in bytes.
+        """
+        log.debug("CalendarBuilder: filtering with timestamp: %s", str(self.timestamp))
+        start_time = time.perf_counter()
+        counter = itertools.count()
+        counted = (f_event for f_event, _ in zip(events_iter, counter, strict=False))
+        if self.needs_all_events():
+            written, size = self.build_all(list(counted), out)
+        else:
+            written, size = self.build_streaming(counted, out)
+        send_feed_written(self.settings, str(out), written, size, start_time)
+        check_size_budget(str(out), size, self.settings)
+        return {"events": next(counter), "written": written, "bytes": size}
+
+    def build_streaming(self, events_iter: Iterable, out) -> tuple[int, int]:
+        """Write each VEVENT as soon as it's built. Duplicate UIDs are reported at the end."""
+        refresh = calendar_refresh_interval(self.settings, self.timestamp, None)
+        seen = []
+
+        def components():
+            for entry in iter_calendar_entries(
+                events_iter, self.settings, self.timestamp
+            ):
+                seen.append(
+                    {
+                        "uid": entry["uid"],
+                        "lang": entry["lang"],
+                        "source": entry["source"],
+                    }
+                )
+                yield entry["component"]
+
+        size = self.write_calendar(
+            out, new_calendar(self.settings, refresh), components()
+        )
+        index = index_event_uids(seen)
+        duplicates = {
+            uid: [entry["source"] for entry in group]
+            for uid, group in index.items()
+            if len(group) > 1
+        }
+        _report_duplicate_uids(index, duplicates, "warn")
+        return len(seen), size
+
+    def build_all(self, curr_events: list, out) -> tuple[int, int]:
+        """Write the calendar and the additional outputs which need all events."""
+        settings = self.settings
+        timestamp = self.timestamp
+        curr_events = [as_event(record, settings) for record in curr_events]
+        entries = collect_calendar_entries(curr_events, settings, timestamp)
+
+        # when the output changes next, for the feed's REFRESH-INTERVAL and the rebuild hint
+        next_change = next_output_change(curr_events, entries, settings, timestamp)
+        refresh = calendar_refresh_interval(settings, timestamp, next_change)
+
+        # output files are written in the background while the next one is rendered, and joined at the end
+        workers = settings["PLUGIN_EVENTS"].get("output_workers", OUTPUT_WORKERS)
+        with BackgroundWriter(workers) as writer:
+            # track changes since the previous build for SEQUENCE, LAST-MODIFIED and the delta feed
+            delta_fname = settings["PLUGIN_EVENTS"].get("delta_fname")
+            if delta_fname:
+                start_time = time.perf_counter()
+                delta_entries, removed_uids, delta_state = apply_delta_state(
+                    entries, settings, timestamp
+                )
+                delta_ical = new_calendar(settings, refresh)
+                for uid in removed_uids:
+                    delta_ical.add("x-pelican-events-removed-uid", uid)
+                for entry in delta_entries:
+                    delta_ical.add_component(entry["component"])
+                delta_path = os.path.join(settings["OUTPUT_PATH"], delta_fname)
+                size = write_calendar_file(delta_path, delta_ical, writer)
+                send_feed_written(
+                    settings, delta_path, len(delta_entries), size, start_time
+                )
+
+            # the main calendar, in the background too when written to a path
+            components = (entry["component"] for entry in entries)
+            if hasattr(out, "write"):
+                size = self.write_calendar(
+                    out, new_calendar(settings, refresh), components
+                )
+            else:
+                buffer = io.BytesIO()
+                size = self.write_calendar(
+                    buffer, new_calendar(settings, refresh), components
+                )
+                writer.write(out, buffer.getvalue())
+
+            # regional calendars selected by coordinates
+            write_geo_feeds(entries, settings, writer, refresh)
+
+            # machine-readable hint for scheduling the next rebuild
+            next_change_fname = settings["PLUGIN_EVENTS"].get("next_change_fname")
+            if next_change_fname:
+                writer.write(
+                    os.path.join(settings["OUTPUT_PATH"], next_change_fname),
+                    next_change_hint(timestamp, next_change, refresh),
+                )
+
+        # all outputs are written, so the next build compares to this one
+        if delta_fname:
+            save_delta_state(delta_state, settings)
+        return len(entries), size
+
+    @staticmethod
+    def write_calendar(out, ical: icalendar.Calendar, components: Iterable) -> int:
+        """Write a calendar's properties, then each component as it comes, to a path or binary file object.
+
+        A path is written through a temporary file which replaces it when complete, so a failed build keeps
+        the previous calendar. Returns the number of bytes written.
+        """
+        header = ical.to_ical()
+        chunks = itertools.chain(
+            [header[: -len(ICAL_CALENDAR_END)]],
+            (component.to_ical() for component in components),
+            [ICAL_CALENDAR_END],
+        )
+        if hasattr(out, "write"):
+            return sum(out.write(chunk) or len(chunk) for chunk in chunks)
+        return replace_output_file(out, chunks)
+
+
+#
+# Pelican generator classes
+#
+
+
+class MonthPageGenerator(Generator):
+    """Generate month-grid calendar pages at events/YYYY/MM/index.html from a day bucket index.
+
+    Enabled by PLUGIN_EVENTS["month_pages"]. A page is only written when the hash of the events it shows,
+    its neighboring months or page_context_digest() changed since the last build, or when it is missing from
+    the output.
+    The hashes are kept in the plugin's cache in CACHE_PATH, following the site's content caching settings.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:  # noqa: D107
+        super().__init__(*args, **kwargs)
+        self.env.loader.loaders.append(FileSystemLoader(TEMPLATES_PATH))
+        self.months = []
+        self.buckets = {}
+
+    def month_setting(self, name: str, default: str) -> str:
+        """Get a month page setting from PLUGIN_EVENTS or its default."""
+        return self.settings["PLUGIN_EVENTS"].get(name) or default
+
+    def month_url(self, year_month: tuple[int, int] | None) -> str | None:
+        """Get the URL of a month page, or None for a month without a page."""
+        if year_month is None:
+            return None
+        year, month = year_month
+        return self.month_setting("month_page_url", MONTH_PAGE_URL).format(
+            year=year, month=month
+        )
+
+    def generate_context(self) -> None:
+        """Build the day bucket index and the list of months from the events collected by the plugin."""
+        default_lang = self.settings["DEFAULT_LANG"]
+        curr_events = events if not localized_events else localized_events[default_lang]
+        self.buckets = day_bucket_index(curr_events)
+        if self.buckets:
+            self.months = list(iter_months(min(self.buckets), max(self.buckets)))
+        self.context["events_by_day"] = self.buckets
+        self.context["events_months"] = [
+            {"year": year, "month": month, "url": self.month_url((year, month))}
+            for year, month in self.months
+        ]
+
+    def generate_output(self, writer) -> None:
+        """Write the month pages whose content changed since the last build."""
+        template = self.get_template(
+            self.month_setting("month_page_template", MONTH_PAGE_TEMPLATE)
+        )
+        context_digest = page_context_digest(self, template.name)
+        save_as_fmt = self.month_setting("month_page_save_as", MONTH_PAGE_SAVE_AS)
+        firstweekday = self.settings["PLUGIN_EVENTS"].get("month_page_firstweekday", 0)
+        cache = plugin_cache(self.settings, "month_pages")
+
+        written = 0
+        for index, (year, month) in enumerate(self.months):
+            prev_month = self.months[index - 1] if index > 0 else None
+            next_month = (
+                self.months[index + 1] if index + 1 < len(self.months) else None
+            )
+            save_as = save_as_fmt.format(year=year, month=month)
+            grid = month_grid(year, month, self.buckets, firstweekday)
+            digest = month_page_digest(
+                grid,
+                context_digest,
+                str(self.month_url(prev_month)),
+                str(self.month_url(next_month)),
+            )
+            if (
+                cache is not None
+                and cache.get_cached_data(save_as) == digest
+                and os.path.exists(os.path.join(self.output_path, save_as))
+            ):
+                log.debug("MonthPageGenerator: %s unchanged, skipped", save_as)
+                continue
+
+            writer.write_file(
+                save_as,
+                template,
+                self.context,
+                relative_urls=self.settings["RELATIVE_URLS"],
+                url=self.month_url((year, month)),
+                year=year,
+                month=month,
+                month_start=date(year, month, 1),
+                weeks=grid,
+                prev_month_url=self.month_url(prev_month),
+                next_month_url=self.month_url(next_month),
+            )
+            written += 1
+            if cache is not None:
+                cache.cache_data(save_as, digest)
+
+        if cache is not None:
+            cache.save_cache()
+        log.debug(
+            "MonthPageGenerator: wrote %d of %d month pages", written, len(self.months)
+        )
+
+
+class EventPageGenerator(Generator):
+    """Generate a page for each event from PLUGIN_EVENTS["event_data_file"].
+
+    A page is only written when its event record or page_context_digest() changed since the last build, or
+    when it is missing from the output. The hashes are kept in the plugin's cache in CACHE_PATH, following the site's
+    content caching settings.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:  # noqa: D107
+        super().__init__(*args, **kwargs)
+        self.env.loader.loaders.append(FileSystemLoader(TEMPLATES_PATH))
+        self.data_events = []
+
+    def generate_context(self) -> None:
+        """Find the data file events in the events collected by the plugin."""
+        self.data_events = [ev for ev in events if isinstance(ev, DataEvent)]
+        self.context["event_data_events"] = self.data_events
+
+    def generate_output(self, writer) -> None:
+        """Write the event pages whose record or template changed since the last build."""
+        template = self.get_template(
+            self.settings["PLUGIN_EVENTS"].get("event_page_template")
+            or EVENT_PAGE_TEMPLATE
+        )
+        context_digest = page_context_digest(self, template.name)
+        cache = plugin_cache(self.settings, "event_pages")
+
+        written = 0
+        for data_event in self.data_events:
+            digest = data_event.record_hash + "|" + context_digest
+            if (
+                cache is not None
+                and cache.get_cached_data(data_event.save_as) == digest
+                and os.path.exists(os.path.join(self.output_path, data_event.save_as))
+            ):
+                continue
+
+            writer.write_file(
+                data_event.save_as,
+                template,
+                self.context,
+                relative_urls=self.settings["RELATIVE_URLS"],
+                url=data_event.url,
+                event=data_event,
+            )
+            written += 1
+            if cache is not None:
+                cache.cache_data(data_event.save_as, digest)
+
+        if cache is not None:
+            cache.save_cache()
+        log.debug(
+            "EventPageGenerator: wrote %d of %d event pages",
+            written,
+            len(self.data_events),
+        )
+
+
+#
+# Pelican plugin API signal handlers
+# see API reference: https://docs.getpelican.com/en/latest/plugins.html#list-of-signals
+#
+
+
+def generate_ical_file(generator) -> None:
+    """Generate an iCalendar file."""
+    ics_fname = generator.settings["PLUGIN_EVENTS"]["ics_fname"]
+    if not ics_fname:
+        log.debug("generate_ical_file(): bail out, no ics_fname setting")
+        return
+
+    ics_fname = os.path.join(generator.settings["OUTPUT_PATH"], ics_fname)
+    default_lang = generator.settings["DEFAULT_LANG"]
+    curr_events = events if not localized_events else localized_events[default_lang]
+    stats = CalendarBuilder(generator.settings).build(curr_events, ics_fname)
+    log.debug(
+        "generate_ical_file(): %d of %d events written to %s, %d bytes",
+        stats["written"],
+        stats["events"],
+        ics_fname,
+        stats["bytes"],
+    )
+
+
+def generate_sqlite_file(generator) -> None:
+    """Update the SQLite event database if PLUGIN_EVENTS["sqlite_fname"] is set."""
+    sqlite_fname = generator.settings["PLUGIN_EVENTS"].get("sqlite_fname")
+    if not sqlite_fname:
+        return
+
+    path = os.path.join(generator.settings["OUTPUT_PATH"], sqlite_fname)
+    default_lang = generator.settings["DEFAULT_LANG"]
+    curr_events = events if not localized_events else localized_events[default_lang]
+    counts = write_sqlite_events(path, curr_events, generator.settings)
+    log.debug(
+        "generate_sqlite_file(): %s: %d upserted, %d deleted, %d unchanged",
+        path,
+        counts["upserted"],
+        counts["deleted"],
+        counts["unchanged"],
+    )
+
+
+def generate_search_index(generator) -> None:
+    """Write the client-side search index if PLUGIN_EVENTS["search_index"] is set."""
+    search_index = generator.settings["PLUGIN_EVENTS"].get("search_index")
+    if not search_index:
+        return
+
+    path = os.path.join(generator.settings["OUTPUT_PATH"], search_index)
+    default_lang = generator.settings["DEFAULT_LANG"]
+    curr_events = events if not localized_events else localized_events[default_lang]
+    workers = generator.settings["PLUGIN_EVENTS"].get("output_workers", OUTPUT_WORKERS)
+    with BackgroundWriter(workers) as writer:
+        shard_count = write_search_index(path, curr_events, generator.settings, writer)
+    log.debug(
+        "generate_search_index(): %s: %d events in %d shards",
+        path,
+        len(curr_events),
+        shard_count,
+    )
+
+
+def check_event_conflicts(generator) -> None:
+    """Report or reject overlapping events at the same location if PLUGIN_EVENTS["conflicts"] is set.
+
+    Publishes the events_conflicts template variable with the conflicting pairs, and writes a JSON report to
+    PLUGIN_EVENTS["conflict_report_fname"] if set.
+    """
+    policy = generator.settings["PLUGIN_EVENTS"].get("conflicts")
+    if not policy:
+        return
+    if policy not in CONFLICT_POLICIES:
+        raise UnknownPolicy("conflicts", policy, CONFLICT_POLICIES)
+
+    default_lang = generator.settings["DEFAULT_LANG"]
+    curr_events = events if not localized_events else localized_events[default_lang]
+    timestamp = timestamp_now(generator.settings)
+    conflicts = find_event_conflicts(curr_events, timestamp)
+    generator.context["events_conflicts"] = conflicts
+
+    report_fname = generator.settings["PLUGIN_EVENTS"].get("conflict_report_fname")
+    if report_fname:
+        write_output_file(
+            os.path.join(generator.settings["OUTPUT_PATH"], report_fname),
+            conflict_report(conflicts, timestamp),
+        )
+    if conflicts and policy == "error":
+        raise EventConflictError(conflicts)
+    for conflict in conflicts:
+        log.warning("conflicting events at %s", format_conflict(conflict))
+
+
+def add_cached_articles(generator) -> None:
+    """Add event articles which Pelican loaded from its content cache without initializing them again.
+
+    With CONTENT_CACHING_LAYER = "generator", cached articles are unpickled, so parse_article() isn't called for
+    them by the content_object_init signal. Their event data is refreshed from the cache of parsed articles.
+    """
+    seen = {id(f_event) for f_event in events}
+    for article in itertools.chain(
+        getattr(generator, "articles", []),
+        getattr(generator, "translations", []),
+        getattr(generator, "hidden_articles", []),
+        getattr(generator, "hidden_translations", []),
+    ):
+        if id(article) not in seen and "event-start" in article.metadata:
+            log.debug("add_cached_articles(): %s", article.source_path)
+            parse_article(article)
+
+
+def generate_localized_events(generator) -> None:
+    """Generate localized events dict if i18n_subsites plugin is active."""
+    cache = build_caches.pop("article_events", None)
+    if cache is not None:
+        cache.save_cache()
+    prune_article_event_cache()
+    start_time = stage_start_times.get("collection")
+    if start_time is not None and events_collection_finished.receivers:
+        events_collection_finished.send(
+            generator.settings,
+            events=len(events),
+            duration=time.perf_counter() - start_time,
+        )
+    if "i18n_subsites" in (generator.settings["PLUGINS"] or []):
+        if not os.path.exists(generator.settings["OUTPUT_PATH"]):
+            os.makedirs(generator.settings["OUTPUT_PATH"])
+
+        for e in events:
+            if "lang" in e.metadata:
                 localized_events[e.metadata["lang"]].append(e)
             else:
                 log.debug("event %s contains no lang attribute", e.metadata["title"])
 
 
+def event_categories(ev) -> list[str]:
+    """Get the list of categories from an event's event-categories metadata."""
+    categories = ev.metadata.get("event-categories", "")
+    return [c.strip() for c in categories.split(",") if c.strip()]
+
+
+def group_events(sorted_events: list) -> dict[str, dict]:
+    """Group sorted events by year, month, start date and category in a single pass.
+
+    Events keep their sorted order within each group. Keys are the year as an integer, a (year, month) tuple,
+    a datetime.date and the category name from event-categories metadata, so a day's events can be looked up
+    in templates without filtering the whole event list.
+    """
+    groups = {
+        "events_by_year": defaultdict(list),
+        "events_by_month": defaultdict(list),
+        "events_by_date": defaultdict(list),
+        "events_by_category": defaultdict(list),
+    }
+    for ev in sorted_events:
+        start_date = ev.event_plugin_data["dtstart"].date()
+        groups["events_by_year"][start_date.year].append(ev)
+        groups["events_by_month"][(start_date.year, start_date.month)].append(ev)
+        groups["events_by_date"][start_date].append(ev)
+        for category in event_categories(ev):
+            groups["events_by_category"][category].append(ev)
+    return {name: dict(group) for name, group in groups.items()}
+
+
 def populate_context_variables(generator) -> None:
-    """Populate the event_list and upcoming_events_list variables to be used in jinja templates."""
+    """Populate the event_list and upcoming_events_list variables to be used in jinja templates.
+
+    Also publishes events_by_year, events_by_month, events_by_date and events_by_category from group_events(),
+    and events_geo_index for radius and bounding box queries on event coordinates.
+    """
+    today = timestamp_now(generator.settings).date()
 
     def filter_future(ev):
-        return (
-            ev.event_plugin_data["dtend"].date()
-            >= timestamp_now(generator.settings).date()
-        )
+        return ev.event_plugin_data["dtend"].date() >= today
+
+    def sort_key(ev):
+        return (ev.event_plugin_data["dtstart"], ev.event_plugin_data["dtend"])
 
     if not localized_events:
-        generator.context["events_list"] = sorted(
-            events,
-            reverse=True,
-            key=lambda ev: (
-                ev.event_plugin_data["dtstart"],
-                ev.event_plugin_data["dtend"],
-            ),
-        )
+        generator.context["events_list"] = sorted(events, reverse=True, key=sort_key)
         generator.context["upcoming_events_list"] = sorted(
-            filter(filter_future, events),
-            key=lambda ev: (
-                ev.event_plugin_data["dtstart"],
-                ev.event_plugin_data["dtend"],
-            ),
+            filter(filter_future, events), key=sort_key
+        )
+        generator.context.update(group_events(generator.context["events_list"]))
+        generator.context["events_geo_index"] = geo_index_events(
+            generator.context["events_list"]
         )
     else:
         generator.context["events_list"] = {
-            k: sorted(
-                v,
-                reverse=True,
-                key=lambda ev: (
-                    ev.event_plugin_data["dtstart"],
-                    ev.event_plugin_data["dtend"],
-                ),
-            )
+            k: sorted(v, reverse=True, key=sort_key)
             for k, v in localized_events.items()
         }
 
         generator.context["upcoming_events_list"] = {
-            k: sorted(
-                filter(filter_future, v),
-                key=lambda ev: (
-                    ev.event_plugin_data["dtstart"],
-                    ev.event_plugin_data["dtend"],
-                ),
-            )
+            k: sorted(filter(filter_future, v), key=sort_key)
             for k, v in localized_events.items()
         }
 
+        localized_groups = {
+            k: group_events(v) for k, v in generator.context["events_list"].items()
+        }
+        for name in [
+            "events_by_year",
+            "events_by_month",
+            "events_by_date",
+            "events_by_category",
+        ]:
+            generator.context[name] = {k: v[name] for k, v in localized_groups.items()}
+        generator.context["events_geo_index"] = {
+            k: geo_index_events(v) for k, v in generator.context["events_list"].items()
+        }
+
+
+def get_month_page_generator(pelican_object):
+    """Add the month-grid calendar page generator when PLUGIN_EVENTS["month_pages"] is enabled."""
+    if pelican_object.settings.get("PLUGIN_EVENTS", {}).get("month_pages"):
+        return MonthPageGenerator
+    return None
+
+
+def get_event_page_generator(pelican_object):
+    """Add the event page generator when PLUGIN_EVENTS["event_data_file"] is set."""
+    if pelican_object.settings.get("PLUGIN_EVENTS", {}).get("event_data_file"):
+        return EventPageGenerator
+    return None
+
+
+def clear_build_caches(pelican_object) -> None:
+    """Drop data which is only reused within a build, when the build is finalized.
+
+    With i18n_subsites, subsites are built within the main site's build, so they finish before this is called
+    for the main site.
+    """
+    log.debug("clear_build_caches(): %d plain texts dropped", len(html_text_cache))
+    html_text_cache.clear()
+
 
 def initialize_events(article_generator) -> None:
     """Clear events list to support plugins with multiple generation passes like i18n_subsites."""
-    del events[:]
-    localized_events.clear()
-    insert_recurring_events(article_generator.settings)
+    if article_generator.settings["PLUGIN_EVENTS"].get("validate"):
+        errors = validate_content(article_generator.settings)
+        if errors:
+            raise EventValidationError(errors)
+    start_event_collection(article_generator.settings)
 
 
 def register() -> None:
@@ -593,6 +4210,13 @@ def register() -> None:
     """
     signals.article_generator_init.connect(initialize_events)
     signals.content_object_init.connect(parse_article)
+    signals.article_generator_finalized.connect(add_cached_articles)
     signals.article_generator_finalized.connect(generate_localized_events)
+    signals.article_generator_finalized.connect(check_event_conflicts)
     signals.article_generator_finalized.connect(generate_ical_file)
+    signals.article_generator_finalized.connect(generate_sqlite_file)
+    signals.article_generator_finalized.connect(generate_search_index)
     signals.article_generator_finalized.connect(populate_context_variables)
+    signals.get_generators.connect(get_month_page_generator)
+    signals.get_generators.connect(get_event_page_generator)
+    signals.finalized.connect(clear_build_caches)
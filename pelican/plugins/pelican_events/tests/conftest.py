@@ -0,0 +1,77 @@
+"""conftest.py - shared pytest fixtures for the pelican_events tests."""
+# by Ian Kluft
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from pelican.contents import Article
+from pelican.plugins.pelican_events import parse_article
+from pelican.tests.support import get_settings
+
+# constants
+MOCK_TZ = "US/Pacific"
+ARTICLE_TEXT = "<p>Kernel hacking night</p>"
+
+
+@pytest.fixture
+def make_settings():
+    """Return a factory for site settings with the given PLUGIN_EVENTS entries."""
+
+    def factory(**plugin_events) -> dict:
+        return get_settings(
+            PLUGIN_EVENTS={"ics_fname": "calendar.ics", **plugin_events},
+            TIMEZONE=MOCK_TZ,
+            SITEURL="https://example.org/",
+        )
+
+    return factory
+
+
+@pytest.fixture
+def make_article(make_settings):
+    """Return a factory for event articles, parsed unless parse=False, and cached by parse_article() with a source_path.
+
+    Metadata defaults to a two hour meetup on 2025-09-18 and is overridden by keyword arguments.
+    """
+
+    def factory(
+        settings: dict | None = None,
+        text: str = ARTICLE_TEXT,
+        parse: bool = True,
+        source_path: str | None = None,
+        **metadata,
+    ) -> Article:
+        article = Article(
+            text,
+            settings=settings if settings is not None else make_settings(),
+            source_path=source_path,
+            metadata={
+                "title": "Meetup",
+                "summary": "<p>Meetup</p>",
+                "date": datetime(2025, 9, 1, 12, 0),
+                "event-start": "2025-09-18 18:00",
+                "event-duration": "2h",
+                **metadata,
+            },
+        )
+        if parse:
+            parse_article(article)
+        return article
+
+    return factory
+
+
+@pytest.fixture
+def make_event():
+    """Return a factory for minimal event objects with only the attributes used by grouping and layout code."""
+
+    def factory(title: str, start: datetime, duration: timedelta, **metadata):
+        return SimpleNamespace(
+            url=f"{title}.html",
+            metadata={"title": title, **metadata},
+            event_plugin_data={"dtstart": start, "dtend": start + duration},
+        )
+
+    return factory
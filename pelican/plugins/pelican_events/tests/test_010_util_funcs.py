@@ -41,6 +41,26 @@ class TestCaseData:
             {"text": "<i>italic</i>", "out": "_italic_"},
             {"text": "<b>bold</b>", "out": "**bold**"},
         ),
+        "test_strip_html_tags_fast": (
+            {"text": "no HTML here", "out": "no HTML here"},
+            {"text": "<i>italic</i> and <b>bold</b>", "out": "italic and bold"},
+            {"text": "see <a href='x.html'>link text</a>.", "out": "see link text."},
+            {"text": "<p>one</p>\n\n<p>two<br>three</p>", "out": "one\ntwo\nthree"},
+            {"text": "<ul><li>a</li><li>b</li></ul>", "out": "a\nb"},
+            {
+                "text": "Q&amp;A &lt;3 &#8212; caf&eacute;",
+                "out": "Q&A <3 \u2014 caf\u00e9",
+            },
+            {
+                "text": "<style>p {}</style><p>text</p><script>x()</script>",
+                "out": "text",
+            },
+            {"text": "<img src='a.png' alt='picture'/> here", "out": "picture here"},
+            {"text": "<pre>line 1\n  line 2</pre>", "out": "line 1\n  line 2"},
+        ),
+        "test_strip_html_tags_unknown": ({"engine": "markdown"},),
+        "test_strip_html_tags_cache": ({"text": "<p>cached <b>text</b></p>"},),
+        "test_strip_html_tags_cache_size": ({"size": 2},),
         "test_parse_tstamp": (
             {
                 # "name": "start",
@@ -177,6 +197,50 @@ class TestCaseData:
         """Tests for strip_html_tags()."""
         assert pelican.plugins.pelican_events.strip_html_tags(text) == out
 
+    def test_strip_html_tags_fast(self, text: str, out: str) -> None:
+        """Tests for strip_html_tags() with the fast engine."""
+        assert pelican.plugins.pelican_events.strip_html_tags(text, "fast") == out
+
+    def test_strip_html_tags_unknown(self, engine: str) -> None:
+        """Tests that strip_html_tags() rejects an unknown engine."""
+        with pytest.raises(pelican.plugins.pelican_events.UnknownTextEngine):
+            pelican.plugins.pelican_events.strip_html_tags("text", engine)
+
+    def test_strip_html_tags_cache(self, text: str, monkeypatch) -> None:
+        """Tests that strip_html_tags() converts a text once per engine until the build is finalized."""
+        plugin_module = pelican.plugins.pelican_events.pelican_events
+        converted = []
+        html_to_text = plugin_module._html_to_text
+
+        def counting_html_to_text(html, engine):
+            converted.append(engine)
+            return html_to_text(html, engine)
+
+        monkeypatch.setattr(plugin_module, "_html_to_text", counting_html_to_text)
+        plugin_module.clear_build_caches(None)
+        for _ in range(3):
+            assert plugin_module.strip_html_tags(text, "fast") == "cached text"
+            plugin_module.strip_html_tags(text)
+        assert converted == ["fast", "html2text"]
+        assert len(plugin_module.html_text_cache) == 2  # noqa: PLR2004
+
+        plugin_module.clear_build_caches(None)
+        assert plugin_module.html_text_cache == {}
+        plugin_module.strip_html_tags(text, "fast")
+        assert converted == ["fast", "html2text", "fast"]
+
+    def test_strip_html_tags_cache_size(self, size: int, monkeypatch) -> None:
+        """Tests that strip_html_tags() keeps at most HTML_TEXT_CACHE_SIZE texts, dropping the least recently used."""
+        plugin_module = pelican.plugins.pelican_events.pelican_events
+        monkeypatch.setattr(plugin_module, "HTML_TEXT_CACHE_SIZE", size)
+        plugin_module.clear_build_caches(None)
+        plugin_module.strip_html_tags("<p>first</p>", "fast")
+        plugin_module.strip_html_tags("<p>second</p>", "fast")
+        plugin_module.strip_html_tags("<p>first</p>", "fast")
+        plugin_module.strip_html_tags("<p>third</p>", "fast")
+        assert list(plugin_module.html_text_cache.values()) == ["first", "third"]
+        plugin_module.clear_build_caches(None)
+
     def test_parse_tstamp(
         self,
         in_metadata: metadata_type,
@@ -0,0 +1,30 @@
+"""test_012_output.py - unit tests for background output writes in pelican_events plugin for Pelican."""
+# by Ian Kluft
+
+import pytest
+
+from pelican.plugins.pelican_events import BackgroundWriter
+
+
+class TestBackgroundWriter:
+    """Tests for BackgroundWriter."""
+
+    @pytest.mark.parametrize("workers", [0, 1, 2])
+    def test_write(self, tmp_path, workers: int) -> None:
+        """Tests that all queued files are written, including new directories, when the with block ends."""
+        paths = [tmp_path / "out" / f"file{i}.ics" for i in range(5)]
+        with BackgroundWriter(workers) as writer:
+            for i, path in enumerate(paths):
+                writer.write(str(path), f"data {i}".encode())
+        assert [path.read_bytes() for path in paths] == [
+            f"data {i}".encode() for i in range(5)
+        ]
+
+    def test_write_error(self, tmp_path) -> None:
+        """Tests that a failed background write raises its error when the writer is closed."""
+        blocker = tmp_path / "blocker"
+        blocker.write_text("not a directory")
+        with pytest.raises(OSError), BackgroundWriter(2) as writer:
+            writer.write(str(tmp_path / "ok.ics"), b"ok")
+            writer.write(str(blocker / "fail.ics"), b"fail")
+        assert (tmp_path / "ok.ics").read_bytes() == b"ok"
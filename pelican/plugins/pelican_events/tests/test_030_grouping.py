@@ -0,0 +1,82 @@
+"""test_030_grouping.py - unit tests for grouped event indexes published to templates."""
+# by Ian Kluft
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from pelican.plugins.pelican_events import event_categories, group_events
+
+# constants
+MOCK_TZ = "US/Pacific"
+DURATION = timedelta(hours=2)
+
+
+class TestGrouping:
+    """Tests for group_events() and event_categories()."""
+
+    def test_event_categories(self, make_event) -> None:
+        """Tests that event_categories() splits and strips the event-categories metadata."""
+        start = datetime(2025, 9, 18, 18, 0, tzinfo=ZoneInfo(MOCK_TZ))
+        assert event_categories(make_event("a", start, DURATION)) == []
+        assert event_categories(
+            make_event(
+                "b", start, DURATION, **{"event-categories": " meeting, social ,,"}
+            )
+        ) == [
+            "meeting",
+            "social",
+        ]
+
+    def test_group_events(self, make_event) -> None:
+        """Tests that group_events() builds each index and keeps the sorted order within groups."""
+        tz = ZoneInfo(MOCK_TZ)
+        sorted_events = [
+            make_event(
+                "d",
+                datetime(2026, 1, 3, 18, 0, tzinfo=tz),
+                DURATION,
+                **{"event-categories": "meeting"},
+            ),
+            make_event(
+                "c",
+                datetime(2025, 9, 18, 20, 0, tzinfo=tz),
+                DURATION,
+                **{"event-categories": "social"},
+            ),
+            make_event(
+                "b",
+                datetime(2025, 9, 18, 18, 0, tzinfo=tz),
+                DURATION,
+                **{"event-categories": "meeting, social"},
+            ),
+            make_event("a", datetime(2025, 8, 7, 18, 0, tzinfo=tz), DURATION),
+        ]
+        groups = group_events(sorted_events)
+
+        def titles(group):
+            return {k: [ev.metadata["title"] for ev in v] for k, v in group.items()}
+
+        assert titles(groups["events_by_year"]) == {2026: ["d"], 2025: ["c", "b", "a"]}
+        assert titles(groups["events_by_month"]) == {
+            (2026, 1): ["d"],
+            (2025, 9): ["c", "b"],
+            (2025, 8): ["a"],
+        }
+        assert titles(groups["events_by_date"]) == {
+            date(2026, 1, 3): ["d"],
+            date(2025, 9, 18): ["c", "b"],
+            date(2025, 8, 7): ["a"],
+        }
+        assert titles(groups["events_by_category"]) == {
+            "meeting": ["d", "b"],
+            "social": ["c", "b"],
+        }
+
+    def test_group_events_empty(self) -> None:
+        """Tests that group_events() returns empty indexes when there are no events."""
+        assert group_events([]) == {
+            "events_by_year": {},
+            "events_by_month": {},
+            "events_by_date": {},
+            "events_by_category": {},
+        }
@@ -0,0 +1,174 @@
+"""test_040_month_pages.py - unit tests for the month-grid calendar page generator."""
+# by Ian Kluft
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from jinja2 import DictLoader, Environment
+import pytest
+
+from pelican.plugins.pelican_events import (
+    MonthPageGenerator,
+    clear_events,
+    day_bucket_index,
+    event_days,
+    iter_months,
+    month_grid,
+    snapshot_events,
+    template_chain_digest,
+)
+from pelican.plugins.pelican_events.pelican_events import events
+from pelican.tests.support import get_settings
+from pelican.writers import Writer
+
+# constants
+MOCK_TZ = "US/Pacific"
+TZ = ZoneInfo(MOCK_TZ)
+
+
+class TestMonthPages:
+    """Tests for the day bucket index and the month page generator."""
+
+    @pytest.mark.parametrize(
+        ("start", "end", "expected"),
+        [
+            (
+                datetime(2025, 9, 18, 18, 0, tzinfo=TZ),
+                datetime(2025, 9, 18, 21, 0, tzinfo=TZ),
+                [date(2025, 9, 18)],
+            ),
+            (
+                datetime(2025, 9, 30, 18, 0, tzinfo=TZ),
+                datetime(2025, 10, 2, 12, 0, tzinfo=TZ),
+                [date(2025, 9, 30), date(2025, 10, 1), date(2025, 10, 2)],
+            ),
+            (
+                datetime(2025, 9, 18, 0, 0, tzinfo=TZ),
+                datetime(2025, 9, 20, 0, 0, tzinfo=TZ),
+                [date(2025, 9, 18), date(2025, 9, 19)],
+            ),
+            (
+                datetime(2025, 9, 18, 0, 0, tzinfo=TZ),
+                datetime(2025, 9, 18, 0, 0, tzinfo=TZ),
+                [date(2025, 9, 18)],
+            ),
+        ],
+    )
+    def test_event_days(self, start, end, expected) -> None:
+        """Tests for event_days() with single-day, multi-day and midnight-ending events."""
+        assert event_days(start, end) == expected
+
+    def test_iter_months(self) -> None:
+        """Tests that iter_months() crosses year boundaries."""
+        assert list(iter_months(date(2025, 11, 20), date(2026, 2, 1))) == [
+            (2025, 11),
+            (2025, 12),
+            (2026, 1),
+            (2026, 2),
+        ]
+
+    def test_day_bucket_index(self, make_event) -> None:
+        """Tests that day_bucket_index() puts multi-day events on each day and sorts each day."""
+        late = make_event(
+            "late", datetime(2025, 10, 1, 19, 0, tzinfo=TZ), timedelta(hours=2)
+        )
+        span = make_event(
+            "span", datetime(2025, 9, 30, 9, 0, tzinfo=TZ), timedelta(days=1, hours=2)
+        )
+        buckets = day_bucket_index([late, span])
+        assert buckets == {date(2025, 9, 30): [span], date(2025, 10, 1): [span, late]}
+
+    def test_month_grid(self, make_event) -> None:
+        """Tests that month_grid() returns complete weeks with each day's events."""
+        ev = make_event(
+            "ev", datetime(2025, 9, 18, 18, 0, tzinfo=TZ), timedelta(hours=2)
+        )
+        grid = month_grid(2025, 9, day_bucket_index([ev]), firstweekday=6)
+        assert all(len(week) == 7 for week in grid)  # noqa: PLR2004
+        assert grid[0][0][0] == date(2025, 8, 31)
+        cells = dict(cell for week in grid for cell in week)
+        assert cells[date(2025, 9, 18)] == [ev]
+        assert cells[date(2025, 9, 19)] == []
+
+    def test_generator(self, tmp_path, make_event) -> None:
+        """Tests that MonthPageGenerator writes a page per month and skips unchanged months on the next build."""
+        settings = get_settings(
+            PLUGIN_EVENTS={"ics_fname": "calendar.ics", "month_pages": True},
+            TIMEZONE=MOCK_TZ,
+            CACHE_PATH=str(tmp_path / "cache"),
+            CACHE_CONTENT=True,
+            LOAD_CONTENT_CACHE=True,
+        )
+        output_path = tmp_path / "output"
+        clear_events()
+        events.extend(
+            [
+                make_event(
+                    "a", datetime(2025, 9, 18, 18, 0, tzinfo=TZ), timedelta(hours=2)
+                ),
+                make_event(
+                    "b", datetime(2025, 11, 6, 18, 0, tzinfo=TZ), timedelta(hours=2)
+                ),
+            ]
+        )
+
+        def build():
+            context = settings.copy()
+            generator = MonthPageGenerator(
+                context=context,
+                settings=settings,
+                path=str(tmp_path),
+                theme=settings["THEME"],
+                output_path=str(output_path),
+            )
+            generator.generate_context()
+            generator.generate_output(Writer(str(output_path), settings=settings))
+            return context
+
+        context = build()
+        assert [m["url"] for m in context["events_months"]] == [
+            "events/2025/09/",
+            "events/2025/10/",
+            "events/2025/11/",
+        ]
+        september = output_path / "events" / "2025" / "09" / "index.html"
+        october = output_path / "events" / "2025" / "10" / "index.html"
+        assert "a.html" in september.read_text()
+        assert october.exists()
+
+        september.write_text("unchanged")
+        events.append(
+            make_event("c", datetime(2025, 10, 9, 18, 0, tzinfo=TZ), timedelta(hours=2))
+        )
+        build()
+        assert september.read_text() == "unchanged"
+        assert "c.html" in october.read_text()
+        assert len(snapshot_events()) == 3  # noqa: PLR2004
+
+        # a changed site URL is on every page, so all pages are written again
+        september.write_text("unchanged")
+        settings["SITEURL"] = "https://events.example.org"
+        build()
+        assert "a.html" in september.read_text()
+        clear_events()
+
+    def test_template_chain_digest(self) -> None:
+        """Tests that template_chain_digest() changes with the templates a template extends or includes."""
+        templates = {
+            "events_month.html": '{% extends "base.html" %}{% block content %}{% endblock %}',
+            "base.html": '<html>{% include "menu.html" %}{% block content %}{% endblock %}</html>',
+            "menu.html": "<nav></nav>",
+            "unused.html": "",
+        }
+        env = Environment(loader=DictLoader(templates))
+        digest = template_chain_digest(env, "events_month.html")
+        templates["unused.html"] = "changed"
+        assert template_chain_digest(env, "events_month.html") == digest
+        templates["menu.html"] = "<nav>changed</nav>"
+        assert template_chain_digest(env, "events_month.html") != digest
+
+        # a template included by a variable could be any template
+        templates["base.html"] = "{% include menu_template %}"
+        digest = template_chain_digest(env, "events_month.html")
+        templates["unused.html"] = "changed again"
+        assert template_chain_digest(env, "events_month.html") != digest
@@ -0,0 +1,159 @@
+"""test_050_geo.py - unit tests for the geographic index of events."""
+# by Ian Kluft
+
+from datetime import datetime
+import random
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import icalendar
+import pytest
+
+from pelican.plugins.pelican_events import (
+    BackgroundWriter,
+    GeoFilterError,
+    GeoIndex,
+    geo_distance_km,
+    geo_index_events,
+    parse_geo,
+    write_geo_feeds,
+)
+
+# constants
+LUCKY_LAB = (45.53371, -122.69174)  # Portland, Oregon
+CENTRAL_LIBRARY = (45.51906, -122.68306)  # Portland, Oregon
+BEAVERTON = (45.48706, -122.80371)
+SEATTLE = (47.60621, -122.33207)
+
+
+class TestGeo:
+    """Tests for coordinate parsing, distances and GeoIndex queries."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("45.53371;-122.69174", LUCKY_LAB),
+            (" 45.5 ; -122.6 ", (45.5, -122.6)),
+            ("45.5", None),
+            ("north;west", None),
+            ("91;0", None),
+            ("0;181", None),
+        ],
+    )
+    def test_parse_geo(self, value: str, expected) -> None:
+        """Tests for parse_geo()."""
+        assert parse_geo(value) == expected
+
+    def test_geo_distance_km(self) -> None:
+        """Tests geo_distance_km() against known distances."""
+        assert geo_distance_km(LUCKY_LAB, LUCKY_LAB) == 0
+        assert geo_distance_km(LUCKY_LAB, CENTRAL_LIBRARY) == pytest.approx(
+            1.8, abs=0.1
+        )
+        assert geo_distance_km(LUCKY_LAB, SEATTLE) == pytest.approx(233, abs=2)
+
+    def test_queries(self) -> None:
+        """Tests radius and bounding box queries on a few points."""
+        index = GeoIndex()
+        for name, point in [
+            ("seattle", SEATTLE),
+            ("beaverton", BEAVERTON),
+            ("library", CENTRAL_LIBRARY),
+            ("lucky_lab", LUCKY_LAB),
+        ]:
+            index.add(point, name)
+        assert len(index) == 4  # noqa: PLR2004
+        assert index.within_radius(*LUCKY_LAB, 5) == ["lucky_lab", "library"]
+        assert index.within_radius(*LUCKY_LAB, 15) == [
+            "lucky_lab",
+            "library",
+            "beaverton",
+        ]
+        assert index.within_bbox(45.4, -122.9, 45.6, -122.6) == [
+            "beaverton",
+            "library",
+            "lucky_lab",
+        ]
+
+    def test_queries_match_brute_force(self) -> None:
+        """Tests that grid queries find the same points as checking every point."""
+        rng = random.Random(42)
+        points = [
+            (45.5 + rng.uniform(-1, 1), -122.7 + rng.uniform(-1, 1))
+            for _ in range(2000)
+        ]
+        index = GeoIndex()
+        for number, point in enumerate(points):
+            index.add(point, number)
+        for km in (1, 10, 50):
+            expected = {
+                n
+                for n, point in enumerate(points)
+                if geo_distance_km(LUCKY_LAB, point) <= km
+            }
+            assert set(index.within_radius(*LUCKY_LAB, km)) == expected
+        expected = [
+            n
+            for n, (lat, lon) in enumerate(points)
+            if 45.2 <= lat <= 45.8 and -123.0 <= lon <= -122.5  # noqa: PLR2004
+        ]
+        assert index.within_bbox(45.2, -123.0, 45.8, -122.5) == expected
+
+    def test_radius_across_antimeridian(self) -> None:
+        """Tests that radius queries find points on the other side of the 180th meridian."""
+        index = GeoIndex()
+        for name, point in [
+            ("east", (-17.0, 179.95)),
+            ("west", (-17.0, -179.95)),
+            ("edge", (-17.0, 180.0)),
+            ("far", (-17.0, -179.5)),
+        ]:
+            index.add(point, name)
+        assert index.within_radius(-17.0, 179.99, 10) == ["edge", "east", "west"]
+        assert index.within_radius(-17.0, -179.99, 10) == ["edge", "west", "east"]
+        assert set(index.within_radius(-17.0, 0.0, 20040)) == {
+            "far",
+            "west",
+            "edge",
+            "east",
+        }
+
+    def test_geo_index_events(self) -> None:
+        """Tests that geo_index_events() skips events without coordinates."""
+        events = [
+            SimpleNamespace(event_plugin_data={"geo": LUCKY_LAB}),
+            SimpleNamespace(event_plugin_data={}),
+            SimpleNamespace(event_plugin_data={"geo": None}),
+        ]
+        index = geo_index_events(events)
+        assert index.within_radius(*LUCKY_LAB, 1) == [events[0]]
+        assert len(index) == 1
+
+    def test_write_geo_feeds(self, tmp_path) -> None:
+        """Tests that write_geo_feeds() writes a calendar per filter with the matching events."""
+        entries = []
+        for uid, point in [("a", LUCKY_LAB), ("b", SEATTLE), ("c", None)]:
+            component = icalendar.Event()
+            component.add("uid", uid)
+            component.add(
+                "dtstart", datetime(2025, 9, 18, 18, 0, tzinfo=ZoneInfo("US/Pacific"))
+            )
+            entries.append({"uid": uid, "component": component, "geo": point})
+        settings = {
+            "OUTPUT_PATH": str(tmp_path),
+            "PLUGIN_EVENTS": {
+                "geo_feeds": {
+                    "portland.ics": {"radius": [*CENTRAL_LIBRARY, 10]},
+                    "washington.ics": {"bbox": [45.6, -124.8, 49.0, -116.9]},
+                }
+            },
+        }
+        with BackgroundWriter(0) as writer:
+            write_geo_feeds(entries, settings, writer)
+        for fname, uids in [("portland.ics", ["a"]), ("washington.ics", ["b"])]:
+            cal = icalendar.Calendar.from_ical((tmp_path / fname).read_bytes())
+            assert [str(event["UID"]) for event in cal.walk("VEVENT")] == uids
+
+        settings["PLUGIN_EVENTS"]["geo_feeds"] = {"bad.ics": {"radius": [45.5, -122.6]}}
+        with pytest.raises(GeoFilterError), BackgroundWriter(0) as writer:
+            write_geo_feeds(entries, settings, writer)
@@ -0,0 +1,198 @@
+"""test_060_event_data.py - unit tests for events and pages from a bulk event data file."""
+# by Ian Kluft
+
+from datetime import datetime
+import json
+from zoneinfo import ZoneInfo
+
+from pelican.plugins.pelican_events import (
+    DataEvent,
+    EventPageGenerator,
+    clear_events,
+    collect_calendar_entries,
+    insert_data_events,
+    load_event_data_file,
+    snapshot_events,
+)
+from pelican.plugins.pelican_events.pelican_events import event_data_cache
+from pelican.tests.support import get_settings
+from pelican.writers import Writer
+
+# constants
+MOCK_TZ = "US/Pacific"
+TZ = ZoneInfo(MOCK_TZ)
+RECORDS = [
+    {
+        "title": "Opening Keynote",
+        "summary": "<p>Welcome</p>",
+        "content": "<p>The <b>opening</b> keynote</p>",
+        "event-start": "2025-10-20 09:00",
+        "event-duration": "1h",
+        "event-location": "Hall A",
+    },
+    {
+        "title": "eBPF Deep Dive",
+        "slug": "ebpf",
+        "summary": "<p>Tracing with eBPF</p>",
+        "event-start": "2025-10-20 10:30",
+        "event-end": "2025-10-20 11:15",
+        "event-categories": "TALK",
+    },
+    {"title": "No start time", "event-duration": "1h"},
+    {
+        "title": "Unannounced",
+        "event-start": "2025-10-21 09:00",
+        "event-duration": "1h",
+        "status": "draft",
+    },
+]
+
+
+def write_records(path, records: list) -> None:
+    """Write records to a JSON Lines file."""
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+
+class TestEventData:
+    """Tests for DataEvent, load_event_data_file() and EventPageGenerator."""
+
+    def test_data_event(self) -> None:
+        """Tests that a record gets event times, a slug and page URLs like an event article."""
+        settings = get_settings(
+            PLUGIN_EVENTS={"ics_fname": "calendar.ics"}, TIMEZONE=MOCK_TZ
+        )
+        data_event = DataEvent(RECORDS[0], settings)
+        assert data_event.event_plugin_data == {
+            "dtstart": datetime(2025, 10, 20, 9, 0, tzinfo=TZ),
+            "dtend": datetime(2025, 10, 20, 10, 0, tzinfo=TZ),
+        }
+        assert data_event.url == "events/opening-keynote.html"
+        assert data_event.metadata["date"] == data_event.event_plugin_data["dtstart"]
+        assert "content" not in data_event.metadata
+
+        settings["PLUGIN_EVENTS"]["event_page_url"] = "{lang}/sessions/{slug}/"
+        assert DataEvent(RECORDS[1], settings).url == "en/sessions/ebpf/"
+
+    def test_load_event_data_file(self, tmp_path, caplog) -> None:
+        """Tests that invalid records are skipped and only changed records are processed again."""
+        settings = get_settings(
+            PLUGIN_EVENTS={
+                "ics_fname": "calendar.ics",
+                "event_data_file": "program.jsonl",
+            },
+            TIMEZONE=MOCK_TZ,
+            PATH=str(tmp_path),
+            CACHE_PATH=str(tmp_path / "cache"),
+            CACHE_CONTENT=True,
+            LOAD_CONTENT_CACHE=True,
+        )
+        path = tmp_path / "program.jsonl"
+        write_records(path, RECORDS)
+        event_data_cache.clear()
+        first = load_event_data_file(settings)
+        assert [ev.title for ev in first] == [
+            "Opening Keynote",
+            "eBPF Deep Dive",
+            "Unannounced",
+        ]
+        assert "program.jsonl:3: skipped event record" in caplog.text
+
+        # an edited record is processed again, the others are reused from the cache
+        records = [*RECORDS]
+        records[1] = {**records[1], "event-location": "Hall B"}
+        write_records(path, records)
+        second = load_event_data_file(settings)
+        assert second[0] is first[0]
+        assert second[1] is not first[1]
+        assert second[1].metadata["event-location"] == "Hall B"
+
+        clear_events()
+        insert_data_events(settings)
+        assert [ev.title for ev in snapshot_events()] == [
+            "Opening Keynote",
+            "eBPF Deep Dive",
+        ]
+        entries = collect_calendar_entries(
+            snapshot_events(), settings, datetime(2025, 10, 1, tzinfo=TZ)
+        )
+        assert [str(entry["component"]["DESCRIPTION"]) for entry in entries] == [
+            "The **opening** keynote",
+            "Tracing with eBPF",
+        ]
+        clear_events()
+        event_data_cache.clear()
+
+    def test_plugin_timezone(self, tmp_path) -> None:
+        """Tests that cached events are rebuilt when PLUGIN_EVENTS["timezone"] changes without TIMEZONE."""
+        settings = get_settings(
+            PLUGIN_EVENTS={
+                "ics_fname": "calendar.ics",
+                "event_data_file": "program.jsonl",
+                "timezone": MOCK_TZ,
+            },
+            PATH=str(tmp_path),
+        )
+        settings.pop("TIMEZONE", None)
+        write_records(tmp_path / "program.jsonl", RECORDS[:1])
+        event_data_cache.clear()
+        assert load_event_data_file(settings)[0].event_plugin_data["dtstart"] == (
+            datetime(2025, 10, 20, 9, 0, tzinfo=TZ)
+        )
+        settings["PLUGIN_EVENTS"]["timezone"] = "Europe/Berlin"
+        assert load_event_data_file(settings)[0].event_plugin_data["dtstart"] == (
+            datetime(2025, 10, 20, 9, 0, tzinfo=ZoneInfo("Europe/Berlin"))
+        )
+        event_data_cache.clear()
+
+    def test_generator(self, tmp_path) -> None:
+        """Tests that EventPageGenerator writes a page per event and skips unchanged pages on the next build."""
+        settings = get_settings(
+            PLUGIN_EVENTS={
+                "ics_fname": "calendar.ics",
+                "event_data_file": "program.jsonl",
+            },
+            TIMEZONE=MOCK_TZ,
+            PATH=str(tmp_path),
+            CACHE_PATH=str(tmp_path / "cache"),
+            CACHE_CONTENT=True,
+            LOAD_CONTENT_CACHE=True,
+        )
+        output_path = tmp_path / "output"
+        write_records(tmp_path / "program.jsonl", RECORDS[:2])
+
+        def build():
+            clear_events()
+            insert_data_events(settings)
+            context = settings.copy()
+            generator = EventPageGenerator(
+                context=context,
+                settings=settings,
+                path=str(tmp_path),
+                theme=settings["THEME"],
+                output_path=str(output_path),
+            )
+            generator.generate_context()
+            generator.generate_output(Writer(str(output_path), settings=settings))
+
+        event_data_cache.clear()
+        build()
+        keynote = output_path / "events" / "opening-keynote.html"
+        ebpf = output_path / "events" / "ebpf.html"
+        assert "The <b>opening</b> keynote" in keynote.read_text()
+        assert "Tracing with eBPF" in ebpf.read_text()
+
+        keynote.write_text("unchanged")
+        write_records(
+            tmp_path / "program.jsonl",
+            [RECORDS[0], {**RECORDS[1], "summary": "<p>Tracing and networking</p>"}],
+        )
+        build()
+        assert keynote.read_text() == "unchanged"
+        assert "Tracing and networking" in ebpf.read_text()
+
+        # a changed site URL is on every page, so all pages are written again
+        settings["SITEURL"] = "https://events.example.org"
+        build()
+        assert "The <b>opening</b> keynote" in keynote.read_text()
+        clear_events()
+        event_data_cache.clear()
@@ -0,0 +1,142 @@
+"""test_070_conflicts.py - unit tests for detection of overlapping events at the same location."""
+# by Ian Kluft
+
+from datetime import datetime, timedelta
+import json
+import random
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from pelican.plugins.pelican_events import (
+    EventConflictError,
+    UnknownPolicy,
+    check_event_conflicts,
+    clear_events,
+    find_event_conflicts,
+    sweep_overlaps,
+)
+from pelican.plugins.pelican_events.pelican_events import events
+
+# constants
+MOCK_TZ = "US/Pacific"
+TZ = ZoneInfo(MOCK_TZ)
+TIMESTAMP = datetime(2025, 10, 1, 12, 0, tzinfo=TZ)
+
+
+class TestConflicts:
+    """Tests for the sweep line and the conflict check."""
+
+    def test_sweep_overlaps(self) -> None:
+        """Tests that touching and empty intervals don't overlap."""
+        intervals = [(0, 2, "a"), (2, 4, "b"), (3, 5, "c"), (3, 3, "d"), (1, 6, "e")]
+        assert sorted(sweep_overlaps(intervals)) == [
+            ("a", "e"),
+            ("b", "c"),
+            ("e", "b"),
+            ("e", "c"),
+        ]
+
+    def test_sweep_overlaps_match_brute_force(self) -> None:
+        """Tests that the sweep line finds the same pairs as comparing every pair."""
+        rng = random.Random(44)
+        intervals = []
+        for number in range(500):
+            start = rng.randrange(10000)
+            intervals.append((start, start + rng.randrange(1, 60), number))
+        expected = {
+            frozenset((a[2], b[2]))
+            for i, a in enumerate(intervals)
+            for b in intervals[i + 1 :]
+            if a[0] < b[1] and b[0] < a[1]
+        }
+        pairs = sweep_overlaps(intervals)
+        assert len(pairs) == len(expected)
+        assert {frozenset(pair) for pair in pairs} == expected
+
+    def test_find_event_conflicts(self, make_event) -> None:
+        """Tests grouping by location or coordinates, ended events and overlap counts."""
+        start = datetime(2025, 10, 2, 18, 0, tzinfo=TZ)
+        talk = make_event(
+            "talk", start, timedelta(hours=2), **{"event-location": "Room 101"}
+        )
+        workshop = make_event(
+            "workshop",
+            start + timedelta(hours=1),
+            timedelta(hours=3),
+            **{"event-location": "room  101"},
+        )
+        social = make_event(
+            "social",
+            start + timedelta(hours=2),
+            timedelta(hours=2),
+            **{"event-location": "Room 101"},
+        )
+        elsewhere = make_event(
+            "elsewhere", start, timedelta(hours=2), **{"event-location": "Room 102"}
+        )
+        ended = make_event(
+            "ended",
+            TIMESTAMP - timedelta(hours=3),
+            timedelta(hours=2),
+            **{"event-location": "Room 101"},
+        )
+        nearby = [make_event(f"geo{i}", start, timedelta(hours=1)) for i in range(2)]
+        nearby[0].event_plugin_data["geo"] = (45.533712, -122.691741)
+        nearby[1].event_plugin_data["geo"] = (45.53371, -122.69174)
+
+        conflicts = find_event_conflicts(
+            [talk, workshop, social, elsewhere, ended, *nearby], TIMESTAMP
+        )
+        assert [(c["first"].url, c["second"].url) for c in conflicts] == [
+            ("geo0.html", "geo1.html"),
+            ("talk.html", "workshop.html"),
+            ("workshop.html", "social.html"),
+        ]
+        assert conflicts[1]["location"] == "Room 101"
+        assert [
+            ev.event_plugin_data["overlaps"]
+            for ev in (talk, workshop, social, elsewhere, ended)
+        ] == [1, 2, 1, 0, 0]
+
+    def test_check_event_conflicts(self, tmp_path, make_event) -> None:
+        """Tests the template variable, the report file and the policies."""
+        start = datetime(2025, 10, 2, 18, 0, tzinfo=TZ)
+        clear_events()
+        events.extend(
+            [
+                make_event(
+                    "a", start, timedelta(hours=2), **{"event-location": "Room 101"}
+                ),
+                make_event(
+                    "b", start, timedelta(hours=1), **{"event-location": "Room 101"}
+                ),
+            ]
+        )
+        settings = {
+            "DEFAULT_LANG": "en",
+            "OUTPUT_PATH": str(tmp_path),
+            "TIMEZONE": MOCK_TZ,
+            "PLUGIN_EVENTS": {
+                "test_timestamp": "2025-10-01 12:00",
+                "conflicts": "warn",
+                "conflict_report_fname": "conflicts.json",
+            },
+        }
+        generator = SimpleNamespace(settings=settings, context={})
+        check_event_conflicts(generator)
+        assert len(generator.context["events_conflicts"]) == 1
+        report = json.loads((tmp_path / "conflicts.json").read_text())
+        assert [ev["url"] for ev in report["conflicts"][0]["events"]] == [
+            "b.html",
+            "a.html",
+        ]
+
+        settings["PLUGIN_EVENTS"]["conflicts"] = "error"
+        with pytest.raises(EventConflictError, match="Room 101: 'b'"):
+            check_event_conflicts(generator)
+        settings["PLUGIN_EVENTS"]["conflicts"] = "ignore"
+        with pytest.raises(UnknownPolicy):
+            check_event_conflicts(generator)
+        clear_events()
@@ -0,0 +1,196 @@
+"""test_080_article_cache.py - unit tests for caching the parsed event data of articles."""
+# by Ian Kluft
+
+from datetime import datetime
+from functools import partial
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from pelican.plugins.pelican_events import (
+    add_cached_articles,
+    build_ical_event,
+    clear_events,
+    generate_localized_events,
+    parse_tstamp,
+    pelican_events as plugin_module,
+    snapshot_events,
+    start_event_collection,
+)
+from pelican.plugins.pelican_events.pelican_events import article_event_cache
+from pelican.tests.support import get_settings
+from pelican.utils import SafeDatetime
+
+# constants
+MOCK_TZ = "US/Pacific"
+TZ = ZoneInfo(MOCK_TZ)
+
+
+@pytest.fixture
+def make_meetup(make_article):
+    """Return the event article factory with a source path, which parse_article() needs to cache event data."""
+    return partial(make_article, source_path="/content/meetup.md")
+
+
+class TestArticleCache:
+    """Tests for article_event_data() and add_cached_articles()."""
+
+    def test_article_event_data(self, tmp_path, monkeypatch, make_meetup) -> None:
+        """Tests that unchanged articles aren't parsed again, within a process and between builds."""
+        settings = get_settings(
+            PLUGIN_EVENTS={"ics_fname": "calendar.ics"},
+            TIMEZONE=MOCK_TZ,
+            CACHE_PATH=str(tmp_path / "cache"),
+            CACHE_CONTENT=True,
+            LOAD_CONTENT_CACHE=True,
+        )
+        parsed = []
+        original = plugin_module.parse_event_metadata
+
+        def counting_parse(metadata, settings):
+            parsed.append(metadata["event-duration"])
+            return original(metadata, settings)
+
+        monkeypatch.setattr(plugin_module, "parse_event_metadata", counting_parse)
+        article_event_cache.clear()
+        start_event_collection(settings)
+        first = make_meetup(settings)
+        second = make_meetup(settings)
+        assert parsed == ["2h"]
+        assert first.event_plugin_data == second.event_plugin_data
+        assert first.event_plugin_data is not second.event_plugin_data
+
+        # changed event times are parsed again
+        changed = make_meetup(settings, **{"event-duration": "3h"})
+        assert parsed == ["2h", "3h"]
+        assert changed.event_plugin_data["dtend"] == datetime(
+            2025, 9, 18, 21, 0, tzinfo=TZ
+        )
+        generate_localized_events(SimpleNamespace(settings=settings))
+
+        # the next build loads the parsed data from CACHE_PATH
+        article_event_cache.clear()
+        start_event_collection(settings)
+        make_meetup(settings, **{"event-duration": "3h"})
+        assert parsed == ["2h", "3h"]
+        article_event_cache.clear()
+        clear_events()
+
+    def test_plugin_timezone(self, make_meetup) -> None:
+        """Tests that a change of PLUGIN_EVENTS["timezone"] without TIMEZONE parses cached articles again."""
+        settings = get_settings(
+            PLUGIN_EVENTS={"ics_fname": "calendar.ics", "timezone": MOCK_TZ}
+        )
+        article_event_cache.clear()
+        assert make_meetup(settings).event_plugin_data["dtstart"].tzinfo == TZ
+        settings["PLUGIN_EVENTS"]["timezone"] = "Europe/Berlin"
+        assert make_meetup(settings).event_plugin_data["dtstart"] == datetime(
+            2025, 9, 18, 18, 0, tzinfo=ZoneInfo("Europe/Berlin")
+        )
+        article_event_cache.clear()
+        clear_events()
+
+    def test_property_map(self, monkeypatch, make_settings, make_meetup) -> None:
+        """Tests that the filtered event- properties are cached with the event data and used for the VEVENT."""
+        settings = make_settings()
+        filtered = []
+        original = plugin_module.event_property_map
+
+        def counting_map(metadata):
+            filtered.append(metadata.get("event-location"))
+            return original(metadata)
+
+        monkeypatch.setattr(plugin_module, "event_property_map", counting_map)
+        article_event_cache.clear()
+        make_meetup(settings, **{"event-location": "Hall A", "event-method": "x"})
+        article = make_meetup(
+            settings, **{"event-location": "Hall A", "event-method": "x"}
+        )
+        assert filtered == ["Hall A"]
+        assert article.event_properties == (
+            ("location", "Hall A"),
+            (
+                "comment",
+                "\n".join(
+                    [
+                        "*** errors occurred in processing event ***",
+                        "property 'method' disallowed, ref: [RFC5545, Section 3.7.2]",
+                    ]
+                ),
+            ),
+        )
+        vevent = build_ical_event(article, settings, datetime(2025, 10, 1, tzinfo=TZ))
+        assert vevent["LOCATION"] == "Hall A"
+        assert filtered == ["Hall A"]
+
+        # a changed event- field which isn't an event time is filtered again
+        changed = make_meetup(settings, **{"event-location": "Hall B"})
+        assert filtered == ["Hall A", "Hall B"]
+        assert changed.event_properties == (("location", "Hall B"),)
+        article_event_cache.clear()
+        clear_events()
+
+    def test_dtstamp(self, monkeypatch, make_settings, make_meetup) -> None:
+        """Tests that the article's date is parsed with its event times and cached as the VEVENT's DTSTAMP."""
+        settings = make_settings()
+        stamped = []
+        original = plugin_module.parse_tstamp
+
+        def counting_tstamp(metadata, field_name, tz):
+            if field_name == "date":
+                stamped.append(field_name)
+            return original(metadata, field_name, tz)
+
+        monkeypatch.setattr(plugin_module, "parse_tstamp", counting_tstamp)
+        article_event_cache.clear()
+        make_meetup(settings)
+        article = make_meetup(settings)
+        assert stamped == ["date"]
+        vevent = build_ical_event(article, settings, datetime(2025, 10, 1, tzinfo=TZ))
+        assert vevent["DTSTAMP"].dt == datetime(2025, 9, 1, 12, 0, tzinfo=TZ)
+        assert stamped == ["date"]
+
+        # a changed date is parsed again
+        changed = make_meetup(settings, date=datetime(2025, 9, 2, 12, 0))
+        assert stamped == ["date", "date"]
+        assert changed.event_plugin_data["dtstamp"] == datetime(
+            2025, 9, 2, 12, 0, tzinfo=TZ
+        )
+        article_event_cache.clear()
+        clear_events()
+
+    def test_prune(self, make_settings, make_article) -> None:
+        """Tests that articles which a build pass didn't see are dropped from the cache at its end."""
+        settings = make_settings()
+        article_event_cache.clear()
+        start_event_collection(settings)
+        make_article(settings, source_path="/content/kept.md")
+        make_article(settings, source_path="/content/deleted.md")
+        generate_localized_events(SimpleNamespace(settings=settings))
+        assert set(article_event_cache) == {"/content/kept.md", "/content/deleted.md"}
+
+        start_event_collection(settings)
+        make_article(settings, source_path="/content/kept.md")
+        generate_localized_events(SimpleNamespace(settings=settings))
+        assert set(article_event_cache) == {"/content/kept.md"}
+        article_event_cache.clear()
+        clear_events()
+
+    def test_add_cached_articles(self, make_settings, make_meetup) -> None:
+        """Tests that event articles which didn't go through parse_article() are added once."""
+        settings = make_settings()
+        article = make_meetup(settings, parse=False)
+        clear_events()
+        generator = SimpleNamespace(settings=settings, articles=[article])
+        add_cached_articles(generator)
+        add_cached_articles(generator)
+        assert snapshot_events() == [article]
+        article_event_cache.clear()
+        clear_events()
+
+    def test_parse_tstamp_datetime(self) -> None:
+        """Tests that Pelican's SafeDatetime metadata becomes a plain datetime in the site time zone."""
+        dtstamp = parse_tstamp({"date": SafeDatetime(2025, 9, 1, 12, 0)}, "date", TZ)
+        assert type(dtstamp) is datetime
+        assert dtstamp == datetime(2025, 9, 1, 12, 0, tzinfo=TZ)
@@ -3,17 +3,85 @@
 
 # from typing import ClassVar
 
-from datetime import datetime
+from datetime import date, datetime
+import json
+import time
 from zoneinfo import ZoneInfo
 
+from dateutil import rrule
 import pytest
 
 from pelican.plugins.pelican_events import (
     UnknownTimeMultiplier,
+    UnsupportedDataFile,
     clear_events,
+    event_uid,
+    expand_rrule,
     insert_recurring_events,
+    iter_data_rows,
+    load_recurring_events_file,
+    parse_date_list,
+    pelican_events as plugin_module,
     snapshot_events,
+    start_event_collection,
+    validate_recurring_events,
 )
+from pelican.plugins.pelican_events.pelican_events import (
+    RecurringEvent,
+    recurrence_cache,
+    recurring_file_cache,
+    rrule_cache,
+    skip_list_cache,
+)
+from pelican.tests.support import get_settings
+
+# settings for horizon-based expansion of a weekly event
+HORIZON_SETTINGS = {
+    "PLUGIN_EVENTS": {
+        "test_timestamp": "2025-10-04 11:00:00",
+        "ics_fname": "calendar.ics",
+        "recurrence_horizon": "4w",
+        "recurring_events": [
+            {
+                "title": "Weekly event",
+                "summary": "Something that happens weekly",
+                "page_url": "weekly_event_info.html",
+                "location": "a local meeting spot",
+                "recurring_rule": "Every Thursday at 6pm",
+                "event-duration": "2h",
+            }
+        ],
+    },
+    "TIMEZONE": "US/Pacific",
+    "SITEURL": "https://example.org/",
+}
+
+# recurring event definitions in each supported file format
+WEEKLY_ROW = HORIZON_SETTINGS["PLUGIN_EVENTS"]["recurring_events"][0]
+MONTHLY_ROW = {
+    **WEEKLY_ROW,
+    "title": "Monthly event",
+    "recurring_rule": "Every month on the 1st at 7pm",
+    "event-geo": "45.53371;-122.69174",
+}
+RECURRING_FILES = {
+    "events.csv": (
+        "title,summary,page_url,location,recurring_rule,event-duration,event-geo\n"
+        + "".join(
+            ",".join(f'"{row.get(key, "")}"' for key in MONTHLY_ROW) + "\n"
+            for row in (WEEKLY_ROW, MONTHLY_ROW)
+        )
+    ),
+    "events.jsonl": "".join(
+        json.dumps(row) + "\n" for row in (WEEKLY_ROW, MONTHLY_ROW)
+    ),
+    "events.json": json.dumps([WEEKLY_ROW, MONTHLY_ROW]),
+    "events.toml": "".join(
+        "[[recurring_events]]\n"
+        + "".join(f'"{key}" = "{value}"\n' for key, value in row.items())
+        for row in (WEEKLY_ROW, MONTHLY_ROW)
+    ),
+}
 
 
 class TestRecurrence:
@@ -118,3 +186,367 @@ class TestRecurrence:
         clear_events()
         with pytest.raises(exception):
             insert_recurring_events(in_settings)
+
+    #
+    # tests for recurrence expansion with recurrence_horizon
+    #
+
+    def test_expand_rrule(self) -> None:
+        """Tests for expand_rrule() limits by end time, count and deadline."""
+        rr = rrule.rrule(rrule.DAILY, dtstart=datetime(2025, 10, 1, 9, 0))
+        after = datetime(2025, 10, 1)
+        before = datetime(2025, 10, 10)
+        deadline = time.monotonic() + 60
+        occurrences, truncated = expand_rrule(rr, after, before, 100, deadline)
+        assert len(occurrences) == 9  # noqa: PLR2004
+        assert not truncated
+        occurrences, truncated = expand_rrule(rr, after, before, 3, deadline)
+        assert occurrences == [datetime(2025, 10, d, 9, 0) for d in (1, 2, 3)]
+        assert not truncated
+        occurrences, truncated = expand_rrule(rr, after, before, 100, 0.0)
+        assert occurrences == [datetime(2025, 10, 1, 9, 0)]
+        assert truncated
+
+    @pytest.mark.filterwarnings(
+        "ignore:.*Flag style will be deprecated in parsedatetime 2.*:"
+    )
+    def test_recurrence_horizon(self) -> None:
+        """Tests that recurrence_horizon expands occurrences with distinct UIDs and caches them per anchor day."""
+        recurrence_cache.clear()
+        clear_events()
+        insert_recurring_events(HORIZON_SETTINGS)
+        gen_events = snapshot_events()
+        site_tz = ZoneInfo("US/Pacific")
+        assert [ev.event_plugin_data["dtstart"] for ev in gen_events] == [
+            datetime(2025, 10, day, 18, 0, tzinfo=site_tz) for day in (9, 16, 23, 30)
+        ]
+        uids = [event_uid(ev, HORIZON_SETTINGS) for ev in gen_events]
+        assert (
+            uids[0]
+            == "20251009T180000-https://example.org/pages/weekly_event_info.html"
+        )
+        assert len(set(uids)) == len(uids)
+        assert len(recurrence_cache) == 1
+
+        # cached occurrences are reused for the rest of the anchor day
+        cache_key = next(iter(recurrence_cache))
+        recurrence_cache[cache_key] = recurrence_cache[cache_key][:2]
+        clear_events()
+        insert_recurring_events(HORIZON_SETTINGS)
+        assert len(snapshot_events()) == 2  # noqa: PLR2004
+
+        # occurrences cached for another time zone aren't used
+        clear_events()
+        insert_recurring_events({**HORIZON_SETTINGS, "TIMEZONE": "Europe/Berlin"})
+        berlin_tz = ZoneInfo("Europe/Berlin")
+        assert [ev.event_plugin_data["dtstart"] for ev in snapshot_events()] == [
+            datetime(2025, 10, day, 18, 0, tzinfo=berlin_tz) for day in (9, 16, 23, 30)
+        ]
+        assert len(recurrence_cache) == 2  # noqa: PLR2004
+        recurrence_cache.clear()
+        clear_events()
+
+    @pytest.mark.filterwarnings(
+        "ignore:.*Flag style will be deprecated in parsedatetime 2.*:"
+    )
+    @pytest.mark.parametrize(
+        ("recurring_rule", "expected"),
+        [
+            ("Every day", datetime(2025, 10, 5, 0, 0)),
+            ("Every Thursday at 6pm", datetime(2025, 10, 9, 18, 0)),
+        ],
+    )
+    def test_rule_anchor(self, recurring_rule: str, expected: datetime) -> None:
+        """Tests that rules without a start date are anchored at midnight of the build day, not its time."""
+        plugin_events = {
+            **HORIZON_SETTINGS["PLUGIN_EVENTS"],
+            "test_timestamp": "2025-10-04 11:23:45",
+            "recurring_events": [{**WEEKLY_ROW, "recurring_rule": recurring_rule}],
+        }
+        del plugin_events["recurrence_horizon"]
+        clear_events()
+        insert_recurring_events({**HORIZON_SETTINGS, "PLUGIN_EVENTS": plugin_events})
+        assert [ev.event_plugin_data["dtstart"] for ev in snapshot_events()] == [
+            expected.replace(tzinfo=ZoneInfo("US/Pacific"))
+        ]
+        clear_events()
+
+    #
+    # tests for recurring_events_file
+    #
+
+    @pytest.mark.parametrize("fname", sorted(RECURRING_FILES))
+    def test_iter_data_rows(self, tmp_path, fname: str) -> None:
+        """Tests that iter_data_rows() reads the same rows from each file format."""
+        path = tmp_path / fname
+        path.write_text(RECURRING_FILES[fname], encoding="utf-8")
+        rows = [row for _, row in iter_data_rows(str(path), "recurring_events")]
+        assert rows == [WEEKLY_ROW, MONTHLY_ROW]
+
+    def test_iter_data_rows_unsupported(self, tmp_path) -> None:
+        """Tests that an unknown file extension is rejected."""
+        path = tmp_path / "events.yaml"
+        path.write_text("", encoding="utf-8")
+        with pytest.raises(UnsupportedDataFile):
+            list(iter_data_rows(str(path), "recurring_events"))
+
+    @pytest.mark.filterwarnings(
+        "ignore:.*Flag style will be deprecated in parsedatetime 2.*:"
+    )
+    def test_recurring_events_file(self, tmp_path, monkeypatch, caplog) -> None:
+        """Tests that invalid rows are skipped and only edited rows are validated again."""
+        rows = [
+            WEEKLY_ROW,
+            {**WEEKLY_ROW, "title": "Bad duration", "event-duration": "2x"},
+            {**WEEKLY_ROW, "title": "Bad field", "event-dtstart": "2025-10-01"},
+            "not an object",
+        ]
+        path = tmp_path / "events.jsonl"
+        path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+        settings = get_settings(
+            PLUGIN_EVENTS={
+                **HORIZON_SETTINGS["PLUGIN_EVENTS"],
+                "recurring_events": [],
+                "recurring_events_file": "events.jsonl",
+            },
+            TIMEZONE="US/Pacific",
+            PATH=str(tmp_path),
+            CACHE_PATH=str(tmp_path / "cache"),
+            CACHE_CONTENT=True,
+            LOAD_CONTENT_CACHE=True,
+        )
+        validated = []
+        original = plugin_module.recurring_event_errors
+
+        def counting_errors(event):
+            validated.append(event)
+            return original(event)
+
+        monkeypatch.setattr(plugin_module, "recurring_event_errors", counting_errors)
+        recurring_file_cache.clear()
+        assert load_recurring_events_file(settings) == [WEEKLY_ROW]
+        assert len(validated) == len(rows)
+        assert "events.jsonl:2: skipped recurring event" in caplog.text
+
+        errors = validate_recurring_events(settings)
+        assert [line for _, line, _ in errors] == [2, 3, 4]
+
+        # an edited row is validated again, the others come from the cache kept in CACHE_PATH
+        recurring_file_cache.clear()
+        validated.clear()
+        rows[1] = {**rows[1], "event-duration": "2h"}
+        path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+        assert load_recurring_events_file(settings) == [WEEKLY_ROW, rows[1]]
+        assert validated == [rows[1]]
+
+        recurrence_cache.clear()
+        clear_events()
+        insert_recurring_events(settings)
+        assert {ev.metadata["title"] for ev in snapshot_events()} == {
+            "Weekly event",
+            "Bad duration",
+        }
+        recurrence_cache.clear()
+        recurring_file_cache.clear()
+        clear_events()
+
+    @pytest.mark.filterwarnings(
+        "ignore:.*Flag style will be deprecated in parsedatetime 2.*:"
+    )
+    def test_rule_cache(self, tmp_path, monkeypatch) -> None:
+        """Tests that the rules of unchanged rows are compiled once per anchor day."""
+        rows = [WEEKLY_ROW, MONTHLY_ROW]
+        path = tmp_path / "events.jsonl"
+        path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+        plugin_events = {
+            **HORIZON_SETTINGS["PLUGIN_EVENTS"],
+            "recurring_events": [],
+            "recurring_events_file": "events.jsonl",
+        }
+        del plugin_events["recurrence_horizon"]
+        settings = get_settings(
+            PLUGIN_EVENTS=plugin_events, TIMEZONE="US/Pacific", PATH=str(tmp_path)
+        )
+        parsed = []
+
+        class CountingRecurringEvent(RecurringEvent):
+            def parse(self, s):
+                parsed.append(s)
+                return super().parse(s)
+
+        monkeypatch.setattr(plugin_module, "RecurringEvent", CountingRecurringEvent)
+        recurring_file_cache.clear()
+        rrule_cache.clear()
+        clear_events()
+        insert_recurring_events(settings)
+        first = snapshot_events()
+        assert len(first) == len(rows)
+
+        # a later build on the same day compiles no rule
+        parsed.clear()
+        clear_events()
+        insert_recurring_events(settings)
+        assert parsed == []
+        assert [ev.event_plugin_data for ev in snapshot_events()] == [
+            ev.event_plugin_data for ev in first
+        ]
+
+        # an edited row is validated and compiled again
+        rows[1] = {**MONTHLY_ROW, "recurring_rule": "Every Friday at 7pm"}
+        path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+        clear_events()
+        insert_recurring_events(settings)
+        assert parsed == ["Every Friday at 7pm", "Every Friday at 7pm"]
+
+        # the next day, rules are anchored again
+        parsed.clear()
+        clear_events()
+        plugin_events["test_timestamp"] = "2025-10-05 11:00:00"
+        insert_recurring_events(settings)
+        assert sorted(parsed) == ["Every Friday at 7pm", WEEKLY_ROW["recurring_rule"]]
+        recurring_file_cache.clear()
+        rrule_cache.clear()
+        clear_events()
+
+    #
+    # tests for exdates and skip lists
+    #
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("2025-12-25, 2026-01-01", [date(2025, 12, 25), date(2026, 1, 1)]),
+            (
+                ["2025-12-24..2025-12-26"],
+                [date(2025, 12, 24), date(2025, 12, 25), date(2025, 12, 26)],
+            ),
+            ([date(2025, 7, 4), "2025-11-27"], [date(2025, 7, 4), date(2025, 11, 27)]),
+            ("", []),
+        ],
+    )
+    def test_parse_date_list(self, value, expected: list[date]) -> None:
+        """Tests for parse_date_list()."""
+        assert parse_date_list(value) == {day.toordinal() for day in expected}
+
+    @pytest.mark.filterwarnings(
+        "ignore:.*Flag style will be deprecated in parsedatetime 2.*:"
+    )
+    def test_exclusions(self, tmp_path) -> None:
+        """Tests that occurrences on exdates and days of skip list files are left out."""
+        (tmp_path / "holidays.txt").write_text("# local holidays\n2025-10-23\n\n")
+        (tmp_path / "closed.ics").write_text(
+            "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//test//EN\r\n"
+            "BEGIN:VEVENT\r\nUID:closed@example.org\r\nDTSTAMP:20250901T000000Z\r\n"
+            "DTSTART;VALUE=DATE:20251029\r\nDTEND;VALUE=DATE:20251031\r\n"
+            "SUMMARY:Closed\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n"
+        )
+        settings = get_settings(
+            PLUGIN_EVENTS={
+                **HORIZON_SETTINGS["PLUGIN_EVENTS"],
+                "recurring_events": [
+                    {
+                        **WEEKLY_ROW,
+                        "exdates": "2025-10-16",
+                        "skip_lists": "holidays, closed",
+                    }
+                ],
+                "skip_lists": {"holidays": "holidays.txt", "closed": "closed.ics"},
+            },
+            TIMEZONE="US/Pacific",
+            PATH=str(tmp_path),
+        )
+        site_tz = ZoneInfo("US/Pacific")
+        recurrence_cache.clear()
+        skip_list_cache.clear()
+        clear_events()
+        insert_recurring_events(settings)
+        assert [ev.event_plugin_data["dtstart"] for ev in snapshot_events()] == [
+            datetime(2025, 10, 9, 18, 0, tzinfo=site_tz)
+        ]
+        assert validate_recurring_events(settings) == []
+
+        # without a horizon, the next occurrence which isn't excluded
+        del settings["PLUGIN_EVENTS"]["recurrence_horizon"]
+        settings["PLUGIN_EVENTS"]["recurring_events"][0]["exdates"] = [
+            "2025-10-09",
+            "2025-10-16",
+        ]
+        clear_events()
+        insert_recurring_events(settings)
+        assert [ev.event_plugin_data["dtstart"] for ev in snapshot_events()] == [
+            datetime(2025, 11, 6, 18, 0, tzinfo=site_tz)
+        ]
+
+        settings["PLUGIN_EVENTS"]["recurring_events"][0]["skip_lists"] = ["missing"]
+        settings["PLUGIN_EVENTS"]["recurring_events"][0]["exdates"] = "2025-13-01"
+        assert [message for _, _, message in validate_recurring_events(settings)] == [
+            "invalid exdates: month must be in 1..12",
+            "unknown skip list 'missing'",
+        ]
+        recurrence_cache.clear()
+        skip_list_cache.clear()
+        clear_events()
+
+    @pytest.mark.filterwarnings(
+        "ignore:.*Flag style will be deprecated in parsedatetime 2.*:"
+    )
+    def test_build_passes(self, monkeypatch) -> None:
+        """Tests that another pass of a build, as with i18n_subsites, reuses copies of the generated events."""
+        settings = {
+            **HORIZON_SETTINGS,
+            "PLUGIN_EVENTS": {
+                **HORIZON_SETTINGS["PLUGIN_EVENTS"],
+                "recurrence_horizon": None,
+            },
+        }
+        parsed = []
+        original = plugin_module.parse_recurring_rule
+
+        def counting_parse(recurring_rule, timestamp):
+            parsed.append(recurring_rule)
+            return original(recurring_rule, timestamp)
+
+        monkeypatch.setattr(plugin_module, "parse_recurring_rule", counting_parse)
+        clear_events()
+        start_event_collection(settings)
+        first = snapshot_events()
+        start_event_collection({**settings, "DEFAULT_LANG": "de"})
+        second = snapshot_events()
+        assert len(parsed) == 1
+        assert second == first
+        assert second[0] is not first[0]
+        assert second[0].event_plugin_data is not first[0].event_plugin_data
+
+        # a changed definition or a later day is computed again
+        settings["PLUGIN_EVENTS"]["recurring_events"] = [
+            {**WEEKLY_ROW, "event-duration": "3h"}
+        ]
+        start_event_collection(settings)
+        settings["PLUGIN_EVENTS"]["test_timestamp"] = "2025-10-09 20:00:00"
+        start_event_collection(settings)
+        assert len(parsed) == 3  # noqa: PLR2004
+        assert snapshot_events()[0].event_plugin_data["dtstart"] == datetime(
+            2025, 10, 16, 18, 0, tzinfo=ZoneInfo("US/Pacific")
+        )
+        clear_events()
+
+    def test_build_passes_plugin_timezone(self) -> None:
+        """Tests that generated events are computed again when PLUGIN_EVENTS["timezone"] changes without TIMEZONE."""
+        settings = {
+            "PLUGIN_EVENTS": {
+                **HORIZON_SETTINGS["PLUGIN_EVENTS"],
+                "timezone": "US/Pacific",
+            },
+            "SITEURL": "https://example.org/",
+        }
+        clear_events()
+        start_event_collection(settings)
+        assert snapshot_events()[0].event_plugin_data["dtstart"].tzinfo == ZoneInfo(
+            "US/Pacific"
+        )
+        settings["PLUGIN_EVENTS"]["timezone"] = "Europe/Berlin"
+        start_event_collection(settings)
+        assert snapshot_events()[0].event_plugin_data["dtstart"].tzinfo == ZoneInfo(
+            "Europe/Berlin"
+        )
+        clear_events()
@@ -0,0 +1,201 @@
+"""test_310_merge_ics.py - unit tests for merging external iCalendar files into the generated calendar."""
+# by Ian Kluft
+
+from datetime import UTC, datetime
+import os
+from zoneinfo import ZoneInfo
+
+import icalendar
+import pytest
+
+from pelican.plugins.pelican_events import (
+    filter_ics_event,
+    iter_ics_components,
+    iter_merged_ics_entries,
+    load_merged_ics,
+    merged_ics_cache,
+)
+import pelican.plugins.pelican_events.pelican_events as pelican_events_module
+
+# constants
+MOCK_TZ = "US/Pacific"
+PARTNER_EVENT_COUNT = 3  # number of VEVENTs in PARTNER_ICS
+PARTNER_ICS = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//Partner//Events//EN\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:past@partner.example.org\r\n"
+    "DTSTART;TZID=America/Los_Angeles:20250801T180000\r\n"
+    "DTEND;TZID=America/Los_Angeles:20250801T200000\r\n"
+    "SUMMARY:Past partner event\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:future@partner.example.org\r\n"
+    "DTSTART;TZID=America/Los_Angeles:20251001T180000\r\n"
+    "DTEND;TZID=America/Los_Angeles:20251001T200000\r\n"
+    "SUMMARY:Future partner event with a long summary which is folded across\r\n"
+    "  lines\r\n"
+    "ORGANIZER:mailto:boss@partner.example.org\r\n"
+    "LOCATION:Partner HQ\r\n"
+    "BEGIN:VALARM\r\n"
+    "ACTION:DISPLAY\r\n"
+    "TRIGGER:-PT15M\r\n"
+    "END:VALARM\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "DTSTART;VALUE=DATE:20251002\r\n"
+    "SUMMARY:All-day partner event without UID\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+RECURRING_ICS = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:weekly@partner.example.org\r\n"
+    "DTSTART;TZID=Europe/Berlin:20251020T190000\r\n"
+    "DTEND;TZID=Europe/Berlin:20251020T210000\r\n"
+    "RRULE:FREQ=WEEKLY;COUNT=4\r\n"
+    "EXDATE;TZID=Europe/Berlin:20251103T190000\r\n"
+    "SUMMARY:Weekly partner meetup\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:weekly@partner.example.org\r\n"
+    "RECURRENCE-ID;TZID=Europe/Berlin:20251027T190000\r\n"
+    "DTSTART;TZID=Europe/Berlin:20251027T200000\r\n"
+    "DTEND;TZID=Europe/Berlin:20251027T220000\r\n"
+    "SUMMARY:Weekly partner meetup, moved\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:custom-tz@partner.example.org\r\n"
+    "DTSTART;TZID=Partner Standard Time:20251025T100000\r\n"
+    "SUMMARY:Event in an unknown time zone\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+
+@pytest.fixture
+def partner_settings(tmp_path) -> dict:
+    """Create settings with one partner .ics file to merge, relative to the content path."""
+    (tmp_path / "partner.ics").write_text(PARTNER_ICS, encoding="utf-8", newline="")
+    merged_ics_cache.clear()
+    return {
+        "PATH": str(tmp_path),
+        "PLUGIN_EVENTS": {"merge_ics": ["partner.ics"]},
+        "TIMEZONE": MOCK_TZ,
+    }
+
+
+class TestMergeIcs:
+    """Tests for merging VEVENTs from external iCalendar files."""
+
+    def test_iter_ics_components(self) -> None:
+        """Tests for iter_ics_components() splitting VEVENTs including nested components."""
+        components = list(iter_ics_components(PARTNER_ICS.splitlines(keepends=True)))
+        assert len(components) == PARTNER_EVENT_COUNT
+        assert all(c.startswith("BEGIN:VEVENT\r\n") for c in components)
+        assert all(c.endswith("END:VEVENT\r\n") for c in components)
+        assert "BEGIN:VALARM" in components[1]
+
+    def test_filter_ics_event(self) -> None:
+        """Tests for filter_ics_event() applying the property allow-list."""
+        component = icalendar.Event.from_ical(
+            list(iter_ics_components(PARTNER_ICS.splitlines(keepends=True)))[1]
+        )
+        filtered = filter_ics_event(component, "partner.ics")
+        assert "ORGANIZER" not in filtered
+        assert filtered["LOCATION"] == "Partner HQ"
+        assert filtered["UID"] == "future@partner.example.org"
+        assert "DTSTART" in filtered
+        assert filtered.subcomponents == []
+
+    def test_load_merged_ics(self, partner_settings: dict) -> None:
+        """Tests for load_merged_ics() returning start times and filtered events."""
+        merged = load_merged_ics(partner_settings)
+        assert [dtstart for dtstart, _ in merged] == [
+            datetime(2025, 8, 1, 18, 0, tzinfo=ZoneInfo("America/Los_Angeles")),
+            datetime(2025, 10, 1, 18, 0, tzinfo=ZoneInfo("America/Los_Angeles")),
+            datetime(2025, 10, 2, 0, 0, tzinfo=ZoneInfo(MOCK_TZ)),
+        ]
+        assert merged[2][1]["UID"].endswith("@partner.ics")
+
+    def test_load_merged_ics_cache(self, partner_settings: dict, monkeypatch) -> None:
+        """Tests that load_merged_ics() parses unchanged files only once."""
+        calls = []
+        parse_ics_file = pelican_events_module.parse_ics_file
+
+        def counting_parse(path, tz):
+            calls.append(path)
+            return parse_ics_file(path, tz)
+
+        monkeypatch.setattr(pelican_events_module, "parse_ics_file", counting_parse)
+        first = load_merged_ics(partner_settings)
+        second = load_merged_ics(partner_settings)
+        assert len(calls) == 1
+        assert second == first
+        ics_path = calls[0]
+
+        # touching the file without changing it is detected by its hash
+        stat = os.stat(ics_path)
+        os.utime(ics_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        load_merged_ics(partner_settings)
+        assert calls == [ics_path]
+
+        # changed content is parsed again
+        with open(ics_path, "a", encoding="utf-8", newline="") as f:
+            f.write("\r\n")
+        load_merged_ics(partner_settings)
+        assert calls == [ics_path, ics_path]
+
+    def test_merged_recurring_events(self, tmp_path) -> None:
+        """Tests imported events are written in UTC and RRULEs are expanded with EXDATE and RECURRENCE-ID."""
+        (tmp_path / "recurring.ics").write_text(
+            RECURRING_ICS, encoding="utf-8", newline=""
+        )
+        merged_ics_cache.clear()
+        settings = {
+            "PATH": str(tmp_path),
+            "PLUGIN_EVENTS": {
+                "merge_ics": ["recurring.ics"],
+                "recurrence_horizon": "60d",
+            },
+            "TIMEZONE": MOCK_TZ,
+        }
+        timestamp = datetime(2025, 10, 1, tzinfo=ZoneInfo(MOCK_TZ))
+        entries = {
+            entry["uid"]: entry["component"]
+            for entry in iter_merged_ics_entries(settings, timestamp)
+        }
+        assert sorted(entries) == [
+            "custom-tz@partner.example.org",
+            "weekly@partner.example.org-20251020T170000Z",
+            "weekly@partner.example.org-20251027T180000Z",
+            "weekly@partner.example.org-20251110T180000Z",
+        ]
+
+        # the DST change between the first two weeks keeps the time of day in Berlin
+        first = entries["weekly@partner.example.org-20251020T170000Z"]
+        assert first["DTSTART"].dt == datetime(2025, 10, 20, 17, 0, tzinfo=UTC)
+        assert first["DTEND"].dt == datetime(2025, 10, 20, 19, 0, tzinfo=UTC)
+        assert "RRULE" not in first
+        last = entries["weekly@partner.example.org-20251110T180000Z"]
+        assert last["DTEND"].dt == datetime(2025, 11, 10, 20, 0, tzinfo=UTC)
+
+        # the moved occurrence replaces the rule's one
+        moved = entries["weekly@partner.example.org-20251027T180000Z"]
+        assert moved["SUMMARY"] == "Weekly partner meetup, moved"
+        assert moved["DTSTART"].dt == datetime(2025, 10, 27, 19, 0, tzinfo=UTC)
+        assert "RECURRENCE-ID" not in moved
+
+        # no TZID without a VTIMEZONE is written
+        custom = entries["custom-tz@partner.example.org"]
+        assert custom["DTSTART"].dt == datetime(2025, 10, 25, 17, 0, tzinfo=UTC)
+        assert all(b"TZID" not in entry.to_ical() for entry in entries.values())
+
+        # without a horizon, only the next occurrence
+        del settings["PLUGIN_EVENTS"]["recurrence_horizon"]
+        uids = [entry["uid"] for entry in iter_merged_ics_entries(settings, timestamp)]
+        assert "weekly@partner.example.org-20251020T170000Z" in uids
+        assert "weekly@partner.example.org-20251110T180000Z" not in uids
@@ -0,0 +1,192 @@
+"""test_320_uid_index.py - unit tests for UID duplicate detection and translation merging."""
+# by Ian Kluft
+
+from datetime import datetime
+from typing import Any, ClassVar
+from zoneinfo import ZoneInfo
+
+import icalendar
+import pytest
+
+from pelican.contents import Article
+from pelican.plugins.pelican_events import (
+    DuplicateUIDError,
+    UnknownPolicy,
+    build_ical_event,
+    event_uid,
+    index_event_uids,
+    resolve_duplicate_uids,
+    uid_index_entry,
+)
+from pelican.tests.support import get_settings
+
+# constants
+MOCK_TZ = "US/Pacific"
+MOCK_TIMESTAMP = datetime(2025, 9, 1, 0, 0, tzinfo=ZoneInfo(MOCK_TZ))
+
+
+def make_entries(articles: list[Article]) -> list[dict[str, Any]]:
+    """Build UID index entries for event articles, as generate_ical_file() does."""
+    return [
+        uid_index_entry(
+            article,
+            build_ical_event(article, article.settings, MOCK_TIMESTAMP),
+            article.settings,
+        )
+        for article in articles
+    ]
+
+
+class TestUidIndex:
+    """Test class for the UID index and duplicate_uids policies."""
+
+    duplicate_metadata: ClassVar[list[dict[str, Any]]] = [
+        {
+            "title": "first copy",
+            "summary": "first copy",
+            "slug": "meetup",
+            "date": datetime(2025, 9, 1, 12, 0),
+        },
+        {
+            "title": "second copy",
+            "summary": "second copy",
+            "slug": "meetup",
+            "date": datetime(2025, 9, 5, 12, 0),
+        },
+        {
+            "title": "other event",
+            "summary": "other event",
+            "slug": "other",
+            "date": datetime(2025, 9, 2, 12, 0),
+        },
+    ]
+
+    def test_event_uid(self, make_settings, make_article) -> None:
+        """Tests for event_uid() using the event-uid field or the article URL."""
+        article = make_article(
+            make_settings(duplicate_uids="warn"), title="t", summary="t", slug="meetup"
+        )
+        assert event_uid(article, article.settings) == "https://example.org/meetup.html"
+        article = make_article(
+            make_settings(duplicate_uids="warn"),
+            title="t",
+            summary="t",
+            slug="meetup",
+            **{"event-uid": "abc@example.org"},
+        )
+        assert event_uid(article, article.settings) == "abc@example.org"
+        vevent = build_ical_event(article, article.settings, MOCK_TIMESTAMP)
+        assert vevent["UID"] == "abc@example.org"
+
+    def test_index_event_uids(self, make_settings, make_article) -> None:
+        """Tests for index_event_uids() grouping entries by UID."""
+        entries = make_entries(
+            [
+                make_article(make_settings(duplicate_uids="warn"), **m)
+                for m in self.duplicate_metadata
+            ]
+        )
+        index = index_event_uids(entries)
+        assert [len(group) for group in index.values()] == [2, 1]
+
+    def test_policy_warn(self, caplog, make_settings, make_article) -> None:
+        """Tests for the default 'warn' policy which reports duplicates but keeps them."""
+        entries = make_entries(
+            [
+                make_article(make_settings(duplicate_uids="warn"), **m)
+                for m in self.duplicate_metadata
+            ]
+        )
+        resolved = resolve_duplicate_uids(
+            entries, get_settings(PLUGIN_EVENTS={"duplicate_uids": "warn"})
+        )
+        assert resolved == entries
+        assert (
+            "duplicate iCalendar UID 'https://example.org/meetup.html'" in caplog.text
+        )
+
+    def test_policy_error(self, make_settings, make_article) -> None:
+        """Tests for the 'error' policy."""
+        articles = [
+            make_article(make_settings(duplicate_uids="error"), **m)
+            for m in self.duplicate_metadata
+        ]
+        with pytest.raises(DuplicateUIDError):
+            resolve_duplicate_uids(make_entries(articles), articles[0].settings)
+
+    def test_policy_newest(self, make_settings, make_article) -> None:
+        """Tests for the 'newest' policy which keeps the event with the latest DTSTAMP."""
+        articles = [
+            make_article(make_settings(duplicate_uids="newest"), **m)
+            for m in self.duplicate_metadata
+        ]
+        resolved = resolve_duplicate_uids(make_entries(articles), articles[0].settings)
+        assert [str(entry["component"]["SUMMARY"]) for entry in resolved] == [
+            "second copy",
+            "other event",
+        ]
+
+    def test_policy_merge(self, make_settings, make_article) -> None:
+        """Tests for the 'merge' policy which combines translations into one VEVENT."""
+        english = make_article(
+            make_settings(duplicate_uids="merge"),
+            title="Meetup",
+            slug="meetup",
+            lang="en",
+            summary="Meetup",
+        )
+        german = make_article(
+            make_settings(duplicate_uids="merge"),
+            title="Treffen",
+            slug="meetup",
+            lang="de",
+            summary="Treffen",
+        )
+        german.translations = [english]
+        english.translations = [german]
+        resolved = resolve_duplicate_uids(
+            make_entries([german, english]), english.settings
+        )
+        assert len(resolved) == 1
+        vevent = resolved[0]["component"]
+        assert vevent["UID"] == "https://example.org/meetup.html"
+        assert vevent["SUMMARY"].params["LANGUAGE"] == "en"
+        assert vevent["DESCRIPTION"].params["LANGUAGE"] == "en"
+        assert vevent["X-ALT-DESC"].params["LANGUAGE"] == "de"
+        assert str(vevent["X-ALT-DESC"]).startswith("Treffen")
+        assert vevent.to_ical().count(b"\r\nDESCRIPTION") == 1
+
+    def test_newest_without_dtstamp(self) -> None:
+        """Tests the 'newest' policy with imported events which have LAST-MODIFIED or no time stamp."""
+        settings = get_settings(PLUGIN_EVENTS={"duplicate_uids": "newest"})
+        entries = []
+        for summary, last_modified in [
+            ("no stamp", None),
+            ("modified", datetime(2025, 9, 3, 12, 0, tzinfo=ZoneInfo("UTC"))),
+            ("modified earlier", datetime(2025, 9, 2, 12, 0)),
+        ]:
+            component = icalendar.Event()
+            component.add("uid", "partner@example.org")
+            component.add("summary", summary)
+            if last_modified is not None:
+                component.add("last-modified", last_modified)
+            entries.append(
+                {
+                    "uid": "partner@example.org",
+                    "lang": None,
+                    "source": "merge_ics",
+                    "component": component,
+                    "geo": None,
+                }
+            )
+        resolved = resolve_duplicate_uids(entries, settings)
+        assert [str(entry["component"]["SUMMARY"]) for entry in resolved] == [
+            "modified"
+        ]
+        resolved = resolve_duplicate_uids(entries[:1] * 2, settings)
+        assert resolved == entries[:1]
+
+    def test_unknown_policy(self) -> None:
+        """Tests for an unrecognized duplicate_uids policy."""
+        with pytest.raises(UnknownPolicy):
+            resolve_duplicate_uids([], {"PLUGIN_EVENTS": {"duplicate_uids": "ignore"}})
@@ -0,0 +1,111 @@
+"""test_330_delta.py - unit tests for delta feeds and SEQUENCE/LAST-MODIFIED maintenance."""
+# by Ian Kluft
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import icalendar
+import pytest
+
+from pelican.plugins.pelican_events import (
+    CalendarBuilder,
+    apply_delta_state,
+    event_fingerprint,
+    save_delta_state,
+)
+from pelican.tests.support import get_settings
+
+# constants
+MOCK_TZ = "US/Pacific"
+FIRST_BUILD = datetime(2025, 9, 1, 12, 0, tzinfo=ZoneInfo(MOCK_TZ))
+SECOND_BUILD = FIRST_BUILD + timedelta(days=1)
+
+
+def make_entry(uid: str, summary: str) -> dict:
+    """Create a UID index entry with a minimal VEVENT."""
+    component = icalendar.Event()
+    component.add("uid", uid)
+    component.add("summary", summary)
+    component.add("dtstart", datetime(2025, 9, 18, 18, 0, tzinfo=ZoneInfo(MOCK_TZ)))
+    component.add("dtstamp", FIRST_BUILD)
+    return {"uid": uid, "lang": "en", "source": uid, "component": component}
+
+
+class TestDelta:
+    """Tests for the per-UID fingerprint state kept between builds."""
+
+    def test_event_fingerprint(self) -> None:
+        """Tests that event_fingerprint() ignores the properties managed by the delta state."""
+        entry = make_entry("a", "Event A")
+        fingerprint = event_fingerprint(entry["component"])
+        entry["component"]["SEQUENCE"] = icalendar.vInt(3)
+        entry["component"]["DTSTAMP"] = icalendar.vDatetime(SECOND_BUILD)
+        assert event_fingerprint(entry["component"]) == fingerprint
+        entry["component"]["SUMMARY"] = icalendar.vText("Event A, moved")
+        assert event_fingerprint(entry["component"]) != fingerprint
+
+    def test_apply_delta_state(self, tmp_path) -> None:
+        """Tests for apply_delta_state() over two builds with added, changed, unchanged and removed events."""
+        settings = {"CACHE_PATH": str(tmp_path / "cache")}
+
+        first = [make_entry("a", "Event A"), make_entry("b", "Event B")]
+        delta, removed, state = apply_delta_state(first, settings, FIRST_BUILD)
+        assert [entry["uid"] for entry in delta] == ["a", "b"]
+        assert removed == []
+        assert all(entry["component"]["SEQUENCE"] == 0 for entry in first)
+
+        # the state isn't saved until the outputs are written
+        assert not (tmp_path / "cache").exists()
+        save_delta_state(state, settings)
+
+        second = [
+            make_entry("a", "Event A"),
+            make_entry("b", "Event B, new time"),
+            make_entry("c", "Event C"),
+        ]
+        delta, removed, state = apply_delta_state(second, settings, SECOND_BUILD)
+        save_delta_state(state, settings)
+        assert [entry["uid"] for entry in delta] == ["b", "c"]
+        assert removed == []
+        sequences = {entry["uid"]: entry["component"]["SEQUENCE"] for entry in second}
+        assert sequences == {"a": 0, "b": 1, "c": 0}
+        modified = {
+            entry["uid"]: entry["component"]["LAST-MODIFIED"].dt for entry in second
+        }
+        assert modified["a"] == FIRST_BUILD
+        assert modified["b"] == SECOND_BUILD
+
+        delta, removed, _ = apply_delta_state(second[1:], settings, SECOND_BUILD)
+        assert delta == []
+        assert removed == ["a"]
+
+    def test_failed_build_keeps_state(self, tmp_path) -> None:
+        """Tests that the state isn't saved when writing the calendar fails, so the next delta has the events."""
+        settings = get_settings(
+            PLUGIN_EVENTS={"ics_fname": "calendar.ics", "delta_fname": "delta.ics"},
+            TIMEZONE=MOCK_TZ,
+            CACHE_PATH=str(tmp_path / "cache"),
+            OUTPUT_PATH=str(tmp_path / "output"),
+        )
+        record = {
+            "title": "Meetup",
+            "summary": "<p>Meetup</p>",
+            "event-start": "2025-09-18 18:00",
+            "event-duration": "2h",
+        }
+        (tmp_path / "output" / "calendar.ics").mkdir(parents=True)
+        with pytest.raises(OSError):
+            CalendarBuilder(settings, FIRST_BUILD).build(
+                [record], str(tmp_path / "output" / "calendar.ics")
+            )
+        assert not (tmp_path / "cache").exists()
+
+        (tmp_path / "output" / "calendar.ics").rmdir()
+        CalendarBuilder(settings, FIRST_BUILD).build(
+            [record], str(tmp_path / "output" / "calendar.ics")
+        )
+        delta = icalendar.Calendar.from_ical(
+            (tmp_path / "output" / "delta.ics").read_bytes()
+        )
+        assert len(delta.walk("VEVENT")) == 1
+        assert (tmp_path / "cache" / "pelican_events_delta_state.json").exists()
@@ -0,0 +1,112 @@
+"""test_340_size_budget.py - unit tests for calendar size controls: description modes, truncation and caps."""
+# by Ian Kluft
+
+from datetime import datetime
+import logging
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from pelican.plugins.pelican_events import (
+    UnknownPolicy,
+    check_size_budget,
+    clear_events,
+    collect_calendar_entries,
+    event_description,
+    snapshot_events,
+    truncate_html,
+)
+
+# constants
+ARTICLE_HTML = (
+    "<p>First paragraph with <b>bold</b> text.</p><p>Second paragraph &amp; more.</p>"
+)
+MOCK_TZ = "US/Pacific"
+MOCK_TIMESTAMP = datetime(2025, 9, 1, 0, 0, tzinfo=ZoneInfo(MOCK_TZ))
+
+
+class TestSizeBudget:
+    """Tests for calendar size controls."""
+
+    @pytest.mark.parametrize(
+        ("html", "max_length", "expected"),
+        [
+            ("<p>short</p>", 100, ("<p>short</p>", False)),
+            ("<p>some text</p>", 9, ("<p>some t", True)),
+            ("<p>some <b>bold</b></p>", 10, ("<p>some ", True)),
+            ("<p>Q &amp; A</p>", 9, ("<p>Q ", True)),
+        ],
+    )
+    def test_truncate_html(self, html: str, max_length: int, expected) -> None:
+        """Tests that truncate_html() doesn't leave partial tags or entities."""
+        assert truncate_html(html, max_length) == expected
+
+    @pytest.mark.parametrize(
+        ("plugin_events", "expected"),
+        [
+            (
+                {"text_engine": "fast"},
+                "First paragraph with bold text.\nSecond paragraph & more.",
+            ),
+            (
+                {"text_engine": "fast", "description_mode": "summary"},
+                "Short summary\n\nhttps://example.org/event-2025-09-18.html",
+            ),
+            (
+                {"description_mode": "link"},
+                "https://example.org/event-2025-09-18.html",
+            ),
+            (
+                {"text_engine": "fast", "description_max_length": 30},
+                "First paragraph with…\n\nhttps://example.org/event-2025-09-18.html",
+            ),
+        ],
+    )
+    def test_event_description(
+        self, plugin_events: dict, expected: str, make_settings, make_article
+    ) -> None:
+        """Tests for event_description() in each mode and with truncation."""
+        clear_events()
+        article = make_article(
+            make_settings(**plugin_events),
+            ARTICLE_HTML,
+            summary="<p>Short summary</p>",
+            slug="event-2025-09-18",
+        )
+        assert event_description(article, article.settings, "fast") == expected
+        clear_events()
+
+    def test_unknown_description_mode(self, make_settings, make_article) -> None:
+        """Tests that an unknown description_mode is rejected."""
+        clear_events()
+        article = make_article(make_settings(description_mode="everything"))
+        with pytest.raises(UnknownPolicy):
+            event_description(article, article.settings, "fast")
+        clear_events()
+
+    def test_max_events(self, make_settings, make_article) -> None:
+        """Tests that max_events keeps the soonest upcoming events."""
+        clear_events()
+        settings = make_settings(max_events=2, metadata_field_for_summary="title")
+        for start in ("2025-09-25 18:00", "2025-09-11 18:00", "2025-09-18 18:00"):
+            make_article(
+                settings,
+                title=f"event at {start}",
+                slug=f"event-{start[:10]}",
+                **{"event-start": start},
+            )
+        entries = collect_calendar_entries(snapshot_events(), settings, MOCK_TIMESTAMP)
+        assert [str(entry["component"]["SUMMARY"]) for entry in entries] == [
+            "event at 2025-09-11 18:00",
+            "event at 2025-09-18 18:00",
+        ]
+        clear_events()
+
+    def test_check_size_budget(self, caplog) -> None:
+        """Tests that check_size_budget() warns only when the calendar is over budget."""
+        settings = {"PLUGIN_EVENTS": {"size_budget": 1000}}
+        with caplog.at_level(logging.WARNING):
+            check_size_budget("calendar.ics", 1000, settings)
+            assert not caplog.records
+            check_size_budget("calendar.ics", 1001, settings)
+            assert "over the size_budget" in caplog.text
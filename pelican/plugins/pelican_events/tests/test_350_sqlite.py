@@ -0,0 +1,194 @@
+"""test_350_sqlite.py - unit tests for the SQLite event database export."""
+# by Ian Kluft
+
+import sqlite3
+
+import pytest
+
+from pelican.contents import Article
+from pelican.plugins.pelican_events import (
+    SQLITE_FTS_SCHEMA,
+    DataEvent,
+    clear_events,
+    snapshot_events,
+    write_sqlite_events,
+)
+
+# constants
+BATCH_SIZE = 2000
+
+
+@pytest.fixture
+def settings(make_settings) -> dict:
+    """Create settings using the fast text engine."""
+    return make_settings(text_engine="fast")
+
+
+@pytest.fixture
+def make_meetup(make_article, settings):
+    """Return a factory for numbered meetup articles, a day apart."""
+
+    def factory(
+        number: int, text: str = "<p>Kernel <b>hacking</b> night</p>"
+    ) -> Article:
+        return make_article(
+            settings,
+            text,
+            title=f"Meetup {number}",
+            summary=f"<p>Meetup number {number}</p>",
+            slug=f"meetup-{number}",
+            **{
+                "event-start": f"2025-09-{10 + number} 18:00",
+                "event-location": "Lucky Labrador Beer Hall",
+                "event-geo": "45.53371;-122.69174",
+                "event-categories": "MEETING, LINUX",
+            },
+        )
+
+    return factory
+
+
+def make_data_events(
+    count: int, settings: dict, text: str = "hacking"
+) -> list[DataEvent]:
+    """Create a batch of events without going through Pelican's readers."""
+    return [
+        DataEvent(
+            {
+                "title": f"Session {number}",
+                "slug": f"session-{number}",
+                "content": f"<p>Kernel {text} session {number}</p>",
+                "event-start": f"2025-10-01 {number % 24:02d}:00",
+                "event-duration": "1h",
+            },
+            settings,
+        )
+        for number in range(count)
+    ]
+
+
+def fts_consistent(connection: sqlite3.Connection) -> bool:
+    """Check every full-text row has the rowid and uid of its events row, and vice versa."""
+    joined = connection.execute(
+        "SELECT count(*) FROM events JOIN events_fts "
+        "ON events.rowid = events_fts.rowid AND events.uid = events_fts.uid"
+    ).fetchone()[0]
+    events = connection.execute("SELECT count(*) FROM events").fetchone()[0]
+    fts = connection.execute("SELECT count(*) FROM events_fts").fetchone()[0]
+    return joined == events == fts
+
+
+class TestSQLite:
+    """Tests for write_sqlite_events()."""
+
+    def test_write_sqlite_events(self, tmp_path, settings, make_meetup) -> None:
+        """Tests the database contents and incremental updates over several builds."""
+        path = str(tmp_path / "output" / "events.sqlite")
+        clear_events()
+        for number in range(3):
+            make_meetup(number)
+        counts = write_sqlite_events(path, snapshot_events(), settings)
+        assert counts == {"upserted": 3, "deleted": 0, "unchanged": 0}
+
+        with sqlite3.connect(path) as connection:
+            row = connection.execute(
+                "SELECT title, summary, description, location, dtstart, dtend, latitude "
+                "FROM events WHERE url = 'meetup-1.html'"
+            ).fetchone()
+            assert row == (
+                "Meetup 1",
+                "Meetup number 1",
+                "Kernel hacking night",
+                "Lucky Labrador Beer Hall",
+                "2025-09-12T01:00:00Z",
+                "2025-09-12T03:00:00Z",
+                45.53371,
+            )
+            in_range = connection.execute(
+                "SELECT count(*) FROM events WHERE dtstart >= '2025-09-12T00:00:00Z'"
+            ).fetchone()
+            assert in_range == (2,)
+            categories = connection.execute(
+                "SELECT count(*) FROM categories WHERE category = 'LINUX'"
+            ).fetchone()
+            assert categories == (3,)
+            properties = connection.execute(
+                "SELECT value FROM properties WHERE name = 'event-duration' LIMIT 1"
+            ).fetchone()
+            assert properties == ("2h",)
+            fts = connection.execute(
+                "SELECT count(*) FROM events_fts WHERE events_fts MATCH 'hacking'"
+            ).fetchone()
+            assert fts == (3,)
+        connection.close()
+
+        # unchanged events are not written again
+        counts = write_sqlite_events(path, snapshot_events(), settings)
+        assert counts == {"upserted": 0, "deleted": 0, "unchanged": 3}
+
+        # one event changed, one removed
+        clear_events()
+        make_meetup(0)
+        make_meetup(1, "<p>Scheduler talk</p>")
+        counts = write_sqlite_events(path, snapshot_events(), settings)
+        assert counts == {"upserted": 1, "deleted": 1, "unchanged": 1}
+        with sqlite3.connect(path) as connection:
+            assert connection.execute("SELECT count(*) FROM events").fetchone() == (2,)
+            assert connection.execute("SELECT count(*) FROM categories").fetchone() == (
+                4,
+            )
+            matches = connection.execute(
+                "SELECT events.uid FROM events_fts JOIN events "
+                "ON events.rowid = events_fts.rowid WHERE events_fts MATCH 'scheduler'"
+            ).fetchall()
+            assert matches == [("https://example.org/meetup-1.html",)]
+            assert connection.execute(
+                "SELECT count(*) FROM events_fts WHERE events_fts MATCH 'hacking'"
+            ).fetchone() == (1,)
+        connection.close()
+        clear_events()
+
+    def test_fts_batch(self, tmp_path, settings) -> None:
+        """Tests full-text rows stay keyed by event rowid when a large batch changes and shrinks."""
+        path = str(tmp_path / "events.sqlite")
+        counts = write_sqlite_events(
+            path, make_data_events(BATCH_SIZE, settings), settings
+        )
+        assert counts["upserted"] == BATCH_SIZE
+
+        # every event changed, and the second half removed
+        half = BATCH_SIZE // 2
+        counts = write_sqlite_events(
+            path, make_data_events(half, settings, "tracing"), settings
+        )
+        assert counts == {"upserted": half, "deleted": half, "unchanged": 0}
+        with sqlite3.connect(path) as connection:
+            assert fts_consistent(connection)
+            assert connection.execute(
+                "SELECT count(*) FROM events_fts WHERE events_fts MATCH 'tracing'"
+            ).fetchone() == (half,)
+            assert connection.execute(
+                "SELECT count(*) FROM events_fts WHERE events_fts MATCH 'hacking'"
+            ).fetchone() == (0,)
+        connection.close()
+
+    def test_fts_rebuild(self, tmp_path, settings) -> None:
+        """Tests a database whose full-text rows were not keyed by rowid is rebuilt."""
+        path = str(tmp_path / "events.sqlite")
+        write_sqlite_events(path, make_data_events(5, settings), settings)
+        with sqlite3.connect(path) as connection:
+            # as written by earlier versions, with rowids unrelated to the events table
+            connection.execute("DROP TABLE events_fts")
+            connection.execute(SQLITE_FTS_SCHEMA)
+            connection.execute(
+                "INSERT INTO events_fts (rowid, uid, summary, description) "
+                "SELECT rowid + 100, uid, summary, description FROM events"
+            )
+            connection.execute("PRAGMA user_version = 0")
+        connection.close()
+
+        counts = write_sqlite_events(path, make_data_events(3, settings), settings)
+        assert counts == {"upserted": 0, "deleted": 2, "unchanged": 3}
+        with sqlite3.connect(path) as connection:
+            assert fts_consistent(connection)
+        connection.close()
@@ -0,0 +1,119 @@
+"""test_360_search.py - unit tests for the client-side search index of events."""
+# by Ian Kluft
+
+import json
+
+import pytest
+
+from pelican.contents import Article
+from pelican.plugins.pelican_events import (
+    BackgroundWriter,
+    build_search_index,
+    clear_events,
+    search_terms,
+    snapshot_events,
+    write_search_index,
+)
+
+
+@pytest.fixture
+def settings(make_settings) -> dict:
+    """Create settings using the fast text engine."""
+    return make_settings(text_engine="fast")
+
+
+@pytest.fixture
+def make_indexed_article(make_article, settings):
+    """Return a factory for event articles with the fields the search index uses."""
+
+    def factory(title: str, start: str, summary: str, categories: str) -> Article:
+        return make_article(
+            settings,
+            "<p>Article text isn't indexed</p>",
+            title=title,
+            summary=summary,
+            slug=title.lower().replace(" ", "-"),
+            **{
+                "event-start": start,
+                "event-location": "Lucky Labrador Beer Hall",
+                "event-categories": categories,
+            },
+        )
+
+    return factory
+
+
+class TestSearchIndex:
+    """Tests for the search index terms, shards and files."""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("Kernel Meetup", {"kernel", "meetup"}),
+            ("eBPF & XDP: a talk", {"ebpf", "xdp", "talk"}),
+            ("Straße", {"strasse"}),
+            ("", set()),
+        ],
+    )
+    def test_search_terms(self, text: str, expected: set[str]) -> None:
+        """Tests for search_terms()."""
+        assert search_terms(text) == expected
+
+    def test_build_search_index(self, settings, make_indexed_article) -> None:
+        """Tests that build_search_index() indexes title, summary, location and categories by event start."""
+        clear_events()
+        make_indexed_article(
+            "Scheduler Talk",
+            "2025-10-16 18:00",
+            "<p>The <b>EEVDF</b> scheduler</p>",
+            "TALK",
+        )
+        make_indexed_article(
+            "Kernel Meetup", "2025-09-18 18:00", "<p>Monthly meetup</p>", "MEETING"
+        )
+        manifest, shards = build_search_index(snapshot_events(), settings)
+        assert manifest["events"] == [
+            ["kernel-meetup.html", "Kernel Meetup", "2025-09-18T18:00:00-07:00"],
+            ["scheduler-talk.html", "Scheduler Talk", "2025-10-16T18:00:00-07:00"],
+        ]
+        assert manifest["shards"] == sorted(shards)
+        assert shards["sc"] == {"scheduler": [1]}
+        assert shards["ee"] == {"eevdf": [1]}
+        assert shards["me"] == {"meeting": [0], "meetup": [0]}
+        assert shards["lu"] == {"lucky": [0, 1]}
+        assert "article" not in shards.get("ar", {})
+        clear_events()
+
+    def test_write_search_index(self, tmp_path, settings, make_indexed_article) -> None:
+        """Tests that write_search_index() writes the manifest and a file per shard."""
+        clear_events()
+        make_indexed_article(
+            "Kernel Meetup", "2025-09-18 18:00", "<p>Monthly meetup</p>", "MEETING"
+        )
+        with BackgroundWriter(2) as writer:
+            shard_count = write_search_index(
+                str(tmp_path / "search"), snapshot_events(), settings, writer
+            )
+        manifest = json.loads((tmp_path / "search" / "index.json").read_text())
+        assert len(manifest["shards"]) == shard_count
+        for prefix in manifest["shards"]:
+            shard = json.loads(
+                (tmp_path / "search" / "shards" / f"{prefix}.json").read_text()
+            )
+            assert all(term.startswith(prefix) for term in shard)
+        clear_events()
+
+    def test_shard_named_index(self, tmp_path, make_settings, make_article) -> None:
+        """Tests that the shard of the term prefix "index" doesn't replace the manifest."""
+        clear_events()
+        settings = make_settings(text_engine="fast", search_prefix_length=5)
+        make_article(settings, title="Index cards workshop", slug="index-cards")
+        with BackgroundWriter(2) as writer:
+            write_search_index(
+                str(tmp_path / "search"), snapshot_events(), settings, writer
+            )
+        manifest = json.loads((tmp_path / "search" / "index.json").read_text())
+        assert "index" in manifest["shards"]
+        shard = json.loads((tmp_path / "search" / "shards" / "index.json").read_text())
+        assert shard == {"index": [0]}
+        clear_events()
@@ -0,0 +1,127 @@
+"""test_370_refresh.py - unit tests for the next output change hint and computed REFRESH-INTERVAL."""
+# by Ian Kluft
+
+from datetime import datetime, timedelta
+import json
+from zoneinfo import ZoneInfo
+
+import icalendar
+import pytest
+
+from pelican.plugins.pelican_events import (
+    calendar_refresh_interval,
+    new_calendar,
+    next_change_hint,
+    next_output_change,
+)
+
+# constants
+MOCK_TZ = "US/Pacific"
+TZ = ZoneInfo(MOCK_TZ)
+TIMESTAMP = datetime(2025, 9, 18, 12, 0, tzinfo=TZ)
+
+
+@pytest.fixture
+def make_entry(make_event):
+    """Return a factory for minimal event objects and their calendar entries."""
+
+    def factory(start: datetime, duration: timedelta):
+        component = icalendar.Event()
+        component.add("dtstart", start)
+        return make_event("event", start, duration), {"component": component}
+
+    return factory
+
+
+class TestRefresh:
+    """Tests for next_output_change(), calendar_refresh_interval() and the hint file."""
+
+    def test_next_output_change(self, make_settings, make_entry) -> None:
+        """Tests that the next change is the soonest event start or passing of an event's last day."""
+        tonight, tonight_entry = make_entry(
+            datetime(2025, 9, 18, 18, 0, tzinfo=TZ), timedelta(hours=2)
+        )
+        started, _ = make_entry(
+            datetime(2025, 9, 17, 18, 0, tzinfo=TZ), timedelta(days=3)
+        )
+        past, _ = make_entry(datetime(2025, 9, 1, 18, 0, tzinfo=TZ), timedelta(hours=2))
+        settings = make_settings()
+
+        assert next_output_change(
+            [tonight, started, past], [tonight_entry], settings, TIMESTAMP
+        ) == datetime(2025, 9, 18, 18, 0, tzinfo=TZ)
+        assert next_output_change([started, past], [], settings, TIMESTAMP) == datetime(
+            2025, 9, 21, 0, 0, tzinfo=TZ
+        )
+        assert next_output_change([past], [], settings, TIMESTAMP) is None
+
+        settings = make_settings(
+            recurring_events=[{"title": "meetup"}], recurrence_horizon="8w"
+        )
+        assert next_output_change([started], [], settings, TIMESTAMP) == datetime(
+            2025, 9, 19, 0, 0, tzinfo=TZ
+        )
+
+    @pytest.mark.parametrize(
+        ("plugin_events", "next_change", "expected"),
+        [
+            ({}, TIMESTAMP + timedelta(hours=6), None),
+            ({"refresh_interval": "1d"}, TIMESTAMP, timedelta(days=1)),
+            (
+                {"refresh_interval": "auto"},
+                TIMESTAMP + timedelta(hours=6, seconds=1),
+                timedelta(hours=6, minutes=1),
+            ),
+            (
+                {"refresh_interval": "auto"},
+                TIMESTAMP + timedelta(minutes=5),
+                timedelta(hours=1),
+            ),
+            ({"refresh_interval": "auto"}, None, timedelta(days=7)),
+            (
+                {
+                    "refresh_interval": "auto",
+                    "refresh_interval_min": "15m",
+                    "refresh_interval_max": "1d",
+                },
+                TIMESTAMP + timedelta(minutes=5),
+                timedelta(minutes=15),
+            ),
+        ],
+    )
+    def test_calendar_refresh_interval(
+        self, plugin_events: dict, next_change, expected, make_settings
+    ) -> None:
+        """Tests for calendar_refresh_interval() with fixed, computed and bounded intervals."""
+        settings = make_settings(**plugin_events)
+        assert calendar_refresh_interval(settings, TIMESTAMP, next_change) == expected
+
+    def test_calendar_property(self, make_settings) -> None:
+        """Tests that the REFRESH-INTERVAL calendar property is a DURATION value."""
+        ical = new_calendar(make_settings(), timedelta(hours=6))
+        assert b"REFRESH-INTERVAL;VALUE=DURATION:PT6H" in ical.to_ical()
+        assert b"REFRESH-INTERVAL" not in new_calendar(make_settings()).to_ical()
+
+    def test_shared_timezone(self, make_settings) -> None:
+        """Tests that calendars share the VTIMEZONE component of the site time zone."""
+        first = new_calendar(make_settings()).walk("VTIMEZONE")
+        second = new_calendar(make_settings()).walk("VTIMEZONE")
+        assert len(first) == 1
+        assert first[0] is second[0]
+
+    def test_next_change_hint(self) -> None:
+        """Tests the contents of the hint file."""
+        hint = json.loads(
+            next_change_hint(
+                TIMESTAMP, TIMESTAMP + timedelta(hours=6), timedelta(hours=6)
+            )
+        )
+        assert hint == {
+            "generated": "2025-09-18T12:00:00-07:00",
+            "next_change": "2025-09-18T18:00:00-07:00",
+            "next_change_utc": "2025-09-19T01:00:00Z",
+            "refresh_interval": 21600,
+        }
+        assert (
+            json.loads(next_change_hint(TIMESTAMP, None, None))["next_change"] is None
+        )
@@ -0,0 +1,95 @@
+"""test_380_builder.py - unit tests for building calendars from event iterables with CalendarBuilder."""
+# by Ian Kluft
+
+from datetime import datetime, timedelta
+import io
+from zoneinfo import ZoneInfo
+
+import icalendar
+import pytest
+
+from pelican.plugins.pelican_events import CalendarBuilder, FieldParseError
+
+# constants
+MOCK_TZ = "US/Pacific"
+TZ = ZoneInfo(MOCK_TZ)
+TIMESTAMP = datetime(2025, 10, 1, 12, 0, tzinfo=TZ)
+START = datetime(2025, 9, 1, 18, 0)
+
+
+def generate_records(count: int, consumed: list | None = None):
+    """Generate event records one at a time, a day apart, starting a month before the timestamp."""
+    for number in range(count):
+        if consumed is not None:
+            consumed.append(number)
+        yield {
+            "title": f"Session {number}",
+            "summary": f"<p>Session number {number}</p>",
+            "event-start": (START + timedelta(days=number)).strftime("%Y-%m-%d %H:%M"),
+            "event-duration": "1h",
+            "event-location": "Hall A",
+        }
+
+
+class TestCalendarBuilder:
+    """Tests for CalendarBuilder."""
+
+    def test_streaming(self, make_settings) -> None:
+        """Tests that records of a generator are consumed lazily and past events are left out."""
+        consumed = []
+        records = generate_records(40, consumed)
+        builder = CalendarBuilder(make_settings(), TIMESTAMP)
+        assert not builder.needs_all_events()
+
+        out = io.BytesIO()
+        stats = builder.build(records, out)
+        assert len(consumed) == 40  # noqa: PLR2004
+        assert stats == {"events": 40, "written": 10, "bytes": len(out.getvalue())}
+        ical = icalendar.Calendar.from_ical(out.getvalue())
+        summaries = [str(ev["SUMMARY"]) for ev in ical.walk("VEVENT")]
+        assert summaries == [f"Session number {number}" for number in range(30, 40)]
+
+    def test_streamed_matches_buffered(self, tmp_path, make_settings) -> None:
+        """Tests that the streamed calendar is the same as one built after collecting all events."""
+        streamed = io.BytesIO()
+        CalendarBuilder(make_settings(), TIMESTAMP).build(
+            generate_records(60), streamed
+        )
+        buffered_settings = make_settings(max_events=1000)
+        buffered_settings["OUTPUT_PATH"] = str(tmp_path)
+        builder = CalendarBuilder(buffered_settings, TIMESTAMP)
+        assert builder.needs_all_events()
+        path = tmp_path / "out" / "calendar.ics"
+        stats = builder.build(list(generate_records(60)), str(path))
+        assert stats["written"] == 30  # noqa: PLR2004
+        assert path.read_bytes() == streamed.getvalue()
+
+    def test_scale(self, make_settings) -> None:
+        """Tests a large calendar built in-process from a generator."""
+        out = io.BytesIO()
+        stats = CalendarBuilder(make_settings(), TIMESTAMP).build(
+            generate_records(5000), out
+        )
+        assert stats["events"] == 5000  # noqa: PLR2004
+        assert stats["written"] == 4970  # noqa: PLR2004
+        assert out.getvalue().endswith(b"END:VCALENDAR\r\n")
+        assert out.getvalue().count(b"BEGIN:VEVENT") == stats["written"]
+
+    def test_failed_build_keeps_calendar(self, tmp_path, make_settings) -> None:
+        """Tests that a build failing while VEVENTs are streamed leaves the previous calendar in place."""
+        path = tmp_path / "calendar.ics"
+        CalendarBuilder(make_settings(), TIMESTAMP).build(
+            generate_records(40), str(path)
+        )
+        previous = path.read_bytes()
+
+        def failing_records():
+            yield from generate_records(35)
+            yield {"title": "Broken", "event-start": "2025-10-20 18:00"}
+
+        with pytest.raises(FieldParseError):
+            CalendarBuilder(make_settings(), TIMESTAMP).build(
+                failing_records(), str(path)
+            )
+        assert path.read_bytes() == previous
+        assert [p.name for p in tmp_path.iterdir()] == ["calendar.ics"]
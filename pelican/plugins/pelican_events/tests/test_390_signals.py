@@ -0,0 +1,109 @@
+"""test_390_signals.py - unit tests for the instrumentation signals."""
+# by Ian Kluft
+
+from datetime import datetime, timedelta
+import io
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+from pelican.plugins.pelican_events import (
+    CalendarBuilder,
+    clear_events,
+    events_collection_finished,
+    events_collection_started,
+    events_event_rendered,
+    events_feed_written,
+    events_recurrence_expanded,
+    generate_localized_events,
+    snapshot_events,
+    start_event_collection,
+)
+from pelican.tests.support import get_settings
+
+# constants
+MOCK_TZ = "US/Pacific"
+TZ = ZoneInfo(MOCK_TZ)
+TIMESTAMP = datetime(2025, 10, 1, 12, 0, tzinfo=TZ)
+RECURRING_EVENTS = [
+    {
+        "title": "Monthly meetup",
+        "summary": "Monthly meetup",
+        "page_url": "meetup.html",
+        "location": "Lucky Labrador Beer Hall",
+        "event-duration": "2h",
+        "recurring_rule": "every 3rd Thursday at 6pm",
+    }
+]
+
+
+class TestSignals:
+    """Tests that the signals are sent with their payloads."""
+
+    def test_collection_signals(self) -> None:
+        """Tests the collection and recurrence signals of a build pass."""
+        settings = get_settings(
+            PLUGIN_EVENTS={
+                "ics_fname": "calendar.ics",
+                "recurring_events": RECURRING_EVENTS,
+                "recurrence_horizon": "12w",
+                "test_timestamp": "2025-10-01 12:00",
+            },
+            TIMEZONE=MOCK_TZ,
+        )
+        received = []
+
+        def receiver(sender, **payload):
+            received.append(payload)
+
+        with (
+            events_collection_started.connected_to(receiver),
+            events_recurrence_expanded.connected_to(receiver),
+            events_collection_finished.connected_to(receiver),
+        ):
+            start_event_collection(settings)
+            generate_localized_events(SimpleNamespace(settings=settings))
+        assert len(received) == 3  # noqa: PLR2004
+        started, expanded, finished = received
+        assert started == {}
+        assert expanded["definitions"] == 1
+        assert expanded["events"] == finished["events"] == len(snapshot_events())
+        assert finished["events"] > 1
+        assert finished["duration"] >= expanded["duration"] >= 0
+        clear_events()
+
+    def test_calendar_signals(self) -> None:
+        """Tests the per-event and per-feed signals when building a calendar."""
+        settings = get_settings(
+            PLUGIN_EVENTS={"ics_fname": "calendar.ics"}, TIMEZONE=MOCK_TZ
+        )
+        records = [
+            {
+                "title": f"Session {number}",
+                "event-start": (
+                    TIMESTAMP.replace(tzinfo=None) + timedelta(days=number)
+                ).strftime("%Y-%m-%d %H:%M"),
+                "event-duration": "1h",
+            }
+            for number in range(-2, 3)
+        ]
+        rendered = []
+        written = []
+        out = io.BytesIO()
+        with (
+            events_event_rendered.connected_to(
+                lambda sender, **payload: rendered.append(payload)
+            ),
+            events_feed_written.connected_to(
+                lambda sender, **payload: written.append(payload)
+            ),
+        ):
+            stats = CalendarBuilder(settings, TIMESTAMP).build(records, out)
+        assert [payload["event"].title for payload in rendered] == [
+            "Session 0",
+            "Session 1",
+            "Session 2",
+        ]
+        assert all(payload["duration"] >= 0 for payload in rendered)
+        assert len(written) == 1
+        assert written[0]["events"] == stats["written"]
+        assert written[0]["size"] == len(out.getvalue())
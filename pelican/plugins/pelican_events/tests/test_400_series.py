@@ -0,0 +1,204 @@
+"""test_400_series.py - unit tests for compaction of repeated events into RRULE and RDATE series."""
+# by Ian Kluft
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from dateutil import rrule
+import icalendar
+import pytest
+
+from pelican.plugins.pelican_events import (
+    CalendarBuilder,
+    collect_calendar_entries,
+    compact_series,
+    series_rule,
+)
+from pelican.tests.support import get_settings
+
+# constants
+MOCK_TZ = "US/Pacific"
+TZ = ZoneInfo(MOCK_TZ)
+TIMESTAMP = datetime(2025, 1, 1, 12, 0, tzinfo=TZ)
+OVERRIDE_NUMBER = 2  # the meetup with its own description
+
+
+def third_thursdays(count: int, skip_month: int | None = None) -> list[datetime]:
+    """Get the third Thursdays of the months of 2025 at 6pm, optionally without one month."""
+    return [
+        start.replace(tzinfo=TZ)
+        for start in rrule.rrule(
+            rrule.MONTHLY,
+            byweekday=rrule.TH(3),
+            dtstart=datetime(2025, 1, 1, 18, 0),
+            count=count,
+        )
+        if start.month != skip_month
+    ]
+
+
+def meetup_records(starts: list[datetime]) -> list[dict]:
+    """Make event records of a meetup series, one of which has its own description."""
+    return [
+        {
+            "title": "Monthly Meetup",
+            "summary": "<p>Monthly meetup</p>",
+            "content": "<p>Lightning talks</p>"
+            if number == OVERRIDE_NUMBER
+            else "<p>Open agenda</p>",
+            "event-start": start.strftime("%Y-%m-%d %H:%M"),
+            "event-duration": "2h",
+            "event-location": "Hall A",
+        }
+        for number, start in enumerate(starts)
+    ]
+
+
+class TestSeries:
+    """Tests for series_rule() and compact_series()."""
+
+    @pytest.mark.parametrize(
+        ("starts", "expected", "exdates"),
+        [
+            (
+                third_thursdays(12, skip_month=11),
+                {"FREQ": "MONTHLY", "BYDAY": "3TH", "COUNT": 12},
+                [datetime(2025, 11, 20, 18, 0, tzinfo=TZ)],
+            ),
+            (
+                [TIMESTAMP + timedelta(days=14 * week) for week in range(6)],
+                {"FREQ": "WEEKLY", "INTERVAL": 2, "COUNT": 6},
+                [],
+            ),
+            (
+                [datetime(2025, month, 31, 9, 0, tzinfo=TZ) for month in (1, 3, 5, 7)],
+                {"FREQ": "MONTHLY", "INTERVAL": 2, "BYMONTHDAY": 31, "COUNT": 4},
+                [],
+            ),
+            (
+                [TIMESTAMP + timedelta(days=days) for days in (0, 3, 10, 11)],
+                None,
+                [],
+            ),
+            (
+                [
+                    TIMESTAMP,
+                    TIMESTAMP + timedelta(days=7, hours=1),
+                    TIMESTAMP + timedelta(days=14),
+                ],
+                None,
+                [],
+            ),
+        ],
+    )
+    def test_series_rule(
+        self, starts: list, expected: dict | None, exdates: list
+    ) -> None:
+        """Tests the rules found for regular and irregular start times."""
+        assert series_rule(starts) == (expected, exdates)
+
+    def test_compact_series(self) -> None:
+        """Tests that a series becomes one master VEVENT plus an override, which expand to the original times."""
+        starts = third_thursdays(12, skip_month=11)
+        settings = get_settings(
+            PLUGIN_EVENTS={
+                "ics_fname": "calendar.ics",
+                "compact_series": True,
+                "compact_override_props": ("SUMMARY", "DESCRIPTION"),
+            },
+            TIMEZONE=MOCK_TZ,
+        )
+        records = [
+            *meetup_records(starts),
+            {
+                "title": "Holiday party",
+                "event-start": "2025-12-12 18:00",
+                "event-duration": "3h",
+            },
+        ]
+        entries = collect_calendar_entries(records, settings, TIMESTAMP)
+        assert len(entries) == 3  # noqa: PLR2004
+        master, override, party = (entry["component"] for entry in entries)
+        assert master["UID"] == override["UID"]
+        assert master["UID"].startswith("series-")
+        assert master["RRULE"].to_ical() == b"FREQ=MONTHLY;COUNT=12;BYDAY=3TH"
+        assert override["RECURRENCE-ID"].dt == starts[OVERRIDE_NUMBER]
+        assert str(override["DESCRIPTION"]) == "Lightning talks"
+        assert "RRULE" not in party
+
+        expanded = rrule.rrulestr(
+            master["RRULE"].to_ical().decode(), dtstart=master["DTSTART"].dt
+        )
+        exdates = {exdate.dt for exdate in master["EXDATE"].dts}
+        assert [start for start in expanded if start not in exdates] == starts
+
+    def test_compact_series_own_descriptions(self) -> None:
+        """Tests that by default an article per meetup, each with its own text, becomes one VEVENT."""
+        starts = third_thursdays(6)
+        records = [
+            {**record, "content": f"<p>Talks of meetup {number}</p>"}
+            for number, record in enumerate(meetup_records(starts))
+        ]
+        settings = get_settings(
+            PLUGIN_EVENTS={"ics_fname": "calendar.ics"}, TIMEZONE=MOCK_TZ
+        )
+        entries = collect_calendar_entries(records, settings, TIMESTAMP)
+        components = [entry["component"] for entry in entries]
+        uids = [str(component["UID"]) for component in components]
+
+        settings["PLUGIN_EVENTS"]["compact_series"] = True
+        compacted = compact_series(entries, settings)
+        assert len(compacted) == 1
+        assert compacted[0]["component"]["RRULE"].to_ical() == (
+            b"FREQ=MONTHLY;COUNT=6;BYDAY=3TH"
+        )
+        assert str(compacted[0]["component"]["DESCRIPTION"]) == "Talks of meetup 0"
+
+        # the series is built from copies of the components
+        assert [entry["component"] for entry in entries] == components
+        assert [str(component["UID"]) for component in components] == uids
+        assert not any("RRULE" in component for component in components)
+
+    def test_compact_series_min_events(self) -> None:
+        """Tests that groups smaller than compact_min_events are left alone, and that the builder collects all events first."""
+        settings = get_settings(
+            PLUGIN_EVENTS={
+                "ics_fname": "calendar.ics",
+                "compact_series": True,
+                "compact_min_events": 4,
+            },
+            TIMEZONE=MOCK_TZ,
+        )
+        records = meetup_records(third_thursdays(3))
+        assert CalendarBuilder(settings, TIMESTAMP).needs_all_events()
+        entries = collect_calendar_entries(records, settings, TIMESTAMP)
+        assert [entry["component"].get("RRULE") for entry in entries] == [None] * 3
+
+        settings["PLUGIN_EVENTS"]["compact_min_events"] = 3
+        ical = icalendar.Calendar()
+        for entry in collect_calendar_entries(records, settings, TIMESTAMP):
+            ical.add_component(entry["component"])
+        assert len(ical.walk("VEVENT")) == 1
+
+    def test_compact_series_numbered_titles(self) -> None:
+        """Tests that a group whose titles differ by number is kept as separate events instead of overrides."""
+        settings = get_settings(
+            PLUGIN_EVENTS={"ics_fname": "calendar.ics", "compact_series": True},
+            TIMEZONE=MOCK_TZ,
+        )
+        starts = third_thursdays(6)
+        records = [
+            {**record, "title": f"Meetup {number}", "summary": f"Meetup {number}"}
+            for number, record in enumerate(meetup_records(starts), start=40)
+        ]
+        entries = collect_calendar_entries(records, settings, TIMESTAMP)
+        assert len(entries) == len(starts)
+        assert [str(entry["component"]["SUMMARY"]) for entry in entries] == [
+            f"Meetup {number}" for number in range(40, 46)
+        ]
+        assert all(
+            "RRULE" not in entry["component"]
+            and "RECURRENCE-ID" not in entry["component"]
+            and not entry["uid"].startswith("series-")
+            for entry in entries
+        )
@@ -0,0 +1,234 @@
+"""test_510_cli.py - tests of the pelican-events command-line interface."""
+# by Ian Kluft
+
+from filecmp import cmp
+import importlib
+import os
+from pathlib import Path
+import re
+import sys
+from types import SimpleNamespace
+
+import icalendar
+import pytest
+
+from pelican.plugins.pelican_events import (
+    EventValidationError,
+    initialize_events,
+    iter_metadata_header,
+    validate_content,
+)
+from pelican.plugins.pelican_events.cli import main
+from pelican.tests.support import get_settings
+
+# content files with event metadata errors, and the errors expected from them by line number
+VALIDATE_FILES = {
+    "good.md": (
+        "Title: Good\nEvent-start: 2025-09-18 18:00\nEvent-duration: 2h 30m\n\nText\n",
+        [],
+    ),
+    "bad.md": (
+        (
+            "Title: Bad\nEvent-start: 2025-09-31 18:00\nEvent-duration: 2h 3z x\n"
+            "Event-attendee: someone\nEvent-geo: north\n\nText\n"
+        ),
+        [2, 3, 3, 4, 5],
+    ),
+    "no-end.rst": (
+        "No end\n######\n\n:event-start: 2025-09-18 18:00\n:event-x-room: back\n\nText\n",
+        [4],
+    ),
+    "backwards.md": (
+        "Title: Backwards\nEvent-start: 2025-09-18 18:00\nEvent-end: 2025-09-18 17:00\n\nText\n",
+        [3],
+    ),
+    "orphan.md": ("Title: Orphan\nEvent-location: Portland\n\nText\n", [2]),
+}
+
+
+def get_test_path() -> str:
+    """Get the path of the directory containing test subdirectories."""
+    prog_path = Path(__file__)
+    prog_dir = prog_path.parent
+    re_result = re.search("[0-9]+", prog_path.name)
+    if not re_result:
+        raise OSError("No number in test script name: " + prog_path)
+    test_num = int(re_result[0])
+    test_top_dir = Path(prog_dir / f"t{test_num:03d}")
+    if not test_top_dir.exists() or not test_top_dir.is_dir():
+        raise OSError("Test top directory does not exist: " + test_top_dir)
+    return test_top_dir
+
+
+def pytest_generate_tests(metafunc):
+    """Generate tests from test data subdirectories."""
+    # called once per each test function
+    test_func_dir = get_test_path() / metafunc.function.__name__
+    if test_func_dir.exists() and test_func_dir.is_dir():
+        metafunc.parametrize(
+            ["test_subdir"], [[name] for name in sorted(test_func_dir.glob("[0-9]*"))]
+        )
+
+
+class TestMetadataHeader:
+    """Tests for iter_metadata_header(), which reads metadata without rendering content."""
+
+    @pytest.mark.parametrize(
+        "fname, text, expected",
+        (
+            (
+                "event.md",
+                "Title: Meetup\nEvent-start: 2025-09-18 18:00\nEvent-duration: 3h\n\nEvent-end: not a header\n",
+                [
+                    ("title", "Meetup", 1),
+                    ("event-start", "2025-09-18 18:00", 2),
+                    ("event-duration", "3h", 3),
+                ],
+            ),
+            (
+                "event.rst",
+                "Meetup\n######\n\n:date: 2025-09-05 23:00\n:event-start: 2025-09-18 18:00\n\n:event-end: body\n",
+                [
+                    ("date", "2025-09-05 23:00", 4),
+                    ("event-start", "2025-09-18 18:00", 5),
+                ],
+            ),
+            (
+                "event.html",
+                (
+                    '<html><head><title>Meetup</title>\n<meta name="Event-start" content="2025-09-18 18:00" />\n'
+                    '</head><body><meta name="event-end" content="body" /></body></html>\n'
+                ),
+                [("event-start", "2025-09-18 18:00", 2)],
+            ),
+            (
+                "plain.md",
+                "Just a paragraph of text: with a colon\nand more text\n",
+                [],
+            ),
+        ),
+    )
+    def test_iter_metadata_header(
+        self, tmp_path, fname: str, text: str, expected: list
+    ) -> None:
+        """Tests for iter_metadata_header()."""
+        path = tmp_path / fname
+        path.write_text(text, encoding="utf-8")
+        assert list(iter_metadata_header(str(path))) == expected
+
+
+class TestCLIBuild:
+    """Run the pelican-events CLI in-process on the same data as the integration tests."""
+
+    def test_run(self, tmp_path, test_subdir: Path) -> None:
+        """Test that 'pelican-events build' generates the same calendar as a full Pelican run."""
+        output_dir = tmp_path / "output"
+
+        # settings files are loaded as modules, so clear any previously-loaded ones of the same name
+        importlib.invalidate_caches()
+        for module_name in ["publishconf", "pelicanconf"]:
+            sys.modules.pop(module_name, None)
+
+        cwd = Path.cwd()
+        os.chdir(test_subdir)
+        try:
+            result = main(["build", "-s", "publishconf.py", "-o", str(output_dir)])
+        finally:
+            os.chdir(cwd)
+        assert result == 0
+        assert cmp(test_subdir / "expected_calendar.ics", output_dir / "calendar.ics")
+
+    def test_merge_translations(self, tmp_path) -> None:
+        """Test that 'pelican-events build' links translations so the "merge" policy combines them."""
+        content = tmp_path / "content"
+        content.mkdir()
+        event = "Slug: meetup\nEvent-start: 2099-09-18 18:00\nEvent-duration: 2h\n"
+        (content / "meetup.md").write_text(
+            f"Title: Meetup\nSummary: Meetup\n{event}\nKernel hacking night\n",
+            encoding="utf-8",
+        )
+        (content / "treffen.md").write_text(
+            f"Title: Treffen\nSummary: Treffen\nLang: de\n{event}\nKernel-Hacking-Abend\n",
+            encoding="utf-8",
+        )
+        conf = tmp_path / "mergeconf.py"
+        conf.write_text(
+            'PLUGIN_EVENTS = {"ics_fname": "calendar.ics", "duplicate_uids": "merge"}\n'
+            'TIMEZONE = "US/Pacific"\nSITEURL = "https://example.org"\n',
+            encoding="utf-8",
+        )
+        output_dir = tmp_path / "output"
+        result = main(["build", "-s", str(conf), "-o", str(output_dir), str(content)])
+        assert result == 0
+        calendar = icalendar.Calendar.from_ical(
+            (output_dir / "calendar.ics").read_bytes()
+        )
+        vevents = calendar.walk("VEVENT")
+        assert len(vevents) == 1
+        assert vevents[0]["X-ALT-DESC"].params["LANGUAGE"] == "de"
+        assert str(vevents[0]["X-ALT-DESC"]).startswith("Treffen")
+
+
+class TestValidate:
+    """Tests for event metadata validation by the CLI and the validate setting."""
+
+    def make_content(self, tmp_path, copies: int = 1) -> Path:
+        """Write content files with metadata errors, optionally repeated in numbered subdirectories."""
+        content = tmp_path / "content"
+        for copy in range(copies):
+            subdir = content / f"{copy:03d}"
+            subdir.mkdir(parents=True)
+            for fname, (text, _) in VALIDATE_FILES.items():
+                (subdir / fname).write_text(text, encoding="utf-8")
+        return content
+
+    def expected_errors(self, content: Path, copies: int = 1) -> list[tuple[str, int]]:
+        """List the expected (path, line) of each error."""
+        return sorted(
+            (str(content / f"{copy:03d}" / fname), lineno)
+            for copy in range(copies)
+            for fname, (_, lines) in VALIDATE_FILES.items()
+            for lineno in lines
+        )
+
+    @pytest.mark.parametrize("copies, workers", [(1, 1), (20, 2)])
+    def test_validate_content(self, tmp_path, copies: int, workers: int) -> None:
+        """Test that validate_content() reports every error with file and line, serially or in parallel."""
+        content = self.make_content(tmp_path, copies)
+        settings = get_settings(
+            PATH=str(content), PLUGIN_EVENTS={}, TIMEZONE="US/Pacific"
+        )
+        errors = validate_content(settings, workers)
+        assert sorted(
+            (path, lineno) for path, lineno, _ in errors
+        ) == self.expected_errors(content, copies)
+
+    def test_cli(self, tmp_path, capsys) -> None:
+        """Test that 'pelican-events validate' prints the errors and exits non-zero."""
+        content = self.make_content(tmp_path)
+        conf = tmp_path / "validateconf.py"
+        conf.write_text(
+            'PLUGIN_EVENTS = {}\nTIMEZONE = "US/Pacific"\n', encoding="utf-8"
+        )
+        result = main(["validate", "-s", str(conf), str(content)])
+        assert result == 1
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == len(self.expected_errors(content))
+        assert (
+            f"{content / '000' / 'bad.md'}:4: property 'attendee' disallowed"
+            in "\n".join(lines)
+        )
+
+        (content / "000" / "bad.md").unlink()
+        for fname in ["no-end.rst", "backwards.md", "orphan.md"]:
+            (content / "000" / fname).unlink()
+        assert main(["validate", "-s", str(conf), str(content)]) == 0
+
+    def test_validate_setting(self, tmp_path) -> None:
+        """Test that the validate setting fails the build on metadata errors."""
+        content = self.make_content(tmp_path)
+        settings = get_settings(
+            PATH=str(content), PLUGIN_EVENTS={"validate": True}, TIMEZONE="US/Pacific"
+        )
+        with pytest.raises(EventValidationError, match=r"bad\.md:3:"):
+            initialize_events(SimpleNamespace(settings=settings))
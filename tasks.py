@@ -38,6 +38,15 @@ def tests(c, deprecations=False):
     c.run(f"{CMD_PREFIX}pytest {deprecations_flag}", pty=PTY)
 
 
+@task
+def bench(c, sizes="100,1000", output="bench_results.json", text_engine="html2text"):
+    """Run the end-to-end scaling benchmark on synthetic sites, e.g. `--sizes 100,1000,10000,50000`."""
+    c.run(
+        f"{CMD_PREFIX}python benchmarks/bench_scaling.py --sizes {sizes} --output {output} --text-engine {text_engine}",
+        pty=PTY,
+    )
+
+
 @task
 def format(c, check=False, diff=False):
     """Run Ruff's auto-formatter, optionally with `--check` or `--diff`."""